@@ -2,6 +2,7 @@ from pathlib import Path
 import environ
 import dj_database_url
 import os
+import sys
 
 # =====================
 # Base directory
@@ -40,6 +41,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
+    'rest_framework.authtoken',
     'main',
 ]
 
@@ -47,6 +50,8 @@ INSTALLED_APPS = [
 # Middleware
 # =====================
 MIDDLEWARE = [
+    'main.middleware.RequestMetricsMiddleware',  # first, so it times the whole stack
+    'main.middleware.MemoryGuardMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,6 +60,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # last: it calls the view itself, so every check above (CSRF, auth) must already have run
+    'main.middleware.SampledProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'Full_web.urls'
@@ -119,6 +126,196 @@ MS_GRAPH_TENANT_ID = env("MS_GRAPH_TENANT_ID", default="")
 MS_GRAPH_CLIENT_ID = env("MS_GRAPH_CLIENT_ID", default="")
 MS_GRAPH_CLIENT_SECRET = env("MS_GRAPH_CLIENT_SECRET", default="")
 MS_GRAPH_SENDER_EMAIL = env("MS_GRAPH_SENDER_EMAIL", default="")
+# The token is kept in the shared cache (one fetch per host, serialised by the lock file)
+# and refreshed in the background at GRAPH_TOKEN_REFRESH_RATIO of its lifetime
+GRAPH_TOKEN_LOCK_PATH = env("GRAPH_TOKEN_LOCK_PATH", default=str(BASE_DIR / "var" / "graph_token.lock"))
+GRAPH_TOKEN_REFRESH_RATIO = env.float("GRAPH_TOKEN_REFRESH_RATIO", default=0.8)
+# at each web worker's first request, once tenant, client ID and secret are all set; never under `manage.py test`
+GRAPH_TOKEN_PREFETCH = env.bool("GRAPH_TOKEN_PREFETCH", default=MS_GRAPH_ENABLED and sys.argv[1:2] != ["test"])
+
+# =====================
+# Upstream services
+# Point these at `python manage.py run_stubs` (e.g. http://127.0.0.1:8765/github) to
+# load-test offline against recorded or synthetic responses. An empty
+# GEMINI_API_ENDPOINT keeps the SDK's default endpoint and transport
+# =====================
+GITHUB_API_BASE = env("GITHUB_API_BASE", default="https://api.github.com")
+LEETCODE_GRAPHQL_URL = env("LEETCODE_GRAPHQL_URL", default="https://leetcode.com/graphql")
+GRAPH_API_BASE = env("GRAPH_API_BASE", default="https://graph.microsoft.com/v1.0")
+GRAPH_LOGIN_BASE = env("GRAPH_LOGIN_BASE", default="https://login.microsoftonline.com")
+GEMINI_API_ENDPOINT = env("GEMINI_API_ENDPOINT", default="")
+STUB_FIXTURES_DIR = env("STUB_FIXTURES_DIR", default=str(BASE_DIR / "var" / "stub_fixtures"))
+
+# =====================
+# Cache
+# In-process LRU in front of a sqlite file shared by every worker on the host, so an
+# OTP sent by one worker verifies on another. Keys are namespaced by their prefix
+# ("otp:...", "extraction:..."); namespaces that must never be stale skip the front
+# =====================
+CACHES = {
+    "default": {
+        "BACKEND": "main.services.tiered_cache.TieredCache",
+        "LOCATION": env("CACHE_PATH", default=str(BASE_DIR / "var" / "cache.sqlite3")),
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=20000),
+            "FRONT_SIZE": env.int("CACHE_FRONT_SIZE", default=1024),
+            "FRONT_TTL": env.float("CACHE_FRONT_TTL", default=5),
+            "NAMESPACES": {
+                "otp": {"timeout": 300, "front": False},
+                "graph_token": {"front": False},
+                "profile_score": {"timeout": 6 * 60 * 60},
+                "extraction": {"timeout": 24 * 60 * 60},
+                "ratelimit": {"front": False},
+            },
+        },
+    }
+}
+
+# =====================
+# Rate limiting
+# Sliding-window limits kept in the shared cache: endpoint -> [(scope, limit, period_seconds)].
+# Behind a reverse proxy set RATE_LIMIT_PROXY_COUNT so the client IP is read from X-Forwarded-For;
+# on Render (which sets RENDER=true) the default is its one proxy hop
+# =====================
+RATE_LIMIT_ENABLED = env.bool("RATE_LIMIT_ENABLED", default=True)
+RATE_LIMIT_PROXY_COUNT = env.int("RATE_LIMIT_PROXY_COUNT", default=1 if env.bool("RENDER", default=False) else 0)
+RATE_LIMITS = {
+    "send_signup_otp": [("email", 3, 10 * 60), ("ip", 10, 10 * 60)],
+    "send_login_otp": [("email", 3, 10 * 60), ("ip", 10, 10 * 60)],
+    "analyze_resume": [("ip", 10, 60), ("ip", 60, 60 * 60)],
+    "analyze_resume_v2": [("ip", 10, 60), ("ip", 60, 60 * 60)],
+    "analyze_batch": [("user", 2, 60), ("user", 20, 60 * 60)],
+}
+
+# =====================
+# Analysis results
+# Identical resubmissions (same file, role and usernames) reuse a stored result for
+# ANALYSIS_RESULT_TTL seconds; bump SCORING_VERSION whenever scoring changes. Rows are
+# deleted after ANALYSIS_RESULT_RETENTION seconds (by save_result, hourly, or
+# manage.py purge_results); the default matches the session lifetime
+# =====================
+ANALYSIS_RESULT_TTL = env.int("ANALYSIS_RESULT_TTL", default=24 * 60 * 60)
+ANALYSIS_RESULT_RETENTION = env.int("ANALYSIS_RESULT_RETENTION", default=14 * 24 * 60 * 60)
+SCORING_VERSION = env("SCORING_VERSION", default="1")
+
+# =====================
+# Chart cache
+# Rendered report charts, keyed by their scores; the directory is shared by all workers
+# =====================
+CHART_CACHE_SIZE = env.int("CHART_CACHE_SIZE", default=256)
+CHART_CACHE_DIR = env("CHART_CACHE_DIR", default=str(BASE_DIR / "var" / "charts"))
+CHART_CACHE_MAX_MB = env.int("CHART_CACHE_MAX_MB", default=100)  # oldest files are pruned past this
+
+# =====================
+# Report PDF cache
+# Generated PDFs are stored per result_key + template version and pre-rendered in
+# the background as soon as an analysis completes
+# =====================
+PDF_CACHE_DIR = env("PDF_CACHE_DIR", default=str(BASE_DIR / "var" / "reports"))
+PDF_CACHE_MAX_MB = env.int("PDF_CACHE_MAX_MB", default=500)  # oldest files are pruned past this
+REPORT_PDF_VERSION = env("REPORT_PDF_VERSION", default="1")  # bump to invalidate cached PDFs
+PDF_PRERENDER = env.bool("PDF_PRERENDER", default=True)
+PDF_PRERENDER_WORKERS = env.int("PDF_PRERENDER_WORKERS", default=1)
+# "xhtml2pdf" renders the HTML templates; "reportlab" draws the same report directly (much faster)
+REPORT_PDF_BACKEND = env("REPORT_PDF_BACKEND", default="xhtml2pdf")
+
+# =====================
+# Cold start budget
+# Checked by `python manage.py coldstart`; heavy libraries must load on first use
+# =====================
+COLD_START_BUDGET_MS = env.float("COLD_START_BUDGET_MS", default=1500)
+COLD_START_FORBIDDEN_IMPORTS = [
+    "matplotlib.pyplot",
+    "xhtml2pdf.pisa",
+    "google.generativeai",
+    "fitz",
+    "docx",
+]
+
+# =====================
+# Preload warmup
+# With `gunicorn --preload`, import heavy libraries and prime scoring tables once in
+# the master so forked workers share them copy-on-write (see main/warmup.py)
+# =====================
+PRELOAD_WARMUP = env.bool("PRELOAD_WARMUP", default=False)
+
+# =====================
+# Metrics
+# Each worker writes its counters/histograms to METRICS_DIR; GET /metrics merges them
+# in Prometheus text format. Set METRICS_TOKEN to require "Authorization: Bearer <token>";
+# without it /metrics only answers scrapes from localhost
+# =====================
+METRICS_DIR = env("METRICS_DIR", default=str(BASE_DIR / "var" / "metrics"))
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=1.0)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# =====================
+# Memory guardrails
+# MEMORY_TRACKING records per-request/per-stage memory in /metrics (MEMORY_TRACEMALLOC adds
+# traced peaks at some CPU cost). Above MEMORY_SOFT_LIMIT_MB heavy views answer 503 +
+# Retry-After; above MEMORY_RECYCLE_MB the worker restarts itself gracefully. 0 disables
+# =====================
+MEMORY_TRACKING = env.bool("MEMORY_TRACKING", default=True)
+MEMORY_TRACEMALLOC = env.bool("MEMORY_TRACEMALLOC", default=False)
+MEMORY_SOFT_LIMIT_MB = env.int("MEMORY_SOFT_LIMIT_MB", default=0)
+MEMORY_RECYCLE_MB = env.int("MEMORY_RECYCLE_MB", default=0)
+MEMORY_RETRY_AFTER = env.int("MEMORY_RETRY_AFTER", default=5)
+MEMORY_GUARDED_VIEWS = ["analyze_resume", "analyze_resume_v2", "analyze_batch", "download_resume_report"]
+
+# =====================
+# Profiling
+# Profiles PROFILE_SAMPLE_RATE of requests to PROFILED_VIEWS, plus any request with a valid
+# X-Profile token (shown on /admin/profiles/). "cprofile" writes .prof files; "sample"
+# writes collapsed stacks for flame graphs. Only the newest PROFILE_MAX_FILES are kept
+# =====================
+PROFILED_VIEWS = ["analyze_resume", "analyze_resume_v2", "download_resume_report"]
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", default=0.0)
+PROFILE_MODE = env("PROFILE_MODE", default="cprofile")
+PROFILE_SAMPLE_INTERVAL = env.float("PROFILE_SAMPLE_INTERVAL", default=0.005)
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / "var" / "profiles"))
+PROFILE_MAX_FILES = env.int("PROFILE_MAX_FILES", default=200)
+PROFILE_TOKEN_MAX_AGE = env.int("PROFILE_TOKEN_MAX_AGE", default=60 * 60)
+
+# =====================
+# Benchmarks
+# `python manage.py benchmark` writes its synthetic corpus and results here;
+# --save-baseline stores a run as BENCHMARK_BASELINE for later runs to compare against
+# =====================
+BENCHMARK_DIR = env("BENCHMARK_DIR", default=str(BASE_DIR / "var" / "benchmarks"))
+BENCHMARK_BASELINE = env("BENCHMARK_BASELINE", default=str(Path(BENCHMARK_DIR) / "baseline.json"))
+
+# =====================
+# Spelling
+# Word lists (one word per line or whitespace-separated, "#" comments) added to the
+# bundled vocabulary in main/data/spelling, e.g. /usr/share/dict/words
+# =====================
+SPELLING_EXTRA_WORDLISTS = env.list("SPELLING_EXTRA_WORDLISTS", default=[])
+
+# =====================
+# Batch analysis API
+# POST /api/analyze_batch/ with a token ("Authorization: Token <key>", issued with
+# `python manage.py drf_create_token <username>`) or a session. Resumes are scored on a
+# shared pool of BATCH_WORKERS threads per process, at most BATCH_IN_FLIGHT per request
+# =====================
+BATCH_MAX_FILES = env.int("BATCH_MAX_FILES", default=500)
+BATCH_MAX_FILE_MB = env.int("BATCH_MAX_FILE_MB", default=10)  # per resume, ZIP members included
+BATCH_WORKERS = env.int("BATCH_WORKERS", default=2)
+BATCH_IN_FLIGHT = env.int("BATCH_IN_FLIGHT", default=4)
+DATA_UPLOAD_MAX_NUMBER_FILES = BATCH_MAX_FILES
+
+# =====================
+# Email outbox
+# OTP views only queue a row; "thread" delivers from a daemon thread in each worker,
+# "command" leaves delivery to `python manage.py run_outbox`
+# =====================
+OUTBOX_SENDER = env("OUTBOX_SENDER", default="thread")
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=50)
+OUTBOX_POLL_SECONDS = env.float("OUTBOX_POLL_SECONDS", default=5)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=5)
+OUTBOX_BACKOFF_SECONDS = env.float("OUTBOX_BACKOFF_SECONDS", default=2)
+OUTBOX_MAX_BACKOFF_SECONDS = env.float("OUTBOX_MAX_BACKOFF_SECONDS", default=300)
+OUTBOX_SMTP_IDLE_SECONDS = env.float("OUTBOX_SMTP_IDLE_SECONDS", default=60)  # keep the SMTP session this long between mails
 
 # =====================
 # Default primary key field type
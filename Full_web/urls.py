@@ -1,4 +1,5 @@
-from django.urls import path
+from django.contrib import admin
+from django.urls import path, re_path
 from main import views
 
 
@@ -25,12 +26,20 @@ urlpatterns = [
     path('analyze_resume/', views.analyze_resume, name='analyze_resume'),
     path('analyze_resume/', views.analyze_resume, name='analyze_resume'),
     path('analyze_resume_v2/', views.analyze_resume_v2, name='analyze_resume_v2'),
+    path('api/analyze_batch/', views.analyze_batch, name='analyze_batch'),
 
     # Profile Building & Payment Views
     path('download_resume_report/', views.download_resume_pdf, name='download_resume_report'),
 
     path("report/technical/", views.show_report_technical, name="show_report_technical"),
     path("report/non-technical/", views.show_report_nontechnical, name="show_report_nontechnical"),
+    re_path(r"^report/(?P<result_key>[0-9a-f]{64})/chart\.(?P<fmt>svg|png)$", views.report_chart, name="report_chart"),
+    path("metrics", views.metrics, name="metrics"),
+
+    # Staff: request profiles (sign in through the admin)
+    path("admin/profiles/", views.profile_list, name="profile_list"),
+    path("admin/profiles/<str:name>", views.profile_download, name="profile_download"),
+    path("admin/", admin.site.urls),
 
 
 ]
\ No newline at end of file
@@ -1,6 +1,28 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+
+PREFETCH_DISPATCH_UID = "main.prefetch_graph_token"
+
+
+def _prefetch_graph_token_once(sender, **kwargs):
+    # first request of this process: only web workers get here, never manage.py commands or the preload master
+    request_started.disconnect(dispatch_uid=PREFETCH_DISPATCH_UID)
+    from .services.mailer import prefetch_graph_token
+    prefetch_graph_token()
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        # gunicorn --preload imports the app in the master, so this runs once before fork
+        if getattr(settings, "PRELOAD_WARMUP", False):
+            from .warmup import warm_up
+            warm_up()
+
+        if getattr(settings, "MS_GRAPH_ENABLED", False) and getattr(settings, "GRAPH_TOKEN_PREFETCH", False):
+            from .services.mailer import graph_configured
+            if graph_configured():
+                request_started.connect(_prefetch_graph_token_once, dispatch_uid=PREFETCH_DISPATCH_UID)
@@ -1,56 +1,66 @@
 import os
 import re
-import fitz
-import docx2txt
 from collections import OrderedDict
-import base64
-import io
-import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from .utils import get_grade_tag # Import from local utils for consistency
+from .utils import get_grade_tag
+from .services.entities import extract_entities
+from .services.layout import LayoutAnalyzer
+from .services.sections import is_reverse_chronological, read_pdf, segment
+from .services.spelling import find_typos
+from .services.textstats import text_stats
 
+# Scoring patterns, compiled once at import (and ahead of fork by main.warmup)
+LAYOUT_WORDS_RE = re.compile(r'(table|column|header|footer)')
+JOB_TITLE_RE = re.compile(r'(manager|assistant|executive|analyst|officer)')
 
-def extract_text_from_resume(file_path):
-    """Extracts text from a resume file."""
+KEYWORDS = ("communication", "teamwork", "leadership", "customer service", "problem solving")
+ACTION_VERBS = ("developed", "implemented", "optimized", "managed", "led", "organized", "achieved")
+
+
+def read_resume(file_path):
+    """
+    Text of a resume file, the lines set in a heading font, the page layout
+    features and the hyperlinks, from one parse. The last three are PDF only
+    (empty / None for DOCX).
+    """
     if not isinstance(file_path, str):
         raise ValueError("extract_text_from_resume expects a file path string.")
     
-    text = ""
+    text, styled_lines, layout, links = "", frozenset(), None, []
     if file_path.lower().endswith(".pdf"):
-        doc = fitz.open(file_path)
-        for page in doc:
-            text += page.get_text()
+        import fitz  # PyMuPDF
+        analyzer = LayoutAnalyzer()
+        with fitz.open(file_path) as doc:
+            text, styled_lines = read_pdf(doc, analyzer)
+            links = [link["uri"] for page in doc for link in page.get_links() if link.get("uri")]
+        layout = analyzer.result()
     elif file_path.lower().endswith(".docx"):
+        import docx2txt
         text = docx2txt.process(file_path)
-    return text.strip()
-
-def generate_pie_chart(score_breakdown):
-    """Generate a pie chart and return base64 image."""
-    labels = list(score_breakdown.keys())
-    sizes = [data["score"] for data in score_breakdown.values()]
-    colors = ['#4CAF50', '#2196F3', '#FF9800', '#dc3545', '#9C27B0', '#00BCD4', '#FFC107', '#795548', '#E91E63', '#607D8B', '#8BC34A']
-    fig, ax = plt.subplots()
-    ax.pie(sizes, labels=labels, colors=colors[:len(labels)], autopct='%1.1f%%', startangle=140)
-    ax.axis('equal')
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches="tight", transparent=True)
-    plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode('utf-8')
+    return text.strip(), styled_lines, layout, links
 
 
+def extract_text_from_resume(file_path):
+    """Extracts text from a resume file."""
+    return read_resume(file_path)[0]
+
 def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
     """ATS scoring for non-tech resumes with full report data for HTML."""
-    text = extract_text_from_resume(file_path)
+    text, styled_lines, layout, links = read_resume(file_path)
     text_lower = text.lower()
+    sections = segment(text, styled_lines)
+    entities = extract_entities(text, links)
+    stats = text_stats(text)
+    # PDFs are judged on their page geometry; DOCX text carries none, so fall back to cues in the text
+    simple_layout = layout.is_simple if layout else "\t" not in text and not LAYOUT_WORDS_RE.search(text_lower)
 
     # Contact/links detection
-    contact_detection = "YES" if re.search(r'\b\d{10}\b', text) and re.search(r'@\w+\.\w+', text) else "NO"
-    linkedin_detection = "YES" if "linkedin.com" in text_lower else "NO"
-    github_detection = "YES" if "github.com" in text_lower else "NO"
+    contact_detection = "YES" if entities.phones and entities.emails else "NO"
+    linkedin_detection = "YES" if entities.has_linkedin else "NO"
+    github_detection = "YES" if entities.has_github else "NO"
 
     # Weights from requirement
     criteria = [
@@ -76,7 +86,7 @@ def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
         recs = []
 
         if name == "Format & Layout":
-            if "\t" not in text and not re.search(r'(table|column|header|footer)', text_lower):
+            if simple_layout:
                 score = weight
             else:
                 score = weight // 2
@@ -92,35 +102,34 @@ def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
                 score = 0
 
         elif name == "Section Headings & Structure":
-            if all(h in text_lower for h in ["work experience", "education", "skills"]):
+            chronological = is_reverse_chronological(sections.get("experience"))
+            if sections.has("experience", "education", "skills") and chronological is not False:
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Ensure standard section headings are included.")
 
         elif name == "Job-Title & Core Skills":
-            if re.search(r'(manager|assistant|executive|analyst|officer)', text_lower):
+            if JOB_TITLE_RE.search(text_lower):
                 score = weight
             else:
                 score = weight // 2
 
         elif name == "Dedicated Skills Section":
-            score = weight if "skills" in text_lower else 0
+            score = weight if "skills" in sections else 0
 
         elif name == "Keyword Integration":
-            keywords = ["communication", "teamwork", "leadership", "customer service", "problem solving"]
-            score = min(sum(1 for kw in keywords if kw in text_lower) * 2, weight)
+            score = min(sum(1 for kw in KEYWORDS if kw in text_lower) * 2, weight)
 
         elif name == "Action Verbs":
-            verbs = ["developed", "implemented", "optimized", "managed", "led", "organized", "achieved"]
-            score = min(sum(1 for v in verbs if v in text_lower) * 2, weight)
+            score = min(sum(1 for v in ACTION_VERBS if v in text_lower) * 2, weight)
 
         elif name == "Quantifiable Results":
-            if re.search(r'\d+%', text) or re.search(r'\d{1,3}(?:,\d{3})*(?:\.\d+)?', text):
+            if stats.has_metrics:
                 score = weight
 
         elif name == "Conciseness & Readability":
-            wc = len(text.split())
+            wc = stats.tokens
             if wc <= 800:
                 score = weight
             elif wc <= 1200:
@@ -130,7 +139,7 @@ def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
             score = weight if contact_detection == "YES" else 0
 
         elif name == "Proofreading & Consistency":
-            if len(re.findall(r'\s{2,}', text)) < 5:
+            if stats.whitespace_runs < 5 and not find_typos(text):
                 score = weight
 
         # Grade
@@ -149,8 +158,6 @@ def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
     total_weight = sum(v["weight"] for v in score_breakdown.values())
     overall_score_average = int((total_score / total_weight) * 100)
 
-    pie_chart_image = generate_pie_chart(score_breakdown)
-
     suggestions = [rec for sec in score_breakdown.values() for rec in sec["recommendations"]]
 
     return {
@@ -161,23 +168,25 @@ def ats_scoring_for_non_tech(file_path, applicant_name="Candidate"):
         "ats_score": score_breakdown["Keyword Integration"]["score"],
         "overall_score_average": overall_score_average,
         "score_breakdown": score_breakdown,
-        "pie_chart_image": pie_chart_image,
         "suggestions": suggestions
     }
 
-from .utils import *
-def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate"):
+def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate", resume=None, entities=None):
     """
     New ATS scoring for non-technical resumes using updated 11-criterion model.
+    A caller that has already read the file passes read_resume()'s result as
+    ``resume`` and its extract_entities() record as ``entities``.
     """
-    text = extract_text_from_resume(file_path)
+    text, styled_lines, layout, links = resume or read_resume(file_path)
     text_lower = text.lower()
-
-    first_line = text.split("\n")[0].strip()
-    if len(first_line.split()) <= 5 and not re.search(r'\d', first_line):
-        applicant_name = first_line
-
-    contact_detection = "YES" if re.search(r'\b\d{10}\b', text) and re.search(r'@\w+\.\w+', text) else "NO"
+    sections = segment(text, styled_lines)
+    entities = entities or extract_entities(text, links)
+    stats = text_stats(text)
+    # PDFs are judged on their page geometry; DOCX text carries none, so fall back to cues in the text
+    simple_layout = layout.is_simple if layout else "\t" not in text and not LAYOUT_WORDS_RE.search(text_lower)
+    applicant_name = entities.applicant_name or applicant_name
+
+    contact_detection = "YES" if entities.phones and entities.emails else "NO"
     
     criteria = [
         ("Format & Layout", 20, "Single-column; professional font; minimal colours; avoid headers/footers, text boxes, tables, and multi-column designs."),
@@ -201,11 +210,13 @@ def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate"):
         recs = []
 
         if name == "Format & Layout":
-            if "\t" not in text and not re.search(r'(table|column|header|footer)', text_lower):
+            if simple_layout:
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Switch to a clean one-column layout with no tables or headers/footers.")
+                if layout and layout.image_only_pages:
+                    recs.append("Replace scanned or image-only pages with selectable text.")
 
         elif name == "File Type & Parsing":
             if file_path.lower().endswith(".docx"):
@@ -217,47 +228,46 @@ def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate"):
                 score = 0
 
         elif name == "Section Headings & Structure":
-            if all(h in text_lower for h in ["work experience", "education", "skills"]):
+            chronological = is_reverse_chronological(sections.get("experience"))
+            if sections.has("experience", "education", "skills") and chronological is not False:
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Add standard section headings and ensure reverse-chronological order.")
 
         elif name == "Job-Title & Core Skills":
-            if re.search(r'(manager|assistant|executive|analyst|officer)', text_lower):
+            if JOB_TITLE_RE.search(text_lower):
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Include target job title and core skills in your headline/summary.")
 
         elif name == "Dedicated Skills Section":
-            score = weight if "skills" in text_lower else 0
+            score = weight if "skills" in sections else 0
             if score == 0:
                 recs.append("Add a dedicated Skills or Core Competencies section.")
 
         elif name == "Keyword Integration":
-            keywords = ["communication", "teamwork", "leadership", "customer service", "problem solving"]
-            kw_count = sum(1 for kw in keywords if kw in text_lower)
+            kw_count = sum(1 for kw in KEYWORDS if kw in text_lower)
             score = min(kw_count * 2, weight)
             if score < weight:
                 recs.append("Integrate more role-specific keywords from job descriptions.")
 
         elif name == "Action Verbs":
-            verbs = ["developed", "implemented", "optimized", "managed", "led", "organized", "achieved"]
-            verb_count = sum(1 for v in verbs if v in text_lower)
+            verb_count = sum(1 for v in ACTION_VERBS if v in text_lower)
             score = min(verb_count * 2, weight)
             if score < weight:
                 recs.append("Use strong action verbs to start bullet points.")
 
         elif name == "Quantifiable Results":
-            if re.search(r'\d+%', text) or re.search(r'\d{1,3}(?:,\d{3})*(?:\.\d+)?', text):
+            if stats.has_metrics:
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Add measurable results and metrics to your achievements.")
 
         elif name == "Conciseness & Readability":
-            wc = len(text.split())
+            wc = stats.tokens
             if wc <= 800:
                 score = weight
             elif wc <= 1200:
@@ -273,11 +283,14 @@ def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate"):
                 recs.append("Include phone, email, and name clearly at the top.")
 
         elif name == "Proofreading & Consistency":
-            if len(re.findall(r'\s{2,}', text)) < 5:
+            typos = find_typos(text)
+            if stats.whitespace_runs < 5 and not typos:
                 score = weight
             else:
                 score = weight // 2
                 recs.append("Proofread for consistent formatting and no typos.")
+                if typos:
+                    recs.append("Check the spelling of: " + ", ".join(f"{word} ({fix}?)" for word, fix in typos[:5]) + ".")
 
         # Grade assignment
         pct = (score / weight) * 100
@@ -310,15 +323,11 @@ def ats_scoring_non_tech_v2(file_path, applicant_name="Candidate"):
     total_weight = sum(v["weight"] for v in score_breakdown.values())
     overall_score_average = int((total_score / total_weight) * 100)
 
-    # Pie chart
-    pie_chart_image = generate_pie_chart_v2(score_breakdown)
-
     return {
         "applicant_name": applicant_name,
         "contact_detection": contact_detection,
         "ats_score": ats_score,
         "overall_score_average": overall_score_average,
         "score_breakdown": score_breakdown,
-        "pie_chart_image": pie_chart_image,
         "suggestions": suggestions
     }
\ No newline at end of file
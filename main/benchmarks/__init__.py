@@ -0,0 +1,8 @@
+"""
+Benchmarks for the resume pipeline.
+
+``corpus`` builds a deterministic set of synthetic resumes (PDF and DOCX, several
+sizes and layouts); ``runner`` times each stage against it, from text extraction
+to full view round trips, and compares a run with a stored baseline. Run them
+with ``python manage.py benchmark``.
+"""
@@ -0,0 +1,318 @@
+"""
+Deterministic synthetic resumes for benchmarking.
+
+Every document is generated from a seed, so a corpus built on one machine has
+the same text, structure and page count as one built anywhere else. Sizes set
+how much experience a resume lists; layouts cover the shapes real uploads take
+(plain single column, a two-column sidebar design, and a table-heavy one).
+"""
+import io
+import random
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+SIZES = {
+    # name: (jobs, bullets per job, projects)
+    "short": (2, 3, 1),
+    "medium": (4, 5, 3),
+    "long": (9, 8, 6),
+}
+LAYOUTS = ("single_column", "two_column", "table")
+FORMATS = ("pdf", "docx")
+
+FIRST_NAMES = ["Jordan", "Priya", "Alex", "Mei", "Samuel", "Aisha", "Diego", "Hannah", "Ravi", "Elena"]
+LAST_NAMES = ["Example", "Sharma", "Okafor", "Lindqvist", "Tanaka", "Moreau", "Kowalski", "Nguyen", "Haddad", "Silva"]
+TITLES = [
+    "Software Engineer", "Data Analyst", "Marketing Manager", "Sales Executive",
+    "HR Business Partner", "Financial Analyst", "Customer Success Lead", "DevOps Engineer",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Logistics", "Wayne Retail", "Hooli", "Vandelay Imports"]
+VERBS = [
+    "Developed", "Implemented", "Optimized", "Led", "Managed", "Designed", "Launched", "Negotiated",
+    "Automated", "Reduced", "Increased", "Coordinated", "Analyzed", "Built", "Streamlined", "Mentored",
+]
+OBJECTS = [
+    "the quarterly reporting pipeline", "a customer onboarding programme", "the regional sales playbook",
+    "CI/CD workflows for six services", "a churn prediction model", "vendor contracts across three markets",
+    "the recruitment funnel", "an internal analytics dashboard", "cross-functional launch plans",
+    "the payroll reconciliation process", "a REST API used by partner teams", "social media campaigns",
+]
+OUTCOMES = [
+    "cutting processing time by {n}%", "increasing revenue by ${n}K", "improving retention by {n}%",
+    "serving {n}K monthly users", "saving {n} hours per week", "reducing costs by {n}%",
+]
+SKILLS = [
+    "Python", "SQL", "Excel", "Salesforce", "Tableau", "Project Management", "Negotiation", "AWS",
+    "Docker", "Kubernetes", "Stakeholder Management", "Google Analytics", "SEO", "Budgeting",
+    "Public Speaking", "JIRA", "Power BI", "Recruiting", "CRM", "Data Visualization",
+]
+DEGREES = ["B.Sc. Computer Science", "BBA Marketing", "B.Com Finance", "MBA", "M.Sc. Data Science", "BA Psychology"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "School of Business"]
+CERTIFICATIONS = [
+    "AWS Certified Cloud Practitioner", "Google Data Analytics Professional Certificate",
+    "PMP Certification", "HubSpot Inbound Marketing Certificate", "SHRM-CP",
+]
+
+# Report context for the PDF export stage
+TECH_SECTIONS = [
+    "Resume (ATS Score)", "GitHub Profile", "Portfolio Website",
+    "LeetCode/DSA Skills", "LinkedIn", "Certifications & Branding",
+]
+NON_TECH_SECTIONS = [
+    ("Format & Layout", 20), ("File Type & Parsing", 10), ("Section Headings & Structure", 10),
+    ("Job-Title & Core Skills", 10), ("Dedicated Skills Section", 10), ("Keyword Integration", 10),
+    ("Action Verbs", 10), ("Quantifiable Results", 10), ("Conciseness & Readability", 10),
+    ("Contact Info & Links", 5), ("Proofreading & Consistency", 5),
+]
+
+# python-docx stamps the current time into docProps/core.xml otherwise
+FIXED_TIMESTAMP = datetime(2024, 1, 1)
+
+
+@dataclass(frozen=True)
+class CorpusItem:
+    name: str  # "<size>-<layout>.<format>"
+    size: str
+    layout: str
+    format: str
+    path: Path
+
+
+def build_resume(seed: int, size: str) -> dict:
+    """The structured content of one resume; the same (seed, size) always gives the same resume."""
+    rng = random.Random(f"{seed}:{size}")
+    jobs, bullets, projects = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    title = rng.choice(TITLES)
+    handle = f"{first}{last}".lower()
+    year = 2024
+
+    experience = []
+    for _ in range(jobs):
+        start = year - rng.randint(1, 3)
+        experience.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "dates": f"Jan {start} - Dec {year}" if year < 2024 else f"Mar {start} - Present",
+            "bullets": [
+                f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, "
+                + rng.choice(OUTCOMES).format(n=rng.randint(5, 60))
+                for _ in range(bullets)
+            ],
+        })
+        year = start
+
+    return {
+        "name": f"{first} {last}",
+        "title": title,
+        "contact": [
+            f"{handle}@example.com", f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            f"linkedin.com/in/{handle}", f"github.com/{handle}",
+        ],
+        "summary": (
+            f"{title} with {2024 - year}+ years of experience in "
+            f"{', '.join(rng.sample(SKILLS, 3))}. "
+            f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, {rng.choice(OUTCOMES).format(n=rng.randint(5, 60))}."
+        ),
+        "experience": experience,
+        "projects": [
+            f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} - {rng.choice(OUTCOMES).format(n=rng.randint(5, 60))}"
+            for _ in range(projects)
+        ],
+        "education": [f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {year - 4} - {year}"],
+        "skills": rng.sample(SKILLS, min(len(SKILLS), 6 + 2 * jobs)),
+        "certifications": rng.sample(CERTIFICATIONS, min(len(CERTIFICATIONS), 1 + jobs // 3)),
+    }
+
+
+# ----------------------------
+# PDF (reportlab)
+# ----------------------------
+def write_pdf(resume: dict, layout: str, path: Path) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        BaseDocTemplate, Frame, FrameBreak, PageTemplate, Paragraph, Spacer, Table, TableStyle,
+    )
+
+    styles = getSampleStyleSheet()
+    body, heading = styles["BodyText"], styles["Heading2"]
+    width, height = A4
+    margin = 2 * cm
+
+    def section(title, lines, bullet=False):
+        return [Paragraph(title, heading)] + [Paragraph(("&bull; " if bullet else "") + line, body) for line in lines]
+
+    def experience():
+        flow = [Paragraph("Work Experience", heading)]
+        for job in resume["experience"]:
+            flow.append(Paragraph(f"<b>{job['title']}</b>, {job['company']} ({job['dates']})", body))
+            if layout == "table":
+                table = Table([[b] for b in job["bullets"]], colWidths=[width - 2 * margin])
+                table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.grey)]))
+                flow.append(table)
+            else:
+                flow += [Paragraph("&bull; " + b, body) for b in job["bullets"]]
+        return flow
+
+    header = [Paragraph(resume["name"], styles["Title"]), Paragraph(" | ".join(resume["contact"]), body)]
+    sidebar = (
+        section("Skills", resume["skills"])
+        + section("Education", resume["education"])
+        + section("Certifications", resume["certifications"])
+    )
+    main = section("Summary", [resume["summary"]]) + experience() + section("Projects", resume["projects"], bullet=True)
+
+    # invariant=True drops the creation date and random document ID, so output bytes are reproducible
+    doc = BaseDocTemplate(str(path), pagesize=A4, invariant=True, title=resume["name"])
+    if layout == "two_column":
+        sidebar_width = 5.5 * cm
+        first = [
+            Frame(margin, height - margin - 3 * cm, width - 2 * margin, 3 * cm, id="header"),
+            Frame(margin, margin, sidebar_width, height - 2 * margin - 3 * cm, id="sidebar"),
+            Frame(margin + sidebar_width + 0.5 * cm, margin, width - 2 * margin - sidebar_width - 0.5 * cm,
+                  height - 2 * margin - 3 * cm, id="main"),
+        ]
+        later = [Frame(margin, margin, width - 2 * margin, height - 2 * margin, id="rest")]
+        doc.addPageTemplates([PageTemplate("first", first, autoNextPageTemplate="later"), PageTemplate("later", later)])
+        story = header + [FrameBreak()] + sidebar + [FrameBreak()] + main
+    else:
+        doc.addPageTemplates([PageTemplate("page", [Frame(margin, margin, width - 2 * margin, height - 2 * margin)])])
+        if layout == "table":
+            skills = resume["skills"]
+            rows = [skills[i:i + 3] + [""] * (3 - len(skills[i:i + 3])) for i in range(0, len(skills), 3)]
+            grid = Table(rows)
+            grid.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.grey)]))
+            sidebar = [Paragraph("Skills", heading), grid] + sidebar[len(skills) + 1:]
+        story = header + [Spacer(1, 0.3 * cm)] + main + sidebar
+    doc.build(story)
+
+
+# ----------------------------
+# DOCX (python-docx)
+# ----------------------------
+def write_docx(resume: dict, layout: str, path: Path) -> None:
+    from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    doc = Document()
+    props = doc.core_properties
+    props.author, props.title = resume["name"], resume["name"]
+    props.created = props.modified = FIXED_TIMESTAMP
+
+    if layout == "two_column":
+        sect_pr = doc.sections[0]._sectPr
+        cols = sect_pr.find(qn("w:cols"))
+        if cols is None:
+            cols = OxmlElement("w:cols")
+            sect_pr.append(cols)
+        cols.set(qn("w:num"), "2")
+
+    doc.add_heading(resume["name"], level=0)
+    doc.add_paragraph(" | ".join(resume["contact"]))
+    doc.add_heading("Summary", level=1)
+    doc.add_paragraph(resume["summary"])
+
+    doc.add_heading("Work Experience", level=1)
+    for job in resume["experience"]:
+        doc.add_paragraph().add_run(f"{job['title']}, {job['company']} ({job['dates']})").bold = True
+        if layout == "table":
+            table = doc.add_table(rows=len(job["bullets"]), cols=1)
+            table.style = "Table Grid"
+            for row, bullet in zip(table.rows, job["bullets"]):
+                row.cells[0].text = bullet
+        else:
+            for bullet in job["bullets"]:
+                doc.add_paragraph(bullet, style="List Bullet")
+
+    doc.add_heading("Projects", level=1)
+    for project in resume["projects"]:
+        doc.add_paragraph(project, style="List Bullet")
+
+    doc.add_heading("Skills", level=1)
+    if layout == "table":
+        skills = resume["skills"]
+        table = doc.add_table(rows=(len(skills) + 2) // 3, cols=3)
+        table.style = "Table Grid"
+        for i, skill in enumerate(skills):
+            table.cell(i // 3, i % 3).text = skill
+    else:
+        doc.add_paragraph(", ".join(resume["skills"]))
+
+    doc.add_heading("Education", level=1)
+    for line in resume["education"]:
+        doc.add_paragraph(line)
+    doc.add_heading("Certifications", level=1)
+    for line in resume["certifications"]:
+        doc.add_paragraph(line, style="List Bullet")
+    doc.save(str(path))
+
+
+def generate_corpus(directory: Path, seed: int = 0, sizes=tuple(SIZES), layouts=LAYOUTS, formats=FORMATS) -> list[CorpusItem]:
+    """Write one resume per (size, layout, format) into ``directory`` and return them in a stable order."""
+    directory.mkdir(parents=True, exist_ok=True)
+    writers = {"pdf": write_pdf, "docx": write_docx}
+    items = []
+    for size in sizes:
+        resume = build_resume(seed, size)
+        for layout in layouts:
+            for fmt in formats:
+                name = f"{size}-{layout}.{fmt}"
+                writers[fmt](resume, layout, directory / name)
+                items.append(CorpusItem(name, size, layout, fmt, directory / name))
+    return items
+
+
+def unique_variant(data: bytes, fmt: str, nonce: int) -> bytes:
+    """Same document, different digest, so the upload-level result reuse can't short-circuit the view."""
+    if fmt == "pdf":
+        return data + f"\n%bench-{nonce}\n".encode("ascii")  # readers ignore anything after %%EOF
+    buffer = io.BytesIO(data)
+    with zipfile.ZipFile(buffer, "a") as archive:
+        archive.comment = f"bench-{nonce}".encode("ascii")
+    return buffer.getvalue()
+
+
+def sample_context(non_tech: bool = False) -> dict:
+    """A representative report context (no result_key, so nothing is cached)."""
+    if non_tech:
+        sections = {
+            name: {
+                "score": weight - (i % 3), "grade": ("Excellent", "Good", "Average")[i % 3], "weight": weight,
+                "sub_criteria": [{"name": name, "score": weight - (i % 3), "weight": weight,
+                                  "insight": "Use standard headings and consistent date formats."}],
+            }
+            for i, (name, weight) in enumerate(NON_TECH_SECTIONS)
+        }
+        role = "Marketing"
+    else:
+        sections = {
+            name: {
+                "score": 40 + 9 * i, "grade": ("Excellent", "Good", "Average")[i % 3], "weight": 15,
+                "sub_criteria": [{"name": f"{name} criterion {j}", "score": j, "weight": 5,
+                                  "insight": "Link present and recent activity in the last 90 days."}
+                                 for j in range(1, 5)],
+            }
+            for i, name in enumerate(TECH_SECTIONS)
+        }
+        role = "Software Engineer"
+    return {
+        "kind": "non_technical" if non_tech else "technical",
+        "applicant_name": "Jordan Example",
+        "contact_detection": "YES",
+        "linkedin_detection": "YES",
+        "github_detection": "NO" if non_tech else "YES",
+        "ats_score": 72,
+        "overall_score_average": 68,
+        "overall_grade": "Good",
+        "score_breakdown": sections,
+        "score_breakdown_ordered": list(sections.items()),
+        "missing_certifications": ["Google Data Analytics Professional Certificate – Coursera"] * 4,
+        "suggestions": ["Add measurable results and metrics to your achievements."] * 3,
+        "role": role,
+    }
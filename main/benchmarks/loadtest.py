@@ -0,0 +1,213 @@
+"""
+Open-loop load generator for a running server.
+
+Requests are started on a fixed schedule (constant or Poisson arrivals at the
+target rate) whether or not earlier ones have finished, so a slow server shows
+up as growing latency instead of a quietly lowered request rate. Each request
+records two numbers: its response time from the moment it was actually sent,
+and its queue delay, how late it was sent because every virtual user was busy.
+
+Virtual users keep their own cookies (CSRF token, session), so a report
+download follows an analysis the same user submitted, as in the browser.
+"""
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from .corpus import CorpusItem, unique_variant
+from .runner import percentile
+
+ENDPOINTS = ("analyze_resume", "analyze_resume_v2", "download_resume_report", "send_signup_otp", "send_email_otp")
+DEFAULT_MIX = {
+    "analyze_resume": 1, "analyze_resume_v2": 3, "download_resume_report": 2,
+    "send_signup_otp": 1, "send_email_otp": 1,
+}
+TECH_ROLES = ["software_engineer", "data_scientist", "devops_engineer", "web_developer", "mobile_developer"]
+NON_TECH_ROLES = ["human_resources", "marketing", "sales", "finance", "customer_service"]
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    latency: float  # seconds from send to the end of the response body
+    queue_delay: float  # seconds between the scheduled and the actual send
+    outcome: str  # HTTP status as a string, or the exception name
+
+
+@dataclass
+class User:
+    session: object  # aiohttp.ClientSession with its own cookie jar
+    csrf: str = ""
+    has_report: bool = False
+
+
+@dataclass
+class LoadConfig:
+    base_url: str
+    corpus: list[CorpusItem]
+    rate: float = 5.0  # requests started per second
+    duration: float = 60.0
+    users: int = 20  # concurrent virtual users, i.e. the in-flight request cap
+    mix: dict = field(default_factory=lambda: dict(DEFAULT_MIX))
+    repeat_ratio: float = 0.2  # share of uploads that resubmit a file byte-for-byte
+    poisson: bool = True
+    timeout: float = 120.0
+    seed: int = 0
+    github_username: str = ""
+    leetcode_username: str = ""
+
+
+class LoadTest:
+    def __init__(self, config: LoadConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.samples: list[Sample] = []
+        self.nonce = itertools.count()
+        self.uploads = {item.name: item.path.read_bytes() for item in config.corpus}
+        endpoints = [e for e in ENDPOINTS if config.mix.get(e)]
+        self.endpoints, self.weights = endpoints, [config.mix[e] for e in endpoints]
+
+    # ----------------------------
+    # Request builders
+    # ----------------------------
+    def _upload(self):
+        import aiohttp
+
+        item = self.rng.choice(self.config.corpus)
+        data = self.uploads[item.name]
+        if self.rng.random() >= self.config.repeat_ratio:
+            data = unique_variant(data, item.format, next(self.nonce))
+        form = aiohttp.FormData()
+        form.add_field("resume", data, filename=item.path.name, content_type=CONTENT_TYPES[item.format])
+        return form
+
+    def _request(self, endpoint: str) -> tuple[str, str, object]:
+        """(method, path, form data) for one request."""
+        n = next(self.nonce)
+        if endpoint == "analyze_resume":
+            form = self._upload()
+            form.add_field("domain", "technical")
+            form.add_field("tech_role", self.rng.choice(TECH_ROLES))
+            form.add_field("github_username", self.config.github_username)
+            form.add_field("leetcode_username", self.config.leetcode_username)
+            return "POST", "/analyze_resume/", form
+        if endpoint == "analyze_resume_v2":
+            form = self._upload()
+            form.add_field("nontech_role", self.rng.choice(NON_TECH_ROLES))
+            return "POST", "/analyze_resume_v2/", form
+        if endpoint == "download_resume_report":
+            return "GET", "/download_resume_report/", None
+        if endpoint == "send_signup_otp":
+            return "POST", "/send-signup-otp", {"email": f"load+{n}@example.com", "mobile": f"9{n:09d}"[-10:]}
+        return "POST", "/send-email-otp", {"email": f"load+{n}@example.com"}
+
+    # ----------------------------
+    # Execution
+    # ----------------------------
+    async def _prepare(self, user: User) -> None:
+        """Fetch the upload page once so the user has a CSRF cookie, as a browser would."""
+        async with user.session.get("/upload_resume/") as resp:
+            await resp.read()
+        cookie = user.session.cookie_jar.filter_cookies(self.config.base_url).get("csrftoken")
+        user.csrf = cookie.value if cookie else ""
+
+    async def _run_one(self, endpoint: str, user: User, scheduled: float) -> None:
+        import aiohttp
+
+        if endpoint == "download_resume_report" and not user.has_report:
+            endpoint = "analyze_resume_v2"  # nothing to download yet; analyse first, like a real visitor
+        method, path, data = self._request(endpoint)
+        headers = {"X-CSRFToken": user.csrf, "Referer": self.config.base_url + "/upload_resume/"}
+        sent = time.perf_counter()
+        try:
+            async with user.session.request(method, path, data=data, headers=headers, allow_redirects=False) as resp:
+                await resp.read()
+                outcome = str(resp.status)
+                if endpoint.startswith("analyze") and resp.status < 400:
+                    user.has_report = True
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except aiohttp.ClientError as e:
+            outcome = type(e).__name__
+        self.samples.append(Sample(endpoint, time.perf_counter() - sent, sent - scheduled, outcome))
+
+    async def _worker(self, queue: asyncio.Queue, user: User) -> None:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            endpoint, scheduled = job
+            await self._run_one(endpoint, user, scheduled)
+
+    async def run(self) -> float:
+        """Drive the server for the configured duration; returns the elapsed wall time."""
+        import aiohttp
+
+        config = self.config
+        connector = aiohttp.TCPConnector(limit=config.users)
+        timeout = aiohttp.ClientTimeout(total=config.timeout)
+        users = []
+        try:
+            for _ in range(config.users):
+                users.append(User(aiohttp.ClientSession(
+                    base_url=config.base_url, connector=connector, connector_owner=False,
+                    timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True),
+                )))
+            await asyncio.gather(*(self._prepare(user) for user in users))
+
+            queue: asyncio.Queue = asyncio.Queue()
+            workers = [asyncio.create_task(self._worker(queue, user)) for user in users]
+            started = time.perf_counter()
+            next_at = started
+            while next_at - started < config.duration:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                endpoint = self.rng.choices(self.endpoints, self.weights)[0]
+                queue.put_nowait((endpoint, next_at))
+                next_at += self.rng.expovariate(config.rate) if config.poisson else 1 / config.rate
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+            return time.perf_counter() - started
+        finally:
+            for user in users:
+                await user.session.close()
+            await connector.close()
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    """Throughput, latency percentiles and outcome counts, per endpoint and overall."""
+    def stats(group: list[Sample]) -> dict:
+        latencies = sorted(s.latency * 1000 for s in group)
+        delays = sorted(s.queue_delay * 1000 for s in group)
+        outcomes = Counter(s.outcome for s in group)
+        ok = sum(n for outcome, n in outcomes.items() if outcome.isdigit() and int(outcome) < 400)
+        return {
+            "requests": len(group),
+            "ok": ok,
+            "errors": len(group) - ok,
+            "throughput_rps": ok / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1],
+            "queue_delay_p95_ms": percentile(delays, 0.95),
+            "outcomes": dict(sorted(outcomes.items())),
+        }
+
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    return {
+        "elapsed_s": elapsed,
+        "overall": stats(samples) if samples else {},
+        "endpoints": {name: stats(group) for name, group in sorted(by_endpoint.items())},
+    }
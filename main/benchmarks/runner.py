@@ -0,0 +1,248 @@
+"""
+Stage benchmarks over the synthetic corpus, and baseline comparison.
+
+Each stage is a context manager yielding (case, callable) pairs, so stages that
+need setup (a test database, overridden settings) keep it in place for exactly
+as long as their cases are measured. A case is warmed up, timed for N
+iterations and, optionally, run once more under tracemalloc for its peak
+allocation, so tracing never skews the timings.
+"""
+import itertools
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+
+from .corpus import CorpusItem, sample_context, unique_variant
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile; with a handful of iterations interpolation would overstate precision."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def measure(func, iterations: int, warmup: int = 1, memory: bool = False) -> dict:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    result = {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": statistics.median(timings),
+        "p95_ms": percentile(timings, 0.95),
+        "min_ms": timings[0],
+        "max_ms": timings[-1],
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+@contextmanager
+def extraction_cases(corpus: list[CorpusItem]):
+    """What _extract_resume runs for an upload: text and links for PDFs, text for DOCX."""
+    from main.calculate_ats_score import extract_text_from_docx
+    from main.utils import extract_links_combined
+
+    cases = []
+    for item in corpus:
+        path = str(item.path)
+        extract = extract_links_combined if item.format == "pdf" else extract_text_from_docx
+        cases.append((item.name, lambda extract=extract, path=path: extract(path)))
+    yield cases
+
+
+@contextmanager
+def ats_scoring_cases(corpus: list[CorpusItem]):
+    from main.ats_score_non_tech import ats_scoring_non_tech_v2
+
+    yield [(item.name, lambda path=str(item.path): ats_scoring_non_tech_v2(path)) for item in corpus]
+
+
+@contextmanager
+def derive_metrics_cases(corpus: list[CorpusItem]):
+    """One case per size, on the text of its single-column PDF."""
+    from main.ats_score_non_tech import extract_text_from_resume
+    from main.utils import derive_resume_metrics
+
+    cases = []
+    for item in corpus:
+        if item.format == "pdf" and item.layout == "single_column":
+            text = extract_text_from_resume(str(item.path))
+            cases.append((item.size, lambda text=text: derive_resume_metrics(text, "Software Engineer")))
+    yield cases
+
+
+@contextmanager
+def chart_cases(corpus: list[CorpusItem]):
+    """Uncached chart rendering (the work chart_cache saves on a miss)."""
+    from main.services.charts import render_pie_svg, svg_to_png
+
+    tech = sample_context()["score_breakdown"]
+    non_tech = sample_context(non_tech=True)["score_breakdown"]
+    series = {
+        "technical": (list(tech), [s["score"] for s in tech.values()], "dark"),
+        "non_tech": (list(non_tech), [s["score"] for s in non_tech.values()], "non_tech"),
+    }
+    cases = []
+    for label, (labels, sizes, theme) in series.items():
+        svg = render_pie_svg(labels, sizes, theme)
+        cases.append((f"svg-{label}", lambda labels=labels, sizes=sizes, theme=theme: render_pie_svg(labels, sizes, theme)))
+        cases.append((f"png-{label}", lambda svg=svg: svg_to_png(svg.encode("utf-8"))))
+    yield cases
+
+
+@contextmanager
+def pdf_export_cases(corpus: list[CorpusItem]):
+    from main.services.report_pdf import render_report_pdf
+
+    cases = []
+    for backend in ("xhtml2pdf", "reportlab"):
+        for label, context in (("technical", sample_context()), ("non_tech", sample_context(non_tech=True))):
+            cases.append((f"{backend}-{label}", lambda c=context, b=backend: render_report_pdf(c, backend=b)))
+    yield cases
+
+
+@contextmanager
+def view_cases(corpus: list[CorpusItem]):
+    """
+    Full round trips through the Django test client against a throwaway test database:
+    a fresh analysis, a resubmission of the same file (served from the stored result),
+    and the report download that follows.
+    """
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import Client, override_settings
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    nonce = itertools.count()
+    try:
+        with override_settings(RATE_LIMIT_ENABLED=False, MEMORY_SOFT_LIMIT_MB=0, PROFILE_SAMPLE_RATE=0.0):
+            cases = []
+            for item in corpus:
+                if item.layout != "single_column":
+                    continue
+                client = Client()
+                data = item.path.read_bytes()
+
+                def post(payload, client=client, name=item.path.name):
+                    response = client.post("/analyze_resume_v2/", {
+                        "nontech_role": "marketing",
+                        "resume": SimpleUploadedFile(name, payload),
+                    })
+                    if response.status_code != 200:
+                        raise RuntimeError(f"analyze_resume_v2 returned {response.status_code}")
+
+                def download(client=client):
+                    response = client.get("/download_resume_report/")
+                    if response.status_code != 200:
+                        raise RuntimeError(f"download_resume_report returned {response.status_code}")
+                    if response.streaming:
+                        for _ in response.streaming_content:  # read the file like a client would
+                            pass
+                    response.close()
+
+                cases.append((f"analyze_v2-fresh-{item.name}",
+                              lambda post=post, data=data, fmt=item.format: post(unique_variant(data, fmt, next(nonce)))))
+                cases.append((f"analyze_v2-repeat-{item.name}", lambda post=post, data=data: post(data)))
+                cases.append((f"download_report-{item.name}", download))
+            yield cases
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+STAGES = {
+    "extraction": extraction_cases,
+    "ats_scoring_non_tech": ats_scoring_cases,
+    "derive_resume_metrics": derive_metrics_cases,
+    "charts": chart_cases,
+    "pdf_export": pdf_export_cases,
+    "views": view_cases,
+}
+
+
+# ----------------------------
+# Running and comparing
+# ----------------------------
+def _git_revision() -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=str(settings.BASE_DIR), timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def run_benchmarks(corpus: list[CorpusItem], stages=tuple(STAGES), iterations: int = 5, warmup: int = 1,
+                   memory: bool = False, seed: int = 0, progress=None) -> dict:
+    """Measure every case of the selected stages; returns the JSON-serialisable report."""
+    results = {}
+    for stage in stages:
+        try:
+            with STAGES[stage](corpus) as cases:
+                for case, func in cases:
+                    key = f"{stage}/{case}"
+                    try:
+                        results[key] = {"stage": stage, "case": case,
+                                        **measure(func, iterations, warmup, memory)}
+                    except Exception as e:
+                        results[key] = {"stage": stage, "case": case, "error": f"{type(e).__name__}: {e}"}
+                    if progress:
+                        progress(key, results[key])
+        except Exception as e:  # the stage couldn't even be set up (e.g. a missing dependency)
+            results[stage] = {"stage": stage, "case": "", "error": f"{type(e).__name__}: {e}"}
+            if progress:
+                progress(stage, results[stage])
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "iterations": iterations,
+            "warmup": warmup,
+            "corpus": [item.name for item in corpus],
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.1, metric: str = "p50_ms") -> list[dict]:
+    """Per case present in both runs: the change in ``metric`` and whether it is beyond ``threshold``."""
+    rows = []
+    for key, now in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if not before or metric not in now or metric not in before or not before[metric]:
+            continue
+        ratio = now[metric] / before[metric]
+        verdict = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+        rows.append({"key": key, "baseline": before[metric], "current": now[metric],
+                     "change": ratio - 1, "verdict": verdict})
+    return rows
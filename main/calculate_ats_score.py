@@ -1,37 +1,31 @@
 import os
-import re
-import fitz # PyMuPDF
-import docx2txt
-import requests
 from dotenv import load_dotenv
 
+from .services.entities import extract_entities
+
 load_dotenv()
 
 # --- Resume Text Extraction ---
 def extract_text_from_pdf(file_path):
     """Extracts text from a PDF file using PyMuPDF (fitz)."""
+    import fitz # PyMuPDF
     text = ""
     try:
-        doc = fitz.open(file_path)
-        for page in doc:
-            text += page.get_text()
+        with fitz.open(file_path) as doc:
+            for page in doc:
+                text += page.get_text()
     except Exception:
         pass
     return text
 
 def extract_text_from_docx(file_path):
     """Extracts text from a DOCX file using docx2txt."""
+    import docx2txt
     try:
         return docx2txt.process(file_path)
     except Exception:
         return ""
 
-# --- Link Extractors ---
-def extract_link(pattern, text):
-    """Extracts a single link from text based on a regex pattern."""
-    match = re.search(pattern, text)
-    return match.group(0) if match else None
-
 # --- Scoring Functions ---
 def score_github(github_url):
     """Placeholder for GitHub scoring."""
@@ -53,9 +47,9 @@ def score_resume_structure(text):
     """Placeholder for Resume structure scoring."""
     return 15 if text else 0
 
-def score_certifications(text):
+def score_certifications(entities):
     """Placeholder for Certifications scoring."""
-    return 15 if "certificate" in text.lower() else 0
+    return 15 if entities.has_certification else 0
 
 # --- Main Logic ---
 def get_overall_score(file_path):
@@ -71,10 +65,11 @@ def get_overall_score(file_path):
     else:
         return {"error": "Unsupported file format."}
 
-    github_url = extract_link(r'https?://github\.com/[A-Za-z0-9_-]+', text)
-    leetcode_url = extract_link(r'https?://leetcode\.com/[A-Za-z0-9_-]+', text)
-    portfolio_url = extract_link(r'https?://[a-zA-Z0-9.-]+\.(me|tech|dev|xyz|site|vercel\.app|github\.io)', text)
-    linkedin_url = extract_link(r'https?://(www\.)?linkedin\.com/in/[A-Za-z0-9_-]+', text)
+    entities = extract_entities(text)
+    github_url = next(iter(entities.github_urls), None)
+    leetcode_url = next(iter(entities.leetcode_urls), None)
+    portfolio_url = next(iter(entities.portfolio_urls), None)
+    linkedin_url = next(iter(entities.linkedin_urls), None)
 
     scores = {
         "GitHub": score_github(github_url),
@@ -82,7 +77,7 @@ def get_overall_score(file_path):
         "Portfolio": score_portfolio(portfolio_url),
         "LinkedIn": score_linkedin(linkedin_url, text),
         "Resume": score_resume_structure(text),
-        "Certifications": score_certifications(text)
+        "Certifications": score_certifications(entities)
     }
 
     total = sum(scores.values())
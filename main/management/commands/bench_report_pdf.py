@@ -0,0 +1,47 @@
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from main.benchmarks.corpus import sample_context
+from main.services.report_pdf import render_report_pdf
+
+
+def measure(context: dict, backend: str, iterations: int) -> dict:
+    render_report_pdf(context, backend=backend)  # warm imports, fonts and templates
+    timings = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        pdf = render_report_pdf(context, backend=backend)
+        timings.append((time.perf_counter() - started) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": statistics.median(timings),
+        "peak_kb": peak / 1024,
+        "bytes": len(pdf),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare per-report render time and peak memory of the xhtml2pdf and reportlab PDF backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--backends", nargs="+", default=["xhtml2pdf", "reportlab"])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'report':<10} {'backend':<10} {'mean ms':>9} {'p50 ms':>9} {'peak KiB':>10} {'size':>8}")
+        for label, context in (("technical", sample_context()), ("non-tech", sample_context(non_tech=True))):
+            results = {}
+            for backend in options["backends"]:
+                r = results[backend] = measure(context, backend, options["iterations"])
+                self.stdout.write(
+                    f"{label:<10} {backend:<10} {r['mean_ms']:9.1f} {r['p50_ms']:9.1f} {r['peak_kb']:10.0f} {r['bytes']:8d}"
+                )
+            if {"xhtml2pdf", "reportlab"} <= results.keys():
+                speedup = results["xhtml2pdf"]["mean_ms"] / results["reportlab"]["mean_ms"]
+                self.stdout.write(self.style.SUCCESS(f"{label}: reportlab is {speedup:.1f}x faster"))
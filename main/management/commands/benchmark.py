@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmarks.corpus import FORMATS, LAYOUTS, SIZES, generate_corpus
+from main.benchmarks.runner import STAGES, compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark each resume-processing stage on a deterministic synthetic corpus, write the "
+        "results as JSON and compare them with the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+        parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+        parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+        parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+        parser.add_argument("--seed", type=int, default=0, help="Corpus seed; keep it fixed when comparing runs.")
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--memory", action="store_true", help="Also record each case's peak traced allocation.")
+        parser.add_argument("--output", help="Where to write the JSON results (default: BENCHMARK_DIR/<revision>.json).")
+        parser.add_argument("--baseline", default=None, help="Baseline to compare with (default: BENCHMARK_BASELINE).")
+        parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+        parser.add_argument("--threshold", type=float, default=0.10,
+                            help="Relative p50 change reported as faster/slower (default 0.10 = 10%%).")
+        parser.add_argument("--fail-on-regression", action="store_true",
+                            help="Exit with an error when any case is slower than the baseline.")
+
+    def _progress(self, key, result):
+        if "error" in result:
+            self.stdout.write(self.style.WARNING(f"  {key:<55} {result['error']}"))
+        else:
+            self.stdout.write(f"  {key:<55} p50 {result['p50_ms']:9.2f} ms   p95 {result['p95_ms']:9.2f} ms")
+
+    def handle(self, *args, **options):
+        bench_dir = Path(settings.BENCHMARK_DIR)
+        corpus_dir = bench_dir / f"corpus-{options['seed']}"
+        corpus = generate_corpus(
+            corpus_dir, seed=options["seed"],
+            sizes=options["sizes"], layouts=options["layouts"], formats=options["formats"],
+        )
+        self.stdout.write(f"Corpus: {len(corpus)} documents in {corpus_dir}")
+
+        report = run_benchmarks(
+            corpus, stages=options["stages"], iterations=options["iterations"], warmup=options["warmup"],
+            memory=options["memory"], seed=options["seed"], progress=self._progress,
+        )
+
+        output = Path(options["output"] or bench_dir / f"{report['meta']['revision'] or 'results'}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(f"Results written to {output}")
+
+        baseline_path = Path(options["baseline"] or settings.BENCHMARK_BASELINE)
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Saved as baseline {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            self.stdout.write("No baseline to compare with; store one with --save-baseline.")
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("meta", {}).get("seed") != options["seed"]:
+            self.stdout.write(self.style.WARNING("Baseline was recorded with a different corpus seed."))
+        rows = compare(report, baseline, options["threshold"])
+        self.stdout.write(
+            f"\nAgainst baseline {baseline.get('meta', {}).get('revision') or baseline_path.name} (p50):"
+        )
+        styles = {"slower": self.style.ERROR, "faster": self.style.SUCCESS, "same": str}
+        for row in rows:
+            line = (f"  {row['key']:<55} {row['baseline']:9.2f} -> {row['current']:9.2f} ms "
+                    f"{row['change']:+7.1%}  {row['verdict']}")
+            self.stdout.write(styles[row["verdict"]](line))
+        regressions = [row["key"] for row in rows if row["verdict"] == "slower"]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} case(s) slower than the baseline: " + ", ".join(regressions))
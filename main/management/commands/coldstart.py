@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start (django.setup() + URLconf import) in a fresh interpreter "
+        "and fail when it exceeds COLD_START_BUDGET_MS or pulls in a forbidden heavy module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget-ms", type=float, default=None,
+                            help="Override settings.COLD_START_BUDGET_MS.")
+        parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list.")
+        parser.add_argument("--runs", type=int, default=3, help="Measure this many times and keep the fastest run.")
+
+    def _measure(self):
+        code = (
+            "import django; django.setup(); "
+            "from importlib import import_module; "
+            "from django.conf import settings; import_module(settings.ROOT_URLCONF)"
+        )
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "Full_web.settings")}
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env, cwd=str(settings.BASE_DIR),
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if proc.returncode != 0:
+            tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+            raise CommandError("Cold start failed:\n" + "\n".join(tail[-20:]))
+
+        modules = {}
+        for line in proc.stderr.splitlines():
+            # "import time:       self [us] |  cumulative | imported package"
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            _, _self_us, cumulative_us, name = line.replace("import time:", "|", 1).split("|")
+            name = name[1:]  # one separator space, then two spaces per nesting level
+            depth = (len(name) - len(name.lstrip())) // 2
+            modules[name.strip()] = (int(cumulative_us), depth)
+        import_ms = sum(us for us, depth in modules.values() if depth == 0) / 1000
+        return wall_ms, import_ms, modules
+
+    def handle(self, *args, **options):
+        budget_ms = options["budget_ms"] if options["budget_ms"] is not None else settings.COLD_START_BUDGET_MS
+        forbidden = getattr(settings, "COLD_START_FORBIDDEN_IMPORTS", [])
+
+        runs = [self._measure() for _ in range(max(1, options["runs"]))]
+        wall_ms, import_ms, modules = min(runs, key=lambda run: run[1])
+
+        self.stdout.write(f"Process wall time: {wall_ms:.0f} ms")
+        self.stdout.write(f"Import time:       {import_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        self.stdout.write(f"Modules imported:  {len(modules)}")
+        self.stdout.write("Slowest imports (cumulative):")
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[: options["top"]]
+        for name, (us, _) in slowest:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+        problems = []
+        loaded_forbidden = [name for name in forbidden if name in modules]
+        if loaded_forbidden:
+            problems.append("heavy modules imported at startup: " + ", ".join(loaded_forbidden))
+        if import_ms > budget_ms:
+            problems.append(f"import time {import_ms:.0f} ms exceeds budget of {budget_ms:.0f} ms")
+        if problems:
+            raise CommandError("Cold start over budget: " + "; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("Cold start within budget."))
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmarks.corpus import FORMATS, LAYOUTS, SIZES, generate_corpus
+from main.benchmarks.loadtest import DEFAULT_MIX, ENDPOINTS, LoadConfig, LoadTest, summarize
+
+
+def parse_mix(spec: str) -> dict:
+    """``analyze_resume_v2=3,download_resume_report=1`` -> relative weights per endpoint."""
+    mix = {}
+    for pair in filter(None, spec.split(",")):
+        name, _, weight = pair.partition("=")
+        if name not in ENDPOINTS:
+            raise CommandError(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server's upload, analysis, report and OTP endpoints at a target request rate "
+        "and report throughput, latency percentiles and errors. Point it at a staging or local server "
+        "(with the upstreams on run_stubs and RATE_LIMIT_ENABLED=false), never at production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server origin (scheme://host:port).")
+        parser.add_argument("--rate", type=float, default=5.0, help="Requests started per second.")
+        parser.add_argument("--duration", type=float, default=60.0, help="Seconds to keep starting requests.")
+        parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users (in-flight cap).")
+        parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                            help="Relative weight per endpoint, e.g. analyze_resume_v2=3,send_email_otp=1.")
+        parser.add_argument("--repeat-ratio", type=float, default=0.2,
+                            help="Share of uploads that resubmit an identical file (exercises result reuse).")
+        parser.add_argument("--constant", action="store_true", help="Evenly spaced arrivals instead of Poisson.")
+        parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+        parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+        parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+        parser.add_argument("--github-username", default="", help="Sent with technical analyses.")
+        parser.add_argument("--leetcode-username", default="", help="Sent with technical analyses.")
+        parser.add_argument("--label", default="", help="Free text stored with the results, e.g. 'gunicorn -w 4'.")
+        parser.add_argument("--output", help="Also write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if options["rate"] <= 0 or options["users"] < 1:
+            raise CommandError("--rate must be positive and --users at least 1.")
+        corpus = generate_corpus(
+            Path(settings.BENCHMARK_DIR) / f"corpus-{options['seed']}", seed=options["seed"],
+            sizes=options["sizes"], layouts=options["layouts"], formats=options["formats"],
+        )
+        config = LoadConfig(
+            base_url=options["url"].rstrip("/"),
+            corpus=corpus,
+            rate=options["rate"],
+            duration=options["duration"],
+            users=options["users"],
+            mix=parse_mix(options["mix"]),
+            repeat_ratio=options["repeat_ratio"],
+            poisson=not options["constant"],
+            timeout=options["timeout"],
+            seed=options["seed"],
+            github_username=options["github_username"],
+            leetcode_username=options["leetcode_username"],
+        )
+        self.stdout.write(
+            f"Load testing {config.base_url} at {config.rate:g} req/s for {config.duration:g}s "
+            f"with {config.users} users ({len(corpus)} corpus documents)"
+        )
+        test = LoadTest(config)
+        try:
+            elapsed = asyncio.run(test.run())
+        except OSError as e:
+            raise CommandError(f"Cannot reach {config.base_url}: {e}")
+        report = summarize(test.samples, elapsed)
+        report["config"] = {
+            "url": config.base_url, "rate": config.rate, "duration": config.duration, "users": config.users,
+            "mix": config.mix, "repeat_ratio": config.repeat_ratio, "poisson": config.poisson,
+            "seed": config.seed, "label": options["label"],
+        }
+
+        self.stdout.write(
+            f"\n{'endpoint':<24} {'reqs':>6} {'ok/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'max ms':>9} {'queue p95':>10}  outcomes"
+        )
+        rows = list(report["endpoints"].items()) + ([("overall", report["overall"])] if report["overall"] else [])
+        for name, row in rows:
+            outcomes = " ".join(f"{k}:{v}" for k, v in row["outcomes"].items())
+            line = (f"{name:<24} {row['requests']:>6} {row['throughput_rps']:>7.2f} {row['p50_ms']:>9.1f} "
+                    f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f} "
+                    f"{row['queue_delay_p95_ms']:>10.1f}  {outcomes}")
+            self.stdout.write(self.style.WARNING(line) if row["errors"] else line)
+        if report["overall"] and report["overall"]["queue_delay_p95_ms"] > 1000:
+            self.stdout.write(self.style.WARNING(
+                "Requests queued for over a second: the server (or --users) can't keep up with this rate."
+            ))
+
+        if options["output"]:
+            output = Path(options["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Results written to {output}")
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from main.services.result_store import purge_expired_results
+
+
+class Command(BaseCommand):
+    help = "Delete stored analysis results older than ANALYSIS_RESULT_RETENTION (save_result also does this hourly)."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Purged {purge_expired_results()} expired result(s)")
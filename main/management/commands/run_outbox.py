@@ -0,0 +1,28 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from main.services.outbox import drain_once, run_sender
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox (use with OUTBOX_SENDER=command)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Send what is due and exit.")
+        parser.add_argument("--poll", type=float, default=None, help="Seconds between polls when idle.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while sent := drain_once():
+                total += sent
+            self.stdout.write(f"Attempted {total} mail(s)")
+            return
+
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+        self.stdout.write("Outbox sender running; Ctrl+C to stop")
+        run_sender(stop, idle_timeout=options["poll"])
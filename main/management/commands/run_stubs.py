@@ -0,0 +1,82 @@
+import signal
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.stubs.server import SERVICES, Behaviour, StubConfig, StubServer, parse_override
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve local stand-ins for GitHub, LeetCode, Gemini and Microsoft Graph that replay recorded "
+        "fixtures (or record them), with configurable latency, error rate and rate limits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+        parser.add_argument("--fixtures", default=None, help="Fixture directory (default: STUB_FIXTURES_DIR).")
+        parser.add_argument("--strict", action="store_true",
+                            help="Replay only recorded fixtures; 404 instead of a synthetic response.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and injected errors.")
+        parser.add_argument("--latency-ms", type=float, default=0.0)
+        parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay up to this.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail.")
+        parser.add_argument("--error-status", type=int, default=503)
+        parser.add_argument("--rate-limit", type=int, default=0, help="Requests per --rate-window; 0 = unlimited.")
+        parser.add_argument("--rate-window", type=float, default=60.0)
+        parser.add_argument("--service", action="append", default=[], metavar="NAME:KEY=VALUE,...",
+                            help="Per-service override, e.g. github:latency_ms=250,rate_limit=60. Repeatable.")
+
+    def handle(self, *args, **options):
+        default = Behaviour(
+            latency_ms=options["latency_ms"], jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"], error_status=options["error_status"],
+            rate_limit=options["rate_limit"], rate_window=options["rate_window"],
+        )
+        try:
+            overrides = dict(parse_override(spec, default) for spec in options["service"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        config = StubConfig(
+            mode=options["mode"],
+            fixtures=Path(options["fixtures"] or settings.STUB_FIXTURES_DIR),
+            strict=options["strict"],
+            seed=options["seed"],
+            default=default,
+            overrides=overrides,
+        )
+        try:
+            server = StubServer((options["host"], options["port"]), config)
+        except OSError as e:
+            raise CommandError(f"Cannot listen on {options['host']}:{options['port']}: {e}")
+
+        base = f"http://{options['host']}:{server.server_address[1]}"
+        self.stdout.write(f"Stub upstreams ({config.mode}, fixtures in {config.fixtures}) on {base}")
+        for name in SERVICES:
+            self.stdout.write(f"  {name:<9} {config.behaviour(name)}")
+        self.stdout.write("Point the app at them with:")
+        for line in (
+            f"GITHUB_API_BASE={base}/github",
+            f"LEETCODE_GRAPHQL_URL={base}/leetcode/graphql",
+            f"GRAPH_API_BASE={base}/graph/v1.0",
+            f"GRAPH_LOGIN_BASE={base}/login",
+            f"GEMINI_API_ENDPOINT={base}",
+        ):
+            self.stdout.write(f"  {line}")
+
+        def stop(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+        self.stdout.write("Responses by service and status:")
+        for (service, status), count in sorted(server.counts.items()):
+            self.stdout.write(f"  {service:<9} {status}  {count}")
@@ -0,0 +1,72 @@
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from .services import memory, metrics, profiling
+
+
+class RequestMetricsMiddleware:
+    """Records http_request_duration_seconds per view and writes this worker's metrics snapshot."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        metrics.observe(
+            "http_request_duration_seconds",
+            time.perf_counter() - started,
+            view=metrics.view_name(request),
+            method=request.method,
+            status=response.status_code,
+        )
+        metrics.flush()
+        return response
+
+
+class MemoryGuardMiddleware:
+    """
+    Per-request memory accounting, the soft-limit guard for MEMORY_GUARDED_VIEWS and
+    worker recycling past MEMORY_RECYCLE_MB; see main/services/memory.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.guarded = set(getattr(settings, "MEMORY_GUARDED_VIEWS", ()))
+
+    def __call__(self, request):
+        with memory.track_request(request):
+            response = self.get_response(request)
+        memory.maybe_recycle()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if not match or match.url_name not in self.guarded or not memory.over_soft_limit():
+            return None
+        metrics.inc("memory_rejections_total", view=match.url_name)
+        response = HttpResponse("The server is busy, please retry shortly.", status=503, content_type="text/plain")
+        response["Retry-After"] = str(memory.retry_after_seconds())
+        return response
+
+
+class SampledProfilingMiddleware:
+    """
+    Runs a sampled fraction of requests to PROFILED_VIEWS (or any request with a
+    valid X-Profile token) under a profiler; see main/services/profiling.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.views = set(getattr(settings, "PROFILED_VIEWS", ()))
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if not match or match.url_name not in self.views or not profiling.should_profile(request):
+            return None
+        return profiling.run_profiled(match.url_name, view_func, request, *view_args, **view_kwargs)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_analysisresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisresult',
+            name='upload_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='analysisresult',
+            name='scoring_version',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='analysisresult',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
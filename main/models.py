@@ -19,3 +19,41 @@ class Resume(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.file.name}"
+
+
+class AnalysisResult(models.Model):
+    """A finished report context, stored once and referenced from the session by result_key."""
+    result_key = models.CharField(max_length=64, unique=True)
+    upload_key = models.CharField(max_length=64, blank=True, db_index=True)  # role + uploaded bytes + usernames
+    kind = models.CharField(max_length=20)  # "technical" / "non_technical"
+    scoring_version = models.CharField(max_length=20, blank=True)
+    payload = models.BinaryField()  # zlib-compressed compact JSON
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # purge_expired_results scans by age
+
+    def __str__(self):
+        return f"{self.kind} - {self.result_key[:12]}"
+
+
+class EmailOutbox(models.Model):
+    """Outgoing email queued by a request and delivered by the outbox sender."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (SENDING, "Sending"), (SENT, "Sent"), (FAILED, "Failed")]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)  # cleared once sent; OTP mails must not linger
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.status})"
@@ -0,0 +1,198 @@
+"""
+Batch analysis: many resumes in, one NDJSON line out per resume.
+
+The resumes of a batch request (multipart files, or the members of uploaded
+ZIP archives) are listed up front from metadata alone, then copied one at a
+time to a temporary file and handed to a shared, bounded thread pool. At most
+BATCH_IN_FLIGHT resumes of a request are spooled or being scored at once, and
+each result is written to the response as soon as it is ready, so memory and
+temp-disk use stay flat however many resumes the batch holds.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import IO, Callable, Iterator
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+CHUNK_SIZE = 64 * 1024
+
+
+class BatchError(ValueError):
+    """The request as a whole cannot be processed; the message is safe to show the client."""
+
+
+class ItemError(Exception):
+    """One resume of the batch failed; the message is safe to show the client."""
+
+
+@dataclass
+class BatchItem:
+    index: int
+    filename: str
+    size: int
+    open: Callable[[], IO[bytes]]
+    error: str = ""  # set when the item is rejected before it is read
+
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+
+def collect_items(files, max_files: int, max_bytes: int) -> list[BatchItem]:
+    """
+    The resumes in ``files`` (Django UploadedFiles), with every ``.zip`` expanded
+    to its members. Only sizes and names are looked at; unsupported or oversized
+    entries come back with ``error`` set, and a batch over ``max_files`` raises.
+    """
+    items: list[BatchItem] = []
+
+    def add(filename: str, size: int, opener: Callable[[], IO[bytes]]) -> None:
+        if len(items) >= max_files:
+            raise BatchError(f"A batch may hold at most {max_files} resumes.")
+        item = BatchItem(len(items), filename, size, opener)
+        if _extension(filename) not in SUPPORTED_EXTENSIONS:
+            item.error = "Unsupported file format."
+        elif size > max_bytes:
+            item.error = f"File is larger than {max_bytes // (1024 * 1024)} MB."
+        items.append(item)
+
+    for upload in files:
+        if _extension(upload.name) != ".zip":
+            add(upload.name, upload.size, upload.open)
+            continue
+        try:
+            archive = zipfile.ZipFile(upload)
+        except zipfile.BadZipFile:
+            raise BatchError(f"{upload.name} is not a valid ZIP archive.")
+        for info in archive.infolist():
+            base = os.path.basename(info.filename)
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or not base or base.startswith("."):
+                continue
+            add(info.filename, info.file_size, lambda archive=archive, info=info: archive.open(info))
+    return items
+
+
+def _spool(item: BatchItem, max_bytes: int) -> tuple[str, str]:
+    """Copy the item to a temporary file; returns (path, sha256). The size is enforced on the bytes read."""
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(suffix=_extension(item.filename))
+    try:
+        written = 0
+        with os.fdopen(fd, "wb") as out, item.open() as src:
+            while chunk := src.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise ItemError(f"File is larger than {max_bytes // (1024 * 1024)} MB.")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest()
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_guard = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_guard:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "BATCH_WORKERS", 2),
+                thread_name_prefix="batch",
+            )
+        return _executor
+
+
+def _run(analyze: Callable[[str, str, str], dict], path: str, ext: str, digest: str) -> dict:
+    close_old_connections()
+    try:
+        return analyze(path, ext, digest)
+    finally:
+        os.unlink(path)
+        close_old_connections()  # pool threads outlive requests, so nothing else closes their connections
+
+
+def _line(payload: dict) -> bytes:
+    return (json.dumps(payload, default=str) + "\n").encode("utf-8")
+
+
+def stream_results(items: list[BatchItem], analyze: Callable[[str, str, str], dict],
+                   max_bytes: int, in_flight: int | None = None) -> Iterator[bytes]:
+    """
+    NDJSON for a StreamingHttpResponse: ``analyze(path, ext, sha256)`` is run on
+    the pool for each item and its dict sent as {"index", "filename", "status":
+    "ok", ...} in completion order; failures are sent as {"status": "error",
+    "error"}. A final {"status": "done"} line carries the totals. If the client
+    disconnects, queued items are cancelled and their files removed.
+    """
+    in_flight = max(1, in_flight or getattr(settings, "BATCH_IN_FLIGHT", 4))
+    executor = _get_executor()
+    started = time.perf_counter()
+    pending: dict[Future, tuple[BatchItem, str]] = {}
+    counts = {"ok": 0, "error": 0}
+
+    def result(item: BatchItem, status: str, **fields) -> bytes:
+        counts[status] += 1
+        return _line({"index": item.index, "filename": item.filename, "status": status, **fields})
+
+    def finished(future: Future) -> bytes:
+        item, _ = pending.pop(future)
+        try:
+            return result(item, "ok", **future.result())
+        except ItemError as exc:
+            return result(item, "error", error=str(exc))
+        except Exception:
+            logger.exception("Batch analysis failed for %s", item.filename)
+            return result(item, "error", error="Analysis failed.")
+
+    try:
+        for item in items:
+            if item.error:
+                yield result(item, "error", error=item.error)
+                continue
+            while len(pending) >= in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finished(future)
+            try:
+                path, digest = _spool(item, max_bytes)
+            except ItemError as exc:
+                yield result(item, "error", error=str(exc))
+                continue
+            except (OSError, zipfile.BadZipFile, RuntimeError):  # a corrupt or encrypted ZIP member
+                logger.warning("Could not read batch item %s", item.filename, exc_info=True)
+                yield result(item, "error", error="Could not read the file.")
+                continue
+            pending[executor.submit(_run, analyze, path, _extension(item.filename), digest)] = (item, path)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield finished(future)
+
+        yield _line({
+            "status": "done",
+            "total": len(items),
+            "ok": counts["ok"],
+            "errors": counts["error"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        })
+    finally:
+        for future, (_, path) in pending.items():
+            if future.cancel():  # never started, so _run will not remove its file
+                os.unlink(path)
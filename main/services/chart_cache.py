@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Sequence
+
+from django.conf import settings
+
+from .charts import render_pie_svg, svg_to_png
+from .disk_cache import maybe_prune, touch
+from .metrics import register_collector, stage_timer
+
+
+def chart_key(labels: Sequence[str], sizes: Sequence[float], theme: str, fmt: str = "svg") -> tuple:
+    """Canonical cache key for a chart: the same scores always map to the same key."""
+    return (tuple(str(label) for label in labels), tuple(round(float(s), 4) for s in sizes), theme, fmt)
+
+
+def key_digest(key: tuple) -> str:
+    return hashlib.sha256(json.dumps(key, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ChartCache:
+    """
+    Two-level cache of rendered chart bytes:
+      - a bounded in-process LRU
+      - an optional directory shared by every worker (survives restarts),
+        pruned to ``max_bytes`` (0: unbounded)
+    """
+
+    def __init__(self, maxsize: int = 256, directory: str | os.PathLike | None = None, max_bytes: int = 0):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self._lru: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: tuple) -> Path | None:
+        if not self.directory:
+            return None
+        digest = key_digest(key)
+        return self.directory / digest[:2] / f"{digest}.{key[-1]}"
+
+    def _remember(self, key: tuple, data: bytes) -> None:
+        with self._lock:
+            self._lru[key] = data
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            data = self._lru.get(key)
+            if data is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return data
+        path = self._path(key)
+        if path is not None:
+            try:
+                data = path.read_bytes()
+            except OSError:
+                data = None
+            if data is not None:
+                touch(path)
+                self._remember(key, data)
+                with self._lock:
+                    self.disk_hits += 1
+                return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: tuple, data: bytes) -> None:
+        self._remember(key, data)
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return  # the in-process copy is still valid; disk is best-effort
+        maybe_prune(self.directory, self.max_bytes)
+
+    def get_or_render(self, key: tuple, render: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is None:
+            with stage_timer("chart_render"):
+                data = render()
+            self.put(key, data)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def reset_stats(self) -> None:
+        """Zero the counters (a forked worker keeps its parent's charts but counts its own lookups)."""
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._lru),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+chart_cache = ChartCache(
+    maxsize=getattr(settings, "CHART_CACHE_SIZE", 256),
+    directory=getattr(settings, "CHART_CACHE_DIR", None),
+    max_bytes=getattr(settings, "CHART_CACHE_MAX_MB", 0) * 1024 * 1024,
+)
+os.register_at_fork(after_in_child=chart_cache.reset_stats)  # per-process counts; see metrics.py
+
+LOOKUP_RESULTS = {"hits": "memory_hit", "disk_hits": "disk_hit", "misses": "miss"}
+
+
+def _collect():
+    stats = chart_cache.stats()
+    for field, result in LOOKUP_RESULTS.items():
+        yield "chart_cache_requests_total", {"result": result}, stats[field]
+
+
+register_collector(_collect)
+
+
+def cached_pie_svg(labels: Sequence[str], sizes: Sequence[float], theme: str = "dark") -> bytes:
+    """Rendered SVG bytes for the chart, from the cache when the same scores were seen before."""
+    key = chart_key(labels, sizes, theme, "svg")
+    return chart_cache.get_or_render(key, lambda: render_pie_svg(labels, sizes, theme).encode("utf-8"))
+
+
+def cached_pie_png(labels: Sequence[str], sizes: Sequence[float], theme: str = "dark") -> bytes:
+    key = chart_key(labels, sizes, theme, "png")
+    return chart_cache.get_or_render(key, lambda: svg_to_png(cached_pie_svg(labels, sizes, theme)))
+
+
+# ----------------------------
+# Report charts by result_key
+# ----------------------------
+_report_specs: OrderedDict[str, dict] = OrderedDict()
+_report_specs_lock = threading.Lock()
+
+
+def _spec_path(result_key: str) -> Path | None:
+    if not chart_cache.directory:
+        return None
+    return chart_cache.directory / "reports" / result_key[:2] / f"{result_key}.json"
+
+
+def register_report_chart(result_key: str, labels: Sequence[str], sizes: Sequence[float], theme: str) -> dict:
+    """Remember which chart belongs to a report so /report/<result_key>/chart.* can serve it from any worker."""
+    spec = {"labels": [str(label) for label in labels], "sizes": [float(s) for s in sizes], "theme": theme}
+    with _report_specs_lock:
+        _report_specs[result_key] = spec
+        _report_specs.move_to_end(result_key)
+        while len(_report_specs) > chart_cache.maxsize:
+            _report_specs.popitem(last=False)
+    path = _spec_path(result_key)
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(spec, fh)
+            os.replace(tmp, path)
+        except OSError:
+            return spec
+        maybe_prune(chart_cache.directory, chart_cache.max_bytes)
+    return spec
+
+
+def report_chart_version(spec: dict) -> str:
+    """Short digest of a report chart's scores, for the ?v= of its URL: result keys don't hash the scores."""
+    return key_digest(chart_key(spec["labels"], spec["sizes"], spec["theme"]))[:16]
+
+
+def report_chart_spec(result_key: str) -> dict | None:
+    with _report_specs_lock:
+        spec = _report_specs.get(result_key)
+    if spec is not None:
+        return spec
+    path = _spec_path(result_key)
+    if path is None:
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def report_chart_bytes(result_key: str, fmt: str = "svg") -> bytes | None:
+    spec = report_chart_spec(result_key)
+    if not spec:
+        return None
+    render = cached_pie_png if fmt == "png" else cached_pie_svg
+    return render(spec["labels"], spec["sizes"], spec["theme"])
@@ -0,0 +1,154 @@
+import base64
+import math
+from dataclasses import dataclass
+from html import escape
+from typing import Sequence
+
+# matplotlib's default "tab10" property cycle, so charts look the same as before
+DEFAULT_COLORS = (
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
+)
+
+NON_TECH_COLORS = (
+    "#4CAF50", "#2196F3", "#FF9800", "#dc3545", "#9C27B0", "#00BCD4",
+    "#FFC107", "#795548", "#E91E63", "#607D8B", "#8BC34A",
+)
+
+
+@dataclass(frozen=True)
+class ChartTheme:
+    colors: tuple = DEFAULT_COLORS
+    background: str | None = None
+    text_color: str = "#000000"
+    start_angle: float = 0.0
+    show_percent: bool = False
+    show_labels: bool = False
+    legend: bool = False
+    legend_title: str = ""
+    legend_columns: int = 2
+    inner_radius: float = 0.0  # fraction of the outer radius; > 0 draws a donut
+
+
+THEMES = {
+    # the report pages' chart: dark card, legend underneath in two columns
+    "dark": ChartTheme(background="#121212", text_color="#ffffff", legend=True, legend_title="Categories"),
+    # labelled wedges with percentages, transparent
+    "non_tech": ChartTheme(colors=NON_TECH_COLORS, start_angle=140.0, show_percent=True, show_labels=True),
+    # default colours, labelled wedges with percentages
+    "light": ChartTheme(background="#ffffff", start_angle=90.0, show_percent=True, show_labels=True),
+}
+
+SIZE = 800
+RADIUS = 300
+FONT_SIZE = 22
+LEGEND_ROW = 40
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _point(cx: float, cy: float, r: float, angle: float) -> tuple:
+    # Angles run counter-clockwise from 3 o'clock like matplotlib; SVG's y axis points down.
+    rad = math.radians(angle)
+    return cx + r * math.cos(rad), cy - r * math.sin(rad)
+
+
+def _wedge_path(cx: float, cy: float, r: float, inner: float, start: float, end: float) -> str:
+    large = 1 if end - start > 180 else 0
+    x1, y1 = _point(cx, cy, r, start)
+    x2, y2 = _point(cx, cy, r, end)
+    if inner <= 0:
+        return (f"M{_fmt(cx)},{_fmt(cy)} L{_fmt(x1)},{_fmt(y1)} "
+                f"A{_fmt(r)},{_fmt(r)} 0 {large} 0 {_fmt(x2)},{_fmt(y2)} Z")
+    x3, y3 = _point(cx, cy, inner, end)
+    x4, y4 = _point(cx, cy, inner, start)
+    return (f"M{_fmt(x1)},{_fmt(y1)} A{_fmt(r)},{_fmt(r)} 0 {large} 0 {_fmt(x2)},{_fmt(y2)} "
+            f"L{_fmt(x3)},{_fmt(y3)} A{_fmt(inner)},{_fmt(inner)} 0 {large} 1 {_fmt(x4)},{_fmt(y4)} Z")
+
+
+def _full_ring(cx: float, cy: float, r: float, inner: float, color: str) -> str:
+    if inner <= 0:
+        return f'<circle cx="{_fmt(cx)}" cy="{_fmt(cy)}" r="{_fmt(r)}" fill="{color}"/>'
+    # even-odd ring drawn as two concentric circles
+    return (f'<path fill="{color}" fill-rule="evenodd" d="'
+            f'M{_fmt(cx + r)},{_fmt(cy)} A{_fmt(r)},{_fmt(r)} 0 1 0 {_fmt(cx - r)},{_fmt(cy)} '
+            f'A{_fmt(r)},{_fmt(r)} 0 1 0 {_fmt(cx + r)},{_fmt(cy)} Z '
+            f'M{_fmt(cx + inner)},{_fmt(cy)} A{_fmt(inner)},{_fmt(inner)} 0 1 0 {_fmt(cx - inner)},{_fmt(cy)} '
+            f'A{_fmt(inner)},{_fmt(inner)} 0 1 0 {_fmt(cx + inner)},{_fmt(cy)} Z"/>')
+
+
+def render_pie_svg(labels: Sequence[str], sizes: Sequence[float], theme: str | ChartTheme = "dark") -> str:
+    """Render a pie (or donut) chart as a standalone SVG document string."""
+    if isinstance(theme, str):
+        theme = THEMES[theme]
+    values = [max(0.0, float(s)) for s in sizes]
+    total = sum(values)
+
+    legend_rows = math.ceil(len(labels) / max(1, theme.legend_columns)) if theme.legend else 0
+    legend_height = (legend_rows + (1 if theme.legend_title else 0)) * LEGEND_ROW + (20 if theme.legend else 0)
+    width, height = SIZE, SIZE + legend_height
+    cx, cy = SIZE / 2, SIZE / 2
+    inner = RADIUS * theme.inner_radius
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family="DejaVu Sans, Arial, sans-serif">']
+    if theme.background:
+        parts.append(f'<rect width="{width}" height="{height}" fill="{theme.background}"/>')
+
+    angle = theme.start_angle
+    for i, value in enumerate(values):
+        if total <= 0 or value <= 0:
+            continue
+        color = theme.colors[i % len(theme.colors)]
+        sweep = 360.0 * value / total
+        if sweep >= 359.999:
+            parts.append(_full_ring(cx, cy, RADIUS, inner, color))
+        else:
+            parts.append(f'<path fill="{color}" d="{_wedge_path(cx, cy, RADIUS, inner, angle, angle + sweep)}"/>')
+
+        mid = angle + sweep / 2
+        if theme.show_percent:
+            px, py = _point(cx, cy, (RADIUS + inner) / 2 if inner else RADIUS * 0.6, mid)
+            parts.append(f'<text x="{_fmt(px)}" y="{_fmt(py)}" font-size="{FONT_SIZE}" fill="{theme.text_color}" '
+                         f'text-anchor="middle" dominant-baseline="central">{100.0 * value / total:.1f}%</text>')
+        if theme.show_labels:
+            lx, ly = _point(cx, cy, RADIUS * 1.1, mid)
+            anchor = "start" if math.cos(math.radians(mid)) >= 0 else "end"
+            parts.append(f'<text x="{_fmt(lx)}" y="{_fmt(ly)}" font-size="{FONT_SIZE}" fill="{theme.text_color}" '
+                         f'text-anchor="{anchor}" dominant-baseline="central">{escape(str(labels[i]))}</text>')
+        angle += sweep
+
+    if theme.legend:
+        y = SIZE + 10
+        if theme.legend_title:
+            parts.append(f'<text x="{_fmt(cx)}" y="{y + LEGEND_ROW / 2}" font-size="{FONT_SIZE}" '
+                         f'fill="{theme.text_color}" text-anchor="middle" dominant-baseline="central">'
+                         f'{escape(theme.legend_title)}</text>')
+            y += LEGEND_ROW
+        col_width = width / max(1, theme.legend_columns)
+        for i, label in enumerate(labels):
+            row, col = divmod(i, max(1, theme.legend_columns))
+            x0 = col * col_width + 60
+            y0 = y + row * LEGEND_ROW
+            color = theme.colors[i % len(theme.colors)]
+            parts.append(f'<rect x="{_fmt(x0)}" y="{_fmt(y0 + 8)}" width="24" height="24" fill="{color}"/>')
+            parts.append(f'<text x="{_fmt(x0 + 36)}" y="{_fmt(y0 + LEGEND_ROW / 2)}" font-size="{FONT_SIZE}" '
+                         f'fill="{theme.text_color}" dominant-baseline="central">{escape(str(label))}</text>')
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def svg_to_png(svg: bytes) -> bytes:
+    """Rasterize an SVG document to PNG with PyMuPDF (already loaded for resume parsing)."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=svg, filetype="svg") as doc:
+        return doc[0].get_pixmap().tobytes("png")
+
+
+def render_pie_svg_base64(labels: Sequence[str], sizes: Sequence[float], theme: str | ChartTheme = "dark") -> str:
+    """Same as render_pie_svg, base64-encoded for ``data:image/svg+xml;base64,`` URIs."""
+    return base64.b64encode(render_pie_svg(labels, sizes, theme).encode("utf-8")).decode("ascii")
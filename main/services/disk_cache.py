@@ -0,0 +1,73 @@
+"""
+Size cap for the on-disk caches (rendered charts, report PDFs).
+
+Files are written atomically into a directory tree and never expire on their
+own, so after a write the writer occasionally walks the tree and, when it holds
+more than its byte cap, deletes the files with the oldest mtime until it is back
+under ``PRUNE_TARGET`` of the cap. Cache hits refresh the mtime, so the files
+that go are the least recently used. Every worker prunes the same directory
+independently; a file another worker already removed is simply skipped.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL = 60.0  # seconds between walks of one directory, per process
+PRUNE_TARGET = 0.8  # prune down to this share of the cap, so a full cache isn't walked on every write
+
+_last_pruned: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def touch(path: Path) -> None:
+    """Mark a cached file as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune(directory: str | os.PathLike, max_bytes: int) -> int:
+    """Delete the oldest files under ``directory`` until it holds at most PRUNE_TARGET * max_bytes; returns bytes freed."""
+    files, total = [], 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return 0
+    freed, goal = 0, total - int(max_bytes * PRUNE_TARGET)
+    for _, size, path in sorted(files):
+        if freed >= goal:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        freed += size
+    logger.info("Pruned %d bytes from %s", freed, directory)
+    return freed
+
+
+def maybe_prune(directory: str | os.PathLike | None, max_bytes: int) -> None:
+    """prune() at most once per PRUNE_INTERVAL per directory; call it after writing to the cache."""
+    if not directory or max_bytes <= 0:
+        return
+    key, now = str(directory), time.monotonic()
+    with _lock:
+        if now - _last_pruned.get(key, float("-inf")) < PRUNE_INTERVAL:
+            return
+        _last_pruned[key] = now
+    try:
+        prune(directory, max_bytes)
+    except OSError:
+        logger.warning("Could not prune %s", directory, exc_info=True)
@@ -0,0 +1,216 @@
+"""
+Single-pass extraction of the contact details and links in a resume.
+
+One compiled, case-insensitive scanner walks the text once and picks out
+emails, phone numbers, URLs (bare platform domains included) and the
+contact/certification keywords the scorers look for; the matches are then
+sorted into a typed ResumeEntities record. Views and scorers read that record
+instead of lowercasing the text and searching it again for each question.
+"""
+import re
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+_URL_CHARS = r"[^\s<>()\"'\[\]{}|,;]"
+_SCANNER = re.compile(
+    rf"""
+    (?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)
+    | (?P<url>
+        (?:https?://|www\.){_URL_CHARS}+
+        | \b(?:[\w-]+\.)*(?:linkedin\.com|github\.com|leetcode\.com|github\.io|vercel\.app|netlify\.app)
+          (?:/{_URL_CHARS}*)?
+      )
+    | (?P<phone>(?<![\w+])(?:\(\d{{1,4}}\)[ \t.-]*|\+)?\d[\d \t().-]{{6,}}\d(?![\w]))
+    | (?P<keyword>\b(?:e-?mail|phone|mobile|certifications?|certificates?|certified)\b)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_LINE_RE = re.compile(r"[^\n]+")
+_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,3}$")
+_NON_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "summary", "profile", "objective", "experience",
+    "education", "skills", "contact", "projects", "certifications", "references",
+}
+# title-case lines under the name are usually a job title or a credential, not a second name
+_TITLE_WORDS = {
+    "manager", "engineer", "developer", "director", "analyst", "consultant", "specialist", "coordinator",
+    "assistant", "officer", "executive", "administrator", "architect", "designer", "scientist", "intern",
+    "associate", "representative", "accountant", "recruiter", "lead", "head", "owner", "president",
+    "senior", "junior", "principal", "chief", "vp", "ceo", "cto", "cfo", "coo",
+    "certified", "certificate", "certification", "master", "practitioner", "professional", "scrum",
+}
+# a phone match that starts with the year closing a date range ("Jan 2019 - Dec 2021 0123 ...")
+_YEAR_PREFIX = re.compile(r"(?:19|20)\d{2}[\s.-]+")
+_DATE_BEFORE = re.compile(
+    r"(?:\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?|[-–—/]|\bto|\bfrom|\bsince)\s*$",
+    re.IGNORECASE,
+)
+# first path segments on github.com / leetcode.com that are site pages, not users
+_GITHUB_RESERVED = {"orgs", "about", "features", "topics", "collections", "marketplace", "sponsors", "settings", "login", "join"}
+_LEETCODE_RESERVED = {"problems", "contest", "discuss", "explore", "problemset", "studyplan", "accounts"}
+_TRAILING_PUNCT = ".,;:!?)]}'\""
+
+NAME_LINES = 5  # name candidates come from the first few non-empty lines
+
+
+@dataclass(frozen=True)
+class ResumeEntities:
+    emails: tuple[str, ...] = ()
+    phones: tuple[str, ...] = ()
+    linkedin_urls: tuple[str, ...] = ()
+    github_urls: tuple[str, ...] = ()
+    leetcode_urls: tuple[str, ...] = ()
+    portfolio_urls: tuple[str, ...] = ()
+    github_username: str = ""
+    leetcode_username: str = ""
+    name_candidates: tuple[str, ...] = ()
+    certifications: tuple[str, ...] = ()  # the lines that mention a certification/certificate
+    contact_keywords: bool = False  # "email", "phone" or "mobile" appears as a label
+
+    @property
+    def applicant_name(self) -> str:
+        return self.name_candidates[0] if self.name_candidates else ""
+
+    @property
+    def has_contact(self) -> bool:
+        """Any sign of contact details (the loose check the report header uses)."""
+        return bool(self.emails or self.phones or self.contact_keywords)
+
+    @property
+    def has_linkedin(self) -> bool:
+        return bool(self.linkedin_urls)
+
+    @property
+    def has_github(self) -> bool:
+        return bool(self.github_urls or self.github_username)
+
+    @property
+    def has_certification(self) -> bool:
+        return bool(self.certifications)
+
+    def link_map(self) -> dict:
+        """The {"linkedin", "github", "portfolio"} shape utils.extract_and_identify_links has always returned."""
+        return {
+            "linkedin": self.linkedin_urls[-1] if self.linkedin_urls else None,
+            "github": self.github_urls[-1] if self.github_urls else None,
+            "portfolio": list(self.portfolio_urls),
+        }
+
+
+def _normalise_url(url: str) -> str:
+    url = url.rstrip(_TRAILING_PUNCT)
+    return url if "://" in url else f"https://{url}"
+
+
+def _first_segment(url: str) -> str:
+    parts = [p for p in urlsplit(url).path.split("/") if p]
+    return parts[0] if parts else ""
+
+
+def _leetcode_user(url: str) -> str:
+    parts = [p for p in urlsplit(url).path.split("/") if p]
+    if len(parts) >= 2 and parts[0] == "u":
+        return parts[1]
+    if parts and parts[0].lower() not in _LEETCODE_RESERVED:
+        return parts[0]
+    return ""
+
+
+def _line_at(text: str, pos: int) -> str:
+    start = text.rfind("\n", 0, pos) + 1
+    end = text.find("\n", pos)
+    return text[start:end if end != -1 else len(text)].strip()
+
+
+def _name_candidates(text: str) -> tuple[str, ...]:
+    candidates = []
+    seen = 0
+    for match in _LINE_RE.finditer(text):  # lazily: only the first few lines are read
+        line = match.group().strip()
+        if not line:
+            continue
+        seen += 1
+        if seen > NAME_LINES:
+            break
+        words = line.lower().replace(".", " ").split()
+        if (
+            _NAME_RE.match(line) and not line.islower()
+            and not _NON_NAME_WORDS.intersection(words) and not _TITLE_WORDS.intersection(words)
+        ):
+            candidates.append(line)
+    return tuple(candidates)
+
+
+def _drop_date_years(text: str, start: int, value: str) -> str:
+    """Strip leading years that belong to a date range next to the number (after a month, dash or "to", or before "- 2021")."""
+    while (match := _YEAR_PREFIX.match(value)) is not None:
+        rest = value[match.end():]
+        if not (_DATE_BEFORE.search(text[max(0, start - 12):start]) or ("-" in match.group() and _YEAR_PREFIX.match(rest))):
+            break
+        start += match.end()
+        value = rest
+    return value
+
+
+def extract_entities(text: str, links=()) -> ResumeEntities:
+    """
+    Scan ``text`` once; ``links`` are hyperlink targets found outside the text
+    (PDF link annotations, DOCX relationships) and are classified alongside it.
+    """
+    text = text or ""
+    emails, phones, urls, certifications = [], [], [], []
+    contact_keywords = False
+    for match in _SCANNER.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "email":
+            emails.append(value)
+        elif kind == "url":
+            urls.append(_normalise_url(value))
+        elif kind == "phone":
+            value = _drop_date_years(text, match.start(), value)
+            if 10 <= sum(ch.isdigit() for ch in value) <= 15:
+                phones.append(value.strip())
+        else:
+            word = value.lower()
+            if word.startswith("certif"):
+                line = _line_at(text, match.start())
+                if not certifications or certifications[-1] != line:
+                    certifications.append(line)
+            else:
+                contact_keywords = True
+
+    for link in links or ():
+        if isinstance(link, str) and not link.lower().startswith("mailto:"):
+            urls.append(_normalise_url(link.strip()))
+
+    buckets = {"linkedin": [], "github": [], "leetcode": [], "portfolio": []}
+    for url in dict.fromkeys(urls):  # de-duplicated, first-seen order
+        host = urlsplit(url).hostname or ""
+        if host.endswith("linkedin.com"):
+            buckets["linkedin"].append(url)
+        elif host in ("github.com", "www.github.com"):
+            buckets["github"].append(url)
+        elif host.endswith("leetcode.com"):
+            buckets["leetcode"].append(url)
+        else:
+            buckets["portfolio"].append(url)
+
+    github_username = next(
+        (seg for seg in map(_first_segment, buckets["github"]) if seg and seg.lower() not in _GITHUB_RESERVED), ""
+    )
+    leetcode_username = next(filter(None, map(_leetcode_user, buckets["leetcode"])), "")
+
+    return ResumeEntities(
+        emails=tuple(dict.fromkeys(emails)),
+        phones=tuple(dict.fromkeys(phones)),
+        linkedin_urls=tuple(buckets["linkedin"]),
+        github_urls=tuple(buckets["github"]),
+        leetcode_urls=tuple(buckets["leetcode"]),
+        portfolio_urls=tuple(buckets["portfolio"]),
+        github_username=github_username,
+        leetcode_username=leetcode_username,
+        name_candidates=_name_candidates(text),
+        certifications=tuple(certifications),
+        contact_keywords=contact_keywords,
+    )
@@ -1,7 +1,18 @@
 import requests
 from datetime import datetime, timedelta
 from dateutil.parser import parse as parse_dt
+from django.conf import settings
 
+from .metrics import stage_timer
+from .tiered_cache import memoize
+
+
+def _reached_github(result: dict) -> bool:
+    """API failures are swallowed and score as zero; only cache results that earned something beyond the link."""
+    return result["subtotal"]["earned"] > result["breakdown"]["link_present"]
+
+
+@memoize("profile_score", should_cache=_reached_github)
 def score_github(username: str, token: str | None = None, domain_keywords: list[str] | None = None) -> dict:
     """
     GitHub Scoring (25 pts):
@@ -14,7 +25,7 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
     headers = {"Accept": "application/vnd.github+json", "User-Agent": "resume-scorer"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    base = "https://api.github.com"
+    base = settings.GITHUB_API_BASE
 
     # 1) Link present
     pts_link = 3 if username else 0
@@ -23,7 +34,7 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
     pts_pinned = 0
     pinned_names = []
     if token and username:
-        graphql = "https://api.github.com/graphql"
+        graphql = f"{base}/graphql"
         query = """
         query($login:String!) {
           user(login:$login){
@@ -33,7 +44,8 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
           }
         }"""
         try:
-            r = requests.post(graphql, headers=headers, json={"query": query, "variables": {"login": username}}, timeout=20)
+            with stage_timer("github", call="pinned"):
+                r = requests.post(graphql, headers=headers, json={"query": query, "variables": {"login": username}}, timeout=20)
             if r.ok:
                 nodes = r.json().get("data", {}).get("user", {}).get("pinnedItems", {}).get("nodes", [])
                 pinned_names = [n["name"] for n in nodes if "name" in n]
@@ -48,7 +60,8 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
     pts_recent = 0
     if username:
         try:
-            events = requests.get(f"{base}/users/{username}/events/public", headers=headers, timeout=20)
+            with stage_timer("github", call="events"):
+                events = requests.get(f"{base}/users/{username}/events/public", headers=headers, timeout=20)
             recent_push = 0
             if events.ok:
                 cutoff = datetime.utcnow() - timedelta(days=90)
@@ -68,13 +81,15 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
     repos_resp = None
     if username:
         try:
-            repos_resp = requests.get(f"{base}/users/{username}/repos?per_page=100&sort=updated",
-                                      headers=headers, timeout=20)
+            with stage_timer("github", call="repos"):
+                repos_resp = requests.get(f"{base}/users/{username}/repos?per_page=100&sort=updated",
+                                          headers=headers, timeout=20)
             if repos_resp.ok:
                 repo_list = repos_resp.json()[:10]
                 for repo in repo_list:
                     owner = repo["owner"]["login"]; name = repo["name"]
-                    readme = requests.get(f"{base}/repos/{owner}/{name}/readme", headers=headers, timeout=15)
+                    with stage_timer("github", call="readme"):
+                        readme = requests.get(f"{base}/repos/{owner}/{name}/readme", headers=headers, timeout=15)
                     repos_checked += 1
                     if readme.ok:
                         readme_hits += 1
@@ -94,16 +109,18 @@ def score_github(username: str, token: str | None = None, domain_keywords: list[
     if username:
         try:
             if repos_resp is None or not repos_resp.ok:
-                repos_resp = requests.get(f"{base}/users/{username}/repos?per_page=100&sort=updated",
-                                          headers=headers, timeout=20)
+                with stage_timer("github", call="repos"):
+                    repos_resp = requests.get(f"{base}/users/{username}/repos?per_page=100&sort=updated",
+                                              headers=headers, timeout=20)
             if repos_resp.ok:
                 for repo in repos_resp.json():
                     desc = (repo.get("description") or "").lower()
-                    topics_resp = requests.get(
-                        f"{base}/repos/{repo['owner']['login']}/{repo['name']}/topics",
-                        headers={**headers, "Accept": "application/vnd.github.mercy-preview+json"},
-                        timeout=15
-                    )
+                    with stage_timer("github", call="topics"):
+                        topics_resp = requests.get(
+                            f"{base}/repos/{repo['owner']['login']}/{repo['name']}/topics",
+                            headers={**headers, "Accept": "application/vnd.github.mercy-preview+json"},
+                            timeout=15
+                        )
                     topics = []
                     if topics_resp.ok:
                         topics = [t.lower() for t in topics_resp.json().get("names", [])]
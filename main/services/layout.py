@@ -0,0 +1,198 @@
+"""
+Page layout features for the "Format & Layout" criterion.
+
+Computed from what the PyMuPDF parse already has open: the get_text("dict")
+lines that sections.read_pdf walks for the text, the page's vector drawings
+and its image blocks. Each page is looked at once, with the work capped per
+page, and the result is a LayoutFeatures record for the whole document:
+- columns: text lines fall into side-by-side x-clusters separated by an empty gutter
+- table pages: ruled lines from the drawings cross each other in a grid
+- header/footer: the same text sits in the top or bottom band of most pages
+- image-only pages: an image and no text (a scan ATS parsers read as blank)
+"""
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+MAX_LINES_PER_PAGE = 600
+MAX_SEGMENTS_PER_PAGE = 400
+# size of a page's drawing instructions past which its drawings are not extracted at all:
+# resume pages, tables included, take under 20 KB; a page of vector art can hold a million paths
+MAX_CONTENT_BYTES_PER_PAGE = 256 * 1024
+BINS = 100  # the page width is profiled in this many strips
+MIN_GUTTER = 3  # strips, i.e. 3% of the page width
+MIN_COLUMN_LINES = 3
+SPANNING_LINES = 0.1  # a gutter may be crossed by this share of lines (a full-width name or contact line)
+BAND = 0.08  # top/bottom share of the page height where running headers and footers sit
+LINE_TOLERANCE = 2.0  # points: how straight a ruled line must be and how far apart segments may touch
+MIN_TEXT_CHARS = 20  # fewer characters than this on a page with an image counts as image-only
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class LayoutFeatures:
+    pages: int = 0
+    columns: int = 1  # the most text columns found on any page
+    table_pages: int = 0
+    header_footer: bool = False
+    image_only_pages: int = 0
+
+    @property
+    def is_simple(self) -> bool:
+        """One column, no tables, no running headers/footers and real text on every page."""
+        return self.columns <= 1 and not self.table_pages and not self.header_footer and not self.image_only_pages
+
+
+def _columns(extents: list[tuple[float, float]], width: float) -> int:
+    """
+    Side-by-side columns among the (x0, x1) extents of a page's text lines: the
+    lines are profiled across the page width and every run of strips that almost
+    no line crosses, with enough lines wholly on either side, is a gutter.
+    """
+    if len(extents) < 2 * MIN_COLUMN_LINES or width <= 0:
+        return 1
+    delta = [0] * (BINS + 1)
+    for x0, x1 in extents:
+        delta[max(0, int(x0 / width * BINS))] += 1
+        delta[min(BINS, int(x1 / width * BINS) + 1)] -= 1
+    coverage, running = [], 0
+    for step in delta[:BINS]:
+        running += step
+        coverage.append(running)
+
+    occupied = [i for i, c in enumerate(coverage) if c]
+    if not occupied:
+        return 1
+    threshold = max(1, int(len(extents) * SPANNING_LINES))
+    columns, run_start = 1, None
+    for i in range(occupied[0], occupied[-1] + 2):  # margins outside the text are not gutters
+        if i <= occupied[-1] and coverage[i] <= threshold:
+            run_start = i if run_start is None else run_start
+            continue
+        if run_start is not None and i - run_start >= MIN_GUTTER:
+            left, right = run_start / BINS * width, i / BINS * width
+            on_left = sum(1 for _, x1 in extents if x1 <= left)
+            on_right = sum(1 for x0, _ in extents if x0 >= right)
+            if on_left >= MIN_COLUMN_LINES and on_right >= MIN_COLUMN_LINES:
+                columns += 1
+        run_start = None
+    return columns
+
+
+def _merge(segments: dict[float, list[tuple[float, float]]]) -> list[tuple[float, float, float]]:
+    """Collinear segments that touch or overlap, joined: (position, start, end)."""
+    merged = []
+    for position, spans in segments.items():
+        spans.sort()
+        start, end = spans[0]
+        for s, e in spans[1:]:
+            if s <= end + LINE_TOLERANCE:
+                end = max(end, e)
+            else:
+                merged.append((position, start, end))
+                start, end = s, e
+        merged.append((position, start, end))
+    return merged
+
+
+def _has_grid(drawings) -> bool:
+    """Whether the ruled lines and rectangle edges on a page cross in a table grid."""
+    horizontal, vertical = defaultdict(list), defaultdict(list)
+    count = 0
+    for path in drawings:
+        for item in path["items"]:
+            if item[0] == "l":
+                (px, py), (qx, qy) = item[1], item[2]
+                edges = [(px, py, qx, qy)]
+            elif item[0] == "re":
+                rx0, ry0, rx1, ry1 = item[1]
+                edges = [(rx0, ry0, rx1, ry0), (rx0, ry1, rx1, ry1),
+                         (rx0, ry0, rx0, ry1), (rx1, ry0, rx1, ry1)]
+            else:
+                continue
+            for x0, y0, x1, y1 in edges:
+                if abs(y0 - y1) <= LINE_TOLERANCE and abs(x1 - x0) > LINE_TOLERANCE:
+                    horizontal[round(y0)].append((min(x0, x1), max(x0, x1)))
+                elif abs(x0 - x1) <= LINE_TOLERANCE and abs(y1 - y0) > LINE_TOLERANCE:
+                    vertical[round(x0)].append((min(y0, y1), max(y0, y1)))
+            count += 1
+            if count >= MAX_SEGMENTS_PER_PAGE:
+                break
+        if count >= MAX_SEGMENTS_PER_PAGE:
+            break
+
+    rows, cols = _merge(horizontal), _merge(vertical)
+    if len(rows) < 2 or len(cols) < 2:
+        return False
+    t = LINE_TOLERANCE
+
+    def crossings(line, others):
+        position, start, end = line
+        return sum(1 for p, s, e in others if start - t <= p <= end + t and s - t <= position <= e + t)
+
+    # a grid has a rule that crosses at least three rules the other way
+    return any(crossings(col, rows) >= 3 for col in cols) or any(crossings(row, cols) >= 3 for row in rows)
+
+
+def _content_bytes(page) -> int:
+    """Decompressed size of the page's content streams and the form XObjects it draws (a fraction of parsing them)."""
+    doc = page.parent
+    return len(page.read_contents()) + sum(len(doc.xref_stream(xobject[0]) or b"") for xobject in page.get_xobjects())
+
+
+def _drawings(page) -> list:
+    """The page's vector paths (get_drawings' items as plain tuples); none when the page is too heavy to walk."""
+    if _content_bytes(page) > MAX_CONTENT_BYTES_PER_PAGE:
+        return []
+    return page.get_cdrawings()
+
+
+class LayoutAnalyzer:
+    """Fed one page at a time by read_pdf; result() summarises the document."""
+
+    def __init__(self):
+        self.pages = 0
+        self.columns = 1
+        self.table_pages = 0
+        self.image_only_pages = 0
+        self.bands = Counter()  # normalised header/footer text -> pages it appears on
+
+    def add_page(self, page, page_dict: dict) -> None:
+        self.pages += 1
+        width, height = page.rect.width, page.rect.height
+        extents, bands = [], set()
+        chars, images = 0, 0
+        for block in page_dict["blocks"]:
+            if block.get("type") == 1:
+                images += 1
+                continue
+            for line in block.get("lines", ()):
+                text = "".join(span["text"] for span in line["spans"]).strip()
+                if not text:
+                    continue
+                chars += len(text)
+                x0, y0, x1, y1 = line["bbox"]
+                if len(extents) < MAX_LINES_PER_PAGE:
+                    extents.append((x0, x1))
+                if y1 <= height * BAND or y0 >= height * (1 - BAND):
+                    bands.add(_DIGITS_RE.sub("#", text.lower()))  # "Page 2 of 3" repeats as "page # of #"
+
+        self.columns = max(self.columns, _columns(extents, width))
+        if _has_grid(_drawings(page)):
+            self.table_pages += 1
+        if images and chars < MIN_TEXT_CHARS:
+            self.image_only_pages += 1
+        self.bands.update(bands)
+
+    def result(self) -> LayoutFeatures:
+        repeated = self.pages >= 2 and any(
+            count >= max(2, (self.pages + 1) // 2) for count in self.bands.values()
+        )
+        return LayoutFeatures(
+            pages=self.pages,
+            columns=self.columns,
+            table_pages=self.table_pages,
+            header_footer=repeated,
+            image_only_pages=self.image_only_pages,
+        )
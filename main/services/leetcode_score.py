@@ -1,5 +1,16 @@
 import requests
+from django.conf import settings
 
+from .metrics import stage_timer
+from .tiered_cache import memoize
+
+
+def _reached_leetcode(result: dict) -> bool:
+    """Unknown users and failed calls score only the link; don't pin those in the cache."""
+    return result["subtotal"]["earned"] > result["breakdown"]["link_present"]
+
+
+@memoize("profile_score", should_cache=_reached_leetcode)
 def score_leetcode(username: str) -> dict:
     """
     LeetCode scoring (20 pts):
@@ -11,7 +22,7 @@ def score_leetcode(username: str) -> dict:
     Uses public GraphQL endpoint.
     """
     pts_link = 2 if username else 0
-    LC = "https://leetcode.com/graphql"
+    LC = settings.LEETCODE_GRAPHQL_URL
     headers = {"Content-Type": "application/json"}
 
     solved_total = 0
@@ -41,7 +52,8 @@ def score_leetcode(username: str) -> dict:
         tagProblemCounts { advanced { tagName, problemsSolved } }
       }
     }"""
-    r1 = requests.post(LC, headers=headers, json={"query": q_stats, "variables": {"username": username}}, timeout=20)
+    with stage_timer("leetcode", call="stats"):
+        r1 = requests.post(LC, headers=headers, json={"query": q_stats, "variables": {"username": username}}, timeout=20)
     if r1.ok and r1.json().get("data", {}).get("matchedUser"):
         ac = r1.json()["data"]["matchedUser"]["submitStats"]["acSubmissionNum"]
         for row in ac:
@@ -58,7 +70,8 @@ def score_leetcode(username: str) -> dict:
     query($username: String!) {
       userContestRankingHistory(username: $username) { attended }
     }"""
-    r2 = requests.post(LC, headers=headers, json={"query": q_contest, "variables": {"username": username}}, timeout=20)
+    with stage_timer("leetcode", call="contests"):
+        r2 = requests.post(LC, headers=headers, json={"query": q_contest, "variables": {"username": username}}, timeout=20)
     if r2.ok:
         history = r2.json().get("data", {}).get("userContestRankingHistory", []) or []
         contests_attended = sum(1 for h in history if h and h.get("attended"))
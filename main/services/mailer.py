@@ -0,0 +1,229 @@
+import logging
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: only the in-process lock applies
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+GRAPH_BATCH_LIMIT = 20  # JSON batching accepts at most 20 requests per call
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """One pooled requests.Session per process, so Graph calls reuse TLS connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class GraphSendError(RuntimeError):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ----------------------------
+# Client-credentials token, shared by every worker on the host
+# ----------------------------
+# The token lives in the shared cache ("graph_token" namespace) and fetches are
+# serialised by an flock, so one worker fetches it and the others adopt it. Each process schedules a background refresh at
+# GRAPH_TOKEN_REFRESH_RATIO of the token lifetime, so requests never wait on the
+# token endpoint; whichever worker wakes first refreshes, the rest find it fresh.
+TOKEN_RETRY_SECONDS = 30
+TOKEN_CACHE_KEY = "graph_token:client_credentials"
+
+_graph_token: dict | None = None
+_token_lock = threading.Lock()
+_refresh_timer: threading.Timer | None = None
+
+
+def _lock_path() -> Path:
+    return Path(getattr(settings, "GRAPH_TOKEN_LOCK_PATH", None) or Path(tempfile.gettempdir()) / "graph_token.lock")
+
+
+@contextmanager
+def _shared_lock():
+    """Single-flight across threads (threading lock) and processes (flock on a sidecar file)."""
+    with _token_lock:
+        path = _lock_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a+") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _fetch_token() -> dict:
+    tenant = settings.MS_GRAPH_TENANT_ID
+    token_url = f"{settings.GRAPH_LOGIN_BASE}/{tenant}/oauth2/v2.0/token"
+    data = {
+        "client_id": settings.MS_GRAPH_CLIENT_ID,
+        "client_secret": settings.MS_GRAPH_CLIENT_SECRET,
+        "scope": "https://graph.microsoft.com/.default",
+        "grant_type": "client_credentials",
+    }
+    resp = http_session().post(token_url, data=data, timeout=20)
+    resp.raise_for_status()
+    payload = resp.json()
+    expires_in = int(payload.get("expires_in", 3600))
+    now = time.time()
+    return {
+        "access_token": payload["access_token"],
+        "expires_at": now + expires_in,
+        "refresh_at": now + expires_in * getattr(settings, "GRAPH_TOKEN_REFRESH_RATIO", 0.8),
+    }
+
+
+def _refresh_token(force: bool = False) -> dict:
+    """Adopt the shared token if it is still before its refresh point; otherwise fetch a new one."""
+    global _graph_token
+    with _shared_lock():
+        tok = cache.get(TOKEN_CACHE_KEY)
+        if force or tok is None or tok["refresh_at"] <= time.time():
+            tok = _fetch_token()
+            cache.set(TOKEN_CACHE_KEY, tok, timeout=max(1, int(tok["expires_at"] - time.time())))
+        _graph_token = tok
+    _schedule_refresh(tok["refresh_at"] - time.time())
+    return tok
+
+
+def _background_refresh() -> None:
+    try:
+        _refresh_token()
+    except Exception:
+        logger.exception("Background Graph token refresh failed; retrying in %ss", TOKEN_RETRY_SECONDS)
+        _schedule_refresh(TOKEN_RETRY_SECONDS)
+
+
+def _schedule_refresh(delay: float) -> None:
+    global _refresh_timer
+    if _refresh_timer is not None:
+        _refresh_timer.cancel()
+    # a little jitter so workers forked together don't all wake at the same instant
+    _refresh_timer = threading.Timer(max(1.0, delay) + random.uniform(0, 5), _background_refresh)
+    _refresh_timer.daemon = True
+    _refresh_timer.start()
+
+
+def graph_get_token() -> str:
+    tok = _graph_token
+    if tok is None or tok["expires_at"] <= time.time() + 60:
+        tok = _refresh_token()
+    elif _refresh_timer is None or not _refresh_timer.is_alive():
+        _schedule_refresh(tok["refresh_at"] - time.time())  # timers don't survive a fork
+    return tok["access_token"]
+
+
+def graph_configured() -> bool:
+    """Whether tenant, client ID and secret are all set; without them a token fetch can only fail."""
+    return all((settings.MS_GRAPH_TENANT_ID, settings.MS_GRAPH_CLIENT_ID, settings.MS_GRAPH_CLIENT_SECRET))
+
+
+def prefetch_graph_token() -> None:
+    """Fetch (or adopt) the token in the background (at a web worker's first request) so the first mail doesn't wait."""
+    if graph_configured():
+        _schedule_refresh(0)
+
+
+def _graph_message(to_email: str, subject: str, body_text: str) -> dict:
+    sender = settings.MS_GRAPH_SENDER_EMAIL
+    return {
+        "message": {
+            "subject": subject,
+            "body": {"contentType": "Text", "content": body_text},
+            "toRecipients": [{"emailAddress": {"address": to_email}}],
+            "from": {"emailAddress": {"address": sender}}
+        },
+        "saveToSentItems": "true"
+    }
+
+
+def _retry_after(headers) -> float | None:
+    value = (headers or {}).get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def graph_send_mail(to_email: str, subject: str, body_text: str) -> None:
+    url = f"{settings.GRAPH_API_BASE}/users/{settings.MS_GRAPH_SENDER_EMAIL}/sendMail"
+    headers = {"Authorization": f"Bearer {graph_get_token()}", "Content-Type": "application/json"}
+    r = http_session().post(url, headers=headers, json=_graph_message(to_email, subject, body_text), timeout=20)
+    if r.status_code >= 400:
+        try:
+            err = r.json()
+        except Exception:
+            err = {"error": {"message": r.text}}
+        raise GraphSendError(f"Graph sendMail failed ({r.status_code}): {err}", _retry_after(r.headers))
+
+
+def graph_send_batch(messages: list[tuple[str, str, str, str]]) -> dict[str, GraphSendError | None]:
+    """
+    Send up to GRAPH_BATCH_LIMIT mails in one $batch call.
+    ``messages`` are (id, to_email, subject, body); returns id -> None on success or the error.
+    """
+    if len(messages) == 1:
+        msg_id, to_email, subject, body = messages[0]
+        try:
+            graph_send_mail(to_email, subject, body)
+            return {msg_id: None}
+        except GraphSendError as exc:
+            return {msg_id: exc}
+
+    sender = settings.MS_GRAPH_SENDER_EMAIL
+    requests_ = [
+        {
+            "id": msg_id,
+            "method": "POST",
+            "url": f"/users/{sender}/sendMail",
+            "headers": {"Content-Type": "application/json"},
+            "body": _graph_message(to_email, subject, body),
+        }
+        for msg_id, to_email, subject, body in messages[:GRAPH_BATCH_LIMIT]
+    ]
+    headers = {"Authorization": f"Bearer {graph_get_token()}", "Content-Type": "application/json"}
+    r = http_session().post(f"{settings.GRAPH_API_BASE}/$batch", headers=headers, json={"requests": requests_}, timeout=30)
+    if r.status_code >= 400:
+        error = GraphSendError(f"Graph $batch failed ({r.status_code}): {r.text[:500]}", _retry_after(r.headers))
+        return {req["id"]: error for req in requests_}
+
+    results: dict[str, GraphSendError | None] = {}
+    for item in r.json().get("responses", []):
+        status = int(item.get("status", 500))
+        if status < 400:
+            results[item["id"]] = None
+        else:
+            results[item["id"]] = GraphSendError(
+                f"Graph sendMail failed ({status}): {item.get('body')}", _retry_after(item.get("headers"))
+            )
+    for req in requests_:
+        results.setdefault(req["id"], GraphSendError("Missing response in Graph $batch reply"))
+    return results
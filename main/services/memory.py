@@ -0,0 +1,115 @@
+"""
+Worker memory accounting and guardrails.
+
+With MEMORY_TRACKING on, every request records its resident-memory growth
+(and, with MEMORY_TRACEMALLOC, its peak traced Python allocation) and every
+stage_timer() stage its RSS growth; each worker also reports its RSS as a gauge.
+
+Two ceilings keep a worker away from the OOM killer:
+  * MEMORY_SOFT_LIMIT_MB - heavy views (MEMORY_GUARDED_VIEWS) answer 503 with
+    Retry-After instead of starting work, so the load balancer/client retries on
+    a healthier worker;
+  * MEMORY_RECYCLE_MB - after finishing a request above this, the worker sends
+    itself SIGTERM; gunicorn/uvicorn finish in-flight work and start a fresh one.
+"""
+import gc
+import logging
+import os
+import signal
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+_recycle_requested = False
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc); falls back to the peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024  # bytes on macOS, KiB on Linux
+
+
+def _limit(name: str) -> int:
+    return int(getattr(settings, name, 0) or 0) * MB
+
+
+@contextmanager
+def track_request(request):
+    """Record the RSS growth and (optionally) tracemalloc peak of the request's view."""
+    if not getattr(settings, "MEMORY_TRACKING", False):
+        yield
+        return
+    use_tracemalloc = getattr(settings, "MEMORY_TRACEMALLOC", False)
+    if use_tracemalloc:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()  # process-wide: with threaded workers this is an upper bound
+    rss_before = rss_bytes()
+    try:
+        yield
+    finally:
+        rss_after = rss_bytes()
+        view = metrics.view_name(request)
+        metrics.observe("http_request_rss_growth_bytes", max(0, rss_after - rss_before), view=view)
+        if use_tracemalloc:
+            metrics.observe("http_request_peak_memory_bytes", tracemalloc.get_traced_memory()[1], view=view)
+        metrics.set_gauge("process_resident_memory_bytes", rss_after)
+
+
+def over_soft_limit() -> bool:
+    limit = _limit("MEMORY_SOFT_LIMIT_MB")
+    if not limit or rss_bytes() <= limit:
+        return False
+    gc.collect()  # cheap next to refusing the request; sometimes enough to get back under
+    return rss_bytes() > limit
+
+
+def maybe_recycle() -> None:
+    """Ask the server to replace this worker once it has grown past MEMORY_RECYCLE_MB."""
+    global _recycle_requested
+    limit = _limit("MEMORY_RECYCLE_MB")
+    if _recycle_requested or not limit:
+        return
+    rss = rss_bytes()
+    if rss <= limit:
+        return
+    _recycle_requested = True
+    logger.warning("Worker %s at %.0f MiB RSS (limit %.0f MiB); recycling", os.getpid(), rss / MB, limit / MB)
+    metrics.inc("worker_recycles_total")
+    metrics.flush(force=True)
+    # SIGTERM is a graceful stop for gunicorn and uvicorn workers: the response in
+    # flight is still sent, then the master starts a replacement
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def retry_after_seconds() -> int:
+    return int(getattr(settings, "MEMORY_RETRY_AFTER", 5))
+
+
+def reset_after_fork() -> None:
+    global _recycle_requested
+    _recycle_requested = False
+
+
+os.register_at_fork(after_in_child=reset_after_fork)
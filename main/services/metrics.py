@@ -0,0 +1,349 @@
+"""
+In-process metrics with a Prometheus text exposition that spans all workers.
+
+Every process keeps its own counters, gauges and histograms and periodically
+writes a snapshot to METRICS_DIR/<pid>.json (atomically, from the request
+middleware). /metrics merges every snapshot in the directory, so a gunicorn
+master with N workers reports one set of totals with no external collector.
+Counters and histograms of exited workers keep counting towards the totals:
+a worker folds its snapshot into METRICS_DIR/retired.json at exit, and /metrics
+does the same for the snapshot of any worker that died without running its exit
+hooks, so the directory holds one file per live process plus retired.json.
+Gauges are only reported for live processes.
+"""
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterable
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: only one process writes the directory there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+RETIRED_SNAPSHOT = "retired.json"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MEMORY_BUCKETS = tuple(float(2 ** i * 1024 * 1024) for i in range(13))  # 1 MiB .. 4 GiB
+
+# name -> (type, help[, histogram buckets])
+METRICS = {
+    "stage_duration_seconds": ("histogram", "Time spent in one stage of resume processing."),
+    "stage_rss_growth_bytes": ("histogram", "Resident memory growth during one stage.", MEMORY_BUCKETS),
+    "http_request_duration_seconds": ("histogram", "Request latency by view, method and status."),
+    "http_request_peak_memory_bytes": ("histogram", "Peak traced Python memory per request.", MEMORY_BUCKETS),
+    "http_request_rss_growth_bytes": ("histogram", "Resident memory growth per request.", MEMORY_BUCKETS),
+    "process_resident_memory_bytes": ("gauge", "Resident memory of each worker."),
+    "memory_rejections_total": ("counter", "Requests refused because the worker was over its memory soft limit."),
+    "worker_recycles_total": ("counter", "Workers that asked to be recycled after passing the memory limit."),
+    "ratelimit_requests_total": ("counter", "Requests seen by the rate limiter by endpoint and outcome."),
+    "cache_requests_total": ("counter", "Shared cache lookups by namespace and result."),
+    "cache_evictions_total": ("counter", "Entries evicted from the shared cache by tier."),
+    "chart_cache_requests_total": ("counter", "Rendered chart lookups by result."),
+}
+
+
+def _buckets(name: str) -> tuple:
+    spec = METRICS.get(name, ())
+    return spec[2] if len(spec) > 2 else DEFAULT_BUCKETS
+
+Labels = tuple[tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: dict[tuple[str, Labels], float] = defaultdict(float)
+_gauges: dict[tuple[str, Labels], float] = {}
+_histograms: dict[tuple[str, Labels], list] = {}  # [bucket counts..., +Inf count], sum
+_collectors: list[Callable[[], Iterable[tuple[str, dict, float]]]] = []
+_last_flush = 0.0
+
+
+def _reset_after_fork() -> None:
+    """A forked worker starts from zero; otherwise the parent's samples would be counted twice."""
+    global _lock, _last_flush
+    _lock = threading.Lock()
+    _counters.clear()
+    _gauges.clear()
+    _histograms.clear()
+    _last_flush = 0.0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    with _lock:
+        _counters[(name, _labels(labels))] += value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges[(name, _labels(labels))] = value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        buckets = _buckets(name)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+        hist[0][bisect_left(buckets, value)] += 1
+        hist[1] += value
+
+
+@contextmanager
+def stage_timer(stage: str, **labels):
+    """Time a block into stage_duration_seconds{stage=...}, whether it returns or raises."""
+    track_memory = getattr(settings, "MEMORY_TRACKING", False)
+    if track_memory:
+        from .memory import rss_bytes
+        rss_before = rss_bytes()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("stage_duration_seconds", time.perf_counter() - started, stage=stage, **labels)
+        if track_memory:
+            observe("stage_rss_growth_bytes", max(0, rss_bytes() - rss_before), stage=stage, **labels)
+
+
+def timed(stage: str):
+    """Decorator form of stage_timer."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def view_name(request) -> str:
+    """The resolved URL name, used as the ``view`` label (only set once URL resolution has run)."""
+    match = getattr(request, "resolver_match", None)
+    return match.url_name if match and match.url_name else "unmatched"
+
+
+def register_collector(collector: Callable[[], Iterable[tuple[str, dict, float]]]) -> None:
+    """``collector()`` yields (counter name, labels, cumulative value) for this process at snapshot time."""
+    _collectors.append(collector)
+
+
+# ----------------------------
+# Per-process snapshots
+# ----------------------------
+def _metrics_dir() -> Path:
+    return Path(getattr(settings, "METRICS_DIR", None) or Path(tempfile.gettempdir()) / "metrics")
+
+
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {k: [list(v[0]), v[1]] for k, v in _histograms.items()}
+    for collector in _collectors:
+        try:
+            for name, labels, value in collector():
+                counters[(name, _labels(labels))] = value
+        except Exception:
+            logger.exception("Metrics collector %r failed", collector)
+    return {
+        "pid": os.getpid(),
+        "counters": [[name, labels, value] for (name, labels), value in counters.items()],
+        "gauges": [[name, labels, value] for (name, labels), value in gauges.items()],
+        "histograms": [[name, labels, hist[0], hist[1]] for (name, labels), hist in histograms.items()],
+    }
+
+
+def flush(force: bool = False) -> None:
+    """Write this process's snapshot, at most every METRICS_FLUSH_INTERVAL seconds unless forced."""
+    global _last_flush
+    now = time.monotonic()
+    if not force and now - _last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+        return
+    _last_flush = now
+    directory = _metrics_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(snapshot(), fh)
+        os.replace(tmp, directory / f"{os.getpid()}.json")
+    except OSError:
+        logger.warning("Could not write metrics snapshot to %s", directory, exc_info=True)
+
+
+@contextmanager
+def _directory_lock(directory: Path):
+    """Serialise updates of retired.json across processes (flock on a sidecar file)."""
+    with open(directory / ".retired.lock", "a+") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read_snapshot(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _fold(retired: dict, data: dict) -> None:
+    """Add a snapshot's counters and histograms to the retired totals (gauges die with the process)."""
+    counters = {(name, json.dumps(labels)): value for name, labels, value in retired["counters"]}
+    for name, labels, value in data["counters"]:
+        key = (name, json.dumps(labels))
+        counters[key] = counters.get(key, 0) + value
+    retired["counters"] = [[name, json.loads(labels), value] for (name, labels), value in counters.items()]
+    histograms = {(name, json.dumps(labels)): [buckets, total] for name, labels, buckets, total in retired["histograms"]}
+    for name, labels, buckets, total in data["histograms"]:
+        merged = histograms.setdefault((name, json.dumps(labels)), [[0] * len(buckets), 0.0])
+        merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+        merged[1] += total
+    retired["histograms"] = [[name, json.loads(labels), b, t] for (name, labels), (b, t) in histograms.items()]
+
+
+def retire(own: dict | None = None) -> None:
+    """
+    Fold the snapshots of dead processes - and ``own``, this process's final
+    snapshot, at exit - into retired.json and delete their files.
+    """
+    directory = _metrics_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with _directory_lock(directory):
+            retired_path = directory / RETIRED_SNAPSHOT
+            retired = _read_snapshot(retired_path) or {"counters": [], "histograms": []}
+            folded = []
+            for path in directory.glob("*.json"):
+                if not path.stem.isdigit() or int(path.stem) == os.getpid() or _alive(int(path.stem)):
+                    continue
+                data = _read_snapshot(path)
+                if data is not None:
+                    _fold(retired, data)
+                folded.append(path)
+            if own is not None:
+                _fold(retired, own)
+                folded.append(directory / f"{os.getpid()}.json")
+            if not folded:
+                return
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(retired, fh)
+            os.replace(tmp, retired_path)
+            for path in folded:
+                path.unlink(missing_ok=True)
+    except OSError:
+        logger.warning("Could not retire metrics snapshots in %s", directory, exc_info=True)
+
+
+def _at_exit() -> None:
+    retire(own=snapshot())
+
+
+atexit.register(_at_exit)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ----------------------------
+# Prometheus text format
+# ----------------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels, extra: tuple = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def collect() -> dict:
+    """Merge the snapshots of every process (this one included) in METRICS_DIR."""
+    flush(force=True)
+    retire()
+    counters: dict = defaultdict(float)
+    gauges: dict = {}
+    histograms: dict = {}
+    for path in _metrics_dir().glob("*.json"):
+        data = _read_snapshot(path)
+        if data is None:
+            continue
+        for name, labels, value in data["counters"]:
+            counters[(name, tuple(map(tuple, labels)))] += value
+        if "pid" in data and _alive(data["pid"]):
+            for name, labels, value in data["gauges"]:
+                gauges[(name, tuple(map(tuple, labels)) + (("pid", str(data["pid"])),))] = value
+        for name, labels, buckets, total in data["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0.0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+    return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def render_prometheus() -> str:
+    merged = collect()
+    lines: list[str] = []
+    seen: set[str] = set()
+
+    def header(name: str, default_type: str) -> None:
+        if name in seen:
+            return
+        seen.add(name)
+        kind, help_text = METRICS.get(name, (default_type, name.replace("_", " ")))[:2]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(merged["counters"].items()):
+        header(name, "counter")
+        lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+    for (name, labels), value in sorted(merged["gauges"].items()):
+        header(name, "gauge")
+        lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+    for (name, labels), (buckets, total) in sorted(merged["histograms"].items()):
+        header(name, "histogram")
+        cumulative = 0
+        for bound, count in zip((*_buckets(name), "+Inf"), buckets):
+            cumulative += count
+            le = bound if bound == "+Inf" else _fmt_value(bound)
+            lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total!r}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
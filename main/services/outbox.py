@@ -0,0 +1,212 @@
+"""
+Email outbox: requests enqueue a row and return immediately; a sender drains it.
+
+The sender runs either as a daemon thread inside each web worker
+(OUTBOX_SENDER = "thread", the default) or as a separate process via
+``python manage.py run_outbox`` (OUTBOX_SENDER = "command"). Rows are claimed
+with a conditional UPDATE, so any number of senders can run side by side.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import EmailOutbox
+from .mailer import GRAPH_BATCH_LIMIT, graph_send_batch
+
+logger = logging.getLogger(__name__)
+
+STALE_CLAIM = timedelta(minutes=5)  # a sender that died mid-send releases its rows after this
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_email(to_email: str, subject: str, body: str, expires_in: int | None = None) -> EmailOutbox:
+    """Queue a mail; mails that can't go out before ``expires_in`` seconds are dropped (stale OTPs)."""
+    now = timezone.now()
+    row = EmailOutbox.objects.create(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        next_attempt_at=now,
+        expires_at=now + timedelta(seconds=expires_in) if expires_in else None,
+    )
+    kick_sender()
+    return row
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = _setting("OUTBOX_BACKOFF_SECONDS", 2)
+    return timedelta(seconds=min(_setting("OUTBOX_MAX_BACKOFF_SECONDS", 300), base * 2 ** max(0, attempts - 1)))
+
+
+def _claim(limit: int) -> list[EmailOutbox]:
+    now = timezone.now()
+    EmailOutbox.objects.filter(
+        status=EmailOutbox.PENDING, expires_at__isnull=False, expires_at__lte=now,
+    ).update(status=EmailOutbox.FAILED, body="", last_error="expired before it could be sent")
+
+    ready = Q(status=EmailOutbox.PENDING, next_attempt_at__lte=now) | Q(
+        status=EmailOutbox.SENDING, claimed_at__lte=now - STALE_CLAIM
+    )
+    claimed = []
+    for row in EmailOutbox.objects.filter(ready).order_by("next_attempt_at", "id")[:limit]:
+        won = EmailOutbox.objects.filter(pk=row.pk, status=row.status, claimed_at=row.claimed_at).update(
+            status=EmailOutbox.SENDING, claimed_at=now, attempts=F("attempts") + 1,
+        )
+        if won:
+            row.attempts += 1
+            claimed.append(row)
+    return claimed
+
+
+def _mark_sent(row: EmailOutbox) -> None:
+    EmailOutbox.objects.filter(pk=row.pk).update(
+        status=EmailOutbox.SENT, sent_at=timezone.now(), body="", last_error="",
+    )
+
+
+def _mark_failed(row: EmailOutbox, error: Exception, retry_after: float | None = None) -> None:
+    if row.attempts >= _setting("OUTBOX_MAX_ATTEMPTS", 5):
+        EmailOutbox.objects.filter(pk=row.pk).update(status=EmailOutbox.FAILED, body="", last_error=str(error)[:2000])
+        logger.error("Giving up on outbox mail %s to %s: %s", row.pk, row.to_email, error)
+        return
+    delay = max(_backoff(row.attempts), timedelta(seconds=retry_after or 0))
+    EmailOutbox.objects.filter(pk=row.pk).update(
+        status=EmailOutbox.PENDING, next_attempt_at=timezone.now() + delay, last_error=str(error)[:2000],
+    )
+
+
+# ----------------------------
+# Transports
+# ----------------------------
+_smtp_connection = None
+
+
+def _send_graph(rows: list[EmailOutbox]) -> None:
+    for start in range(0, len(rows), GRAPH_BATCH_LIMIT):
+        chunk = {str(row.pk): row for row in rows[start:start + GRAPH_BATCH_LIMIT]}
+        try:
+            results = graph_send_batch([(key, r.to_email, r.subject, r.body) for key, r in chunk.items()])
+        except Exception as exc:  # token fetch / network failure: retry the whole chunk
+            results = {key: exc for key in chunk}
+        for key, error in results.items():
+            if error is None:
+                _mark_sent(chunk[key])
+            else:
+                _mark_failed(chunk[key], error, getattr(error, "retry_after", None))
+
+
+def _send_smtp(rows: list[EmailOutbox]) -> None:
+    global _smtp_connection
+    from django.core.mail import EmailMessage, get_connection
+
+    if _smtp_connection is not None and not _smtp_alive(_smtp_connection):
+        close_smtp()  # the server dropped the kept-open session
+    if _smtp_connection is None:
+        _smtp_connection = get_connection(fail_silently=False)
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None) or getattr(settings, "EMAIL_HOST_USER", None)
+    try:
+        _smtp_connection.open()  # no-op while the connection is still open
+    except Exception as exc:
+        _smtp_connection = None
+        for row in rows:
+            _mark_failed(row, exc)
+        return
+    for row in rows:
+        message = EmailMessage(row.subject, row.body, from_email, [row.to_email], connection=_smtp_connection)
+        try:
+            message.send()
+        except Exception as exc:
+            _mark_failed(row, exc)
+            close_smtp()
+        else:
+            _mark_sent(row)
+
+
+def _smtp_alive(connection) -> bool:
+    smtp = getattr(connection, "connection", None)
+    if smtp is None:
+        return True  # not opened yet
+    try:
+        return smtp.noop()[0] == 250
+    except Exception:
+        return False
+
+
+def close_smtp() -> None:
+    global _smtp_connection
+    if _smtp_connection is not None:
+        try:
+            _smtp_connection.close()
+        except Exception:
+            pass
+        _smtp_connection = None
+
+
+def drain_once(limit: int | None = None) -> int:
+    """Send everything that is due (up to ``limit`` rows); returns how many rows were attempted."""
+    rows = _claim(limit or _setting("OUTBOX_BATCH_SIZE", 50))
+    if not rows:
+        return 0
+    if getattr(settings, "MS_GRAPH_ENABLED", False):
+        _send_graph(rows)
+    else:
+        _send_smtp(rows)
+    return len(rows)
+
+
+# ----------------------------
+# Sender loop
+# ----------------------------
+_wakeup = threading.Event()
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+
+
+def run_sender(stop: threading.Event | None = None, idle_timeout: float | None = None) -> None:
+    """
+    Drain the outbox until ``stop`` is set; sleeps until kicked (or polls every
+    idle_timeout seconds). The SMTP session is kept open across bursts and only
+    closed after OUTBOX_SMTP_IDLE_SECONDS without mail.
+    """
+    poll = idle_timeout or _setting("OUTBOX_POLL_SECONDS", 5)
+    stop = stop or threading.Event()
+    idle_since = None
+    while not stop.is_set():
+        # cleared before draining, so a kick that lands mid-drain makes the next wait return at once
+        _wakeup.clear()
+        try:
+            close_old_connections()
+            sent = drain_once()
+        except Exception:
+            logger.exception("Outbox sender iteration failed")
+            sent = 0
+        if sent:
+            idle_since = None
+            continue
+        now = time.monotonic()
+        idle_since = idle_since or now
+        if now - idle_since >= _setting("OUTBOX_SMTP_IDLE_SECONDS", 60):
+            close_smtp()
+        _wakeup.wait(poll)
+    close_smtp()
+
+
+def kick_sender() -> None:
+    """Wake the in-process sender (starting it on first use) when OUTBOX_SENDER is "thread"."""
+    global _thread
+    if _setting("OUTBOX_SENDER", "thread") != "thread":
+        return
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=run_sender, name="outbox-sender", daemon=True)
+            _thread.start()
+    _wakeup.set()
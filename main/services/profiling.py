@@ -0,0 +1,135 @@
+"""
+On-demand profiling of individual requests.
+
+A request is profiled when it is sampled (PROFILE_SAMPLE_RATE) or carries an
+``X-Profile`` header holding a token from profile_token() (signed with
+SECRET_KEY and valid for PROFILE_TOKEN_MAX_AGE seconds). PROFILE_MODE picks the
+profiler: "cprofile" writes a .prof file for pstats/snakeviz; "sample" runs a
+stack sampler thread next to the view and writes collapsed stacks (one
+"frame;frame;frame count" line per stack) for flamegraph.pl or speedscope.
+Files go to PROFILE_DIR, which keeps only the newest PROFILE_MAX_FILES.
+"""
+import cProfile
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+TOKEN_SALT = "main.profiling"
+PROFILE_SUFFIXES = (".prof", ".collapsed")
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.(prof|collapsed)$")
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILE_DIR", "var/profiles"))
+
+
+def profile_token() -> str:
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("profile")
+
+
+def should_profile(request) -> bool:
+    token = request.headers.get(PROFILE_HEADER)
+    if token:
+        try:
+            signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+                token, max_age=getattr(settings, "PROFILE_TOKEN_MAX_AGE", 3600)
+            )
+            return True
+        except signing.BadSignature:
+            pass
+    rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _rotate(directory: Path) -> None:
+    keep = getattr(settings, "PROFILE_MAX_FILES", 200)
+    files = sorted(list_profiles(directory), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[keep:]:
+        old.unlink(missing_ok=True)
+
+
+def list_profiles(directory: Path | None = None) -> list[Path]:
+    directory = directory or profile_dir()
+    if not directory.is_dir():
+        return []
+    return [p for p in directory.iterdir() if p.suffix in PROFILE_SUFFIXES]
+
+
+def run_profiled(label: str, func, *args, **kwargs):
+    """Call ``func`` under the configured profiler and save the result to PROFILE_DIR."""
+    mode = getattr(settings, "PROFILE_MODE", "cprofile")
+    started = time.perf_counter()
+    if mode == "sample":
+        with StackSampler(threading.get_ident(), getattr(settings, "PROFILE_SAMPLE_INTERVAL", 0.005)) as sampler:
+            result = func(*args, **kwargs)
+        write = lambda path: path.write_text(sampler.collapsed())  # noqa: E731
+        suffix = ".collapsed"
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active on this thread
+            return func(*args, **kwargs)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        write = lambda path: profiler.dump_stats(path)  # noqa: E731
+        suffix = ".prof"
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    directory = profile_dir()
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{elapsed_ms:.0f}ms-{os.getpid()}-{secrets.token_hex(3)}{suffix}"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        write(directory / name)
+        _rotate(directory)
+    except OSError:
+        logger.warning("Could not write profile %s", name, exc_info=True)
+    return result
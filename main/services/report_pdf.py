@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from .chart_cache import report_chart_bytes
+from .disk_cache import maybe_prune, touch
+from .metrics import stage_timer
+
+logger = logging.getLogger(__name__)
+
+
+class ReportRenderError(Exception):
+    """xhtml2pdf reported errors; ``html`` is the markup it was given."""
+
+    def __init__(self, html: str):
+        super().__init__("PDF rendering failed")
+        self.html = html
+
+
+def report_template_for(context: dict) -> str:
+    """The report page a result was shown with: its ``kind`` is the one it was saved under."""
+    if context and context.get("kind") == "non_technical":
+        return "score_of_non_tech.html"
+    return "resume_result.html"
+
+
+@lru_cache(maxsize=None)
+def template_version(template_path: str) -> str:
+    """Short hash of the template source, backend and REPORT_PDF_VERSION; changes whenever the report layout does."""
+    source = getattr(get_template(template_path).template, "source", "")
+    payload = f"{getattr(settings, 'REPORT_PDF_VERSION', '1')}:{report_backend()}:{template_path}:{source}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def pdf_context(context: dict) -> dict:
+    """PDF rendering can't fetch URLs, so embed the chart as a data URI instead of linking it."""
+    result_key = context.get("result_key")
+    if not context.get("chart_url") or not result_key:
+        return context
+    svg = report_chart_bytes(result_key, "svg")
+    context = {**context, "chart_url": None}
+    if svg:
+        context["pie_chart_image"] = base64.b64encode(svg).decode("ascii")
+    return context
+
+
+def report_backend() -> str:
+    return getattr(settings, "REPORT_PDF_BACKEND", "xhtml2pdf")
+
+
+def render_report_pdf(context: dict, backend: str | None = None) -> bytes:
+    backend = backend or report_backend()
+    with stage_timer("pdf_render", backend=backend):
+        return _render(context, backend, report_template_for(context))
+
+
+def _render(context: dict, backend: str, template_path: str) -> bytes:
+    if backend == "reportlab":
+        from .report_reportlab import render_report_pdf_reportlab
+        return render_report_pdf_reportlab(context, template_path)
+
+    from xhtml2pdf import pisa
+
+    html = get_template(template_path).render(pdf_context(context))
+    out = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html, dest=out)
+    if pisa_status.err:
+        raise ReportRenderError(html)
+    return out.getvalue()
+
+
+# ----------------------------
+# On-disk cache keyed by result_key + template version + context digest
+# ----------------------------
+_render_locks: dict[str, threading.Lock] = {}
+_render_locks_guard = threading.Lock()
+
+
+def context_digest(context: dict) -> str:
+    """Short hash of everything the report shows: a result key is re-scored in place with fresh profile data."""
+    payload = json.dumps(context, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def cached_pdf_path(context: dict) -> Path | None:
+    result_key = context.get("result_key")
+    directory = getattr(settings, "PDF_CACHE_DIR", None)
+    if not result_key or not directory:
+        return None
+    version = template_version(report_template_for(context))
+    return Path(directory) / result_key[:2] / f"{result_key}-{version}-{context_digest(context)}.pdf"
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    with _render_locks_guard:
+        return _render_locks.setdefault(str(path), threading.Lock())
+
+
+def get_or_render_pdf(context: dict) -> Path | bytes:
+    """
+    Path of the cached PDF for this report, rendering it first if needed.
+    Reports without a result_key can't be cached and come back as bytes.
+    """
+    path = cached_pdf_path(context)
+    if path is None:
+        return render_report_pdf(context)
+    if path.exists():
+        touch(path)
+        return path
+    # one render per report per process, whether triggered by a click or the prerender pool
+    with _lock_for(path):
+        if not path.exists():
+            data = render_report_pdf(context)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".pdf")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+    with _render_locks_guard:
+        _render_locks.pop(str(path), None)
+    maybe_prune(settings.PDF_CACHE_DIR, getattr(settings, "PDF_CACHE_MAX_MB", 0) * 1024 * 1024)
+    return path
+
+
+# ----------------------------
+# Background pre-rendering
+# ----------------------------
+_executor: ThreadPoolExecutor | None = None
+_executor_guard = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_guard:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PDF_PRERENDER_WORKERS", 1),
+                thread_name_prefix="pdf-prerender",
+            )
+        return _executor
+
+
+def _prerender(context: dict) -> None:
+    try:
+        get_or_render_pdf(context)
+    except Exception:
+        logger.exception("Background PDF render failed for %s", context.get("result_key"))
+
+
+def prerender_report_pdf(context: dict) -> None:
+    """Queue the report PDF so the first download is already cached."""
+    if not getattr(settings, "PDF_PRERENDER", True) or cached_pdf_path(context) is None:
+        return
+    _get_executor().submit(_prerender, dict(context))
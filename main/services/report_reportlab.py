@@ -0,0 +1,169 @@
+"""
+Direct-draw report PDFs with reportlab platypus.
+
+Builds the same content as resume_result.html / score_of_non_tech.html straight
+from the report context, skipping xhtml2pdf's HTML and CSS parsing. Selected with
+REPORT_PDF_BACKEND = "reportlab".
+"""
+import io
+from xml.sax.saxutils import escape
+
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import KeepTogether, ListFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .chart_cache import report_chart_spec
+from .charts import DEFAULT_COLORS
+
+GRADE_COLORS = {"Excellent": "#4CAF50", "Good": "#2196F3", "Average": "#FF9800"}
+DETECTION_COLORS = {"YES": "#4CAF50"}
+
+_styles = getSampleStyleSheet()
+TITLE = _styles["Title"]
+H2 = _styles["Heading2"]
+H3 = _styles["Heading3"]
+BODY = _styles["BodyText"]
+
+TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#121212")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#cccccc")),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+])
+
+
+def _p(text, style=BODY) -> Paragraph:
+    return Paragraph(escape(str(text)), style)
+
+
+def _detection(label: str, value: str) -> str:
+    color = DETECTION_COLORS.get(value, "#FF5722")
+    return f'{escape(label)}: <font color="{color}">{escape(str(value))}</font>'
+
+
+def _score_display(value, non_tech: bool) -> str:
+    if non_tech and not value:
+        return "-"
+    return str(value if value is not None else "-")
+
+
+def _pie(context: dict, sections: dict) -> Drawing | None:
+    spec = report_chart_spec(context["result_key"]) if context.get("result_key") else None
+    if spec:
+        labels, sizes = spec["labels"], spec["sizes"]
+    else:
+        labels = [name for name, data in sections.items() if isinstance(data.get("score"), (int, float))]
+        sizes = [float(sections[name]["score"]) for name in labels]
+    if not sizes or sum(sizes) <= 0:
+        return None
+
+    drawing = Drawing(170 * mm, 80 * mm)
+    pie = Pie()
+    pie.x, pie.y = 5 * mm, 5 * mm
+    pie.width = pie.height = 70 * mm
+    pie.data = sizes
+    pie.labels = None
+    pie.startAngle = 0
+    pie.direction = "anticlockwise"
+    pie.slices.strokeWidth = 0
+    for i in range(len(sizes)):
+        pie.slices[i].fillColor = colors.HexColor(DEFAULT_COLORS[i % len(DEFAULT_COLORS)])
+    drawing.add(pie)
+
+    legend = Legend()
+    legend.x, legend.y = 85 * mm, 70 * mm
+    legend.alignment = "right"
+    legend.fontName = "Helvetica"
+    legend.fontSize = 8
+    legend.columnMaximum = 12
+    legend.colorNamePairs = [
+        (colors.HexColor(DEFAULT_COLORS[i % len(DEFAULT_COLORS)]), str(label)) for i, label in enumerate(labels)
+    ]
+    drawing.add(legend)
+    return drawing
+
+
+def build_story(context: dict, template_path: str) -> list:
+    non_tech = template_path == "score_of_non_tech.html"
+    sections = context.get("score_breakdown") or {}
+    story = [
+        _p("ATS Screening Report", TITLE),
+        Paragraph(
+            f"Applicant Name: {escape(str(context.get('applicant_name', '')))}<br/>"
+            + _detection("Contact Detection", context.get("contact_detection", "NO")) + "<br/>"
+            + _detection("LinkedIn Id Detection", context.get("linkedin_detection", "NO")) + "<br/>"
+            + _detection("GitHub Detection", context.get("github_detection", "NO")),
+            BODY,
+        ),
+        Spacer(1, 4 * mm),
+        Table(
+            [["ATS Score", "Overall Score"], [str(context.get("ats_score", 0)), str(context.get("overall_score_average", 0))]],
+            colWidths=[60 * mm, 60 * mm],
+            style=TABLE_STYLE,
+        ),
+        _p("Section-Level Performance", H2),
+    ]
+
+    rows = [["Section", "Score", "Grade", "Weight"]]
+    for name, data in sections.items():
+        score = _score_display(data.get("score"), non_tech)
+        weight = data.get("weight", "")
+        rows.append([
+            _p(name),
+            score if non_tech else f"{score}/100",
+            data.get("grade", ""),
+            f"{weight}" if non_tech else f"{weight}%",
+        ])
+    story.append(Table(rows, colWidths=[80 * mm, 30 * mm, 30 * mm, 30 * mm], style=TABLE_STYLE, repeatRows=1))
+
+    pie = _pie(context, sections)
+    if pie is not None:
+        story += [_p("Pie Chart of Overall Representation", H3), pie]
+
+    ordered = sections.items() if non_tech else (context.get("score_breakdown_ordered") or sections.items())
+    for name, data in ordered:
+        grade_color = GRADE_COLORS.get(data.get("grade"), "#dc3545")
+        block = [Paragraph(
+            f'{escape(str(name))} <font color="{grade_color}">({escape(_score_display(data.get("score"), non_tech))})</font>',
+            H3,
+        )]
+        sub_criteria = data.get("sub_criteria") or []
+        if sub_criteria:
+            sub_rows = [["Criterion", "Score", "Insight"]]
+            for criterion in sub_criteria:
+                score = _score_display(criterion.get("score"), non_tech)
+                if criterion.get("weight"):
+                    score = f"{score}/{criterion['weight']}"
+                sub_rows.append([_p(criterion.get("name", "")), score, _p(criterion.get("insight", ""))])
+            block.append(Table(sub_rows, colWidths=[50 * mm, 25 * mm, 95 * mm], style=TABLE_STYLE, repeatRows=1))
+        story.append(KeepTogether(block))
+
+    certs = context.get("missing_certifications") or []
+    if certs:
+        story += [
+            _p(f"Recommended Certifications for {context.get('role') or 'Your Role'}", H2),
+            ListFlowable([_p(cert) for cert in certs], bulletType="bullet"),
+        ]
+    suggestions = context.get("suggestions") or []
+    if non_tech:
+        suggestions = suggestions[:2]
+    if suggestions:
+        story += [_p("Suggestions", H2), ListFlowable([_p(s) for s in suggestions], bulletType="bullet")]
+    return story
+
+
+def render_report_pdf_reportlab(context: dict, template_path: str) -> bytes:
+    out = io.BytesIO()
+    doc = SimpleDocTemplate(
+        out, pagesize=A4, title="Resume Report",
+        leftMargin=15 * mm, rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=15 * mm,
+    )
+    doc.build(build_story(context, template_path))
+    return out.getvalue()
@@ -0,0 +1,99 @@
+import json
+import logging
+import threading
+import time
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL = 60 * 60  # seconds between opportunistic purges, per process
+
+_last_purge = float("-inf")
+_purge_lock = threading.Lock()
+
+
+def scoring_version() -> str:
+    return str(getattr(settings, "SCORING_VERSION", "1"))
+
+
+def _encode(context: dict) -> bytes:
+    return zlib.compress(json.dumps(context, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+
+def _decode(payload) -> dict:
+    return json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+
+
+def save_result(result_key: str, kind: str, context: dict, upload_key: str = "") -> None:
+    """Store a report context (compressed JSON) under its result_key, replacing any older copy."""
+    AnalysisResult.objects.update_or_create(
+        result_key=result_key,
+        defaults={
+            "kind": kind,
+            "upload_key": upload_key,
+            "scoring_version": scoring_version(),
+            "payload": _encode(context),
+        },
+    )
+    _maybe_purge()
+
+
+def load_result(result_key: str | None) -> dict | None:
+    if not result_key:
+        return None
+    payload = AnalysisResult.objects.filter(result_key=result_key).values_list("payload", flat=True).first()
+    return _decode(payload) if payload is not None else None
+
+
+def find_fresh_result(upload_key: str) -> tuple[str, dict] | None:
+    """(result_key, context) of a non-expired analysis of the same upload under the current scoring version."""
+    ttl = getattr(settings, "ANALYSIS_RESULT_TTL", 24 * 60 * 60)
+    if not upload_key or ttl <= 0:
+        return None
+    row = (
+        AnalysisResult.objects
+        .filter(
+            upload_key=upload_key,
+            scoring_version=scoring_version(),
+            updated_at__gte=timezone.now() - timedelta(seconds=ttl),
+        )
+        .order_by("-updated_at")
+        .values_list("result_key", "payload")
+        .first()
+    )
+    if row is None:
+        return None
+    return row[0], _decode(row[1])
+
+
+def purge_expired_results() -> int:
+    """Delete results not saved for ANALYSIS_RESULT_RETENTION seconds; returns how many were removed."""
+    retention = getattr(settings, "ANALYSIS_RESULT_RETENTION", 14 * 24 * 60 * 60)
+    if retention <= 0:
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = AnalysisResult.objects.filter(updated_at__lt=cutoff).delete()
+    return deleted
+
+
+def _maybe_purge() -> None:
+    """Run purge_expired_results() from save_result at most once per PURGE_INTERVAL, so no cron job is required."""
+    global _last_purge
+    now = time.monotonic()
+    with _purge_lock:
+        if now - _last_purge < PURGE_INTERVAL:
+            return
+        _last_purge = now
+    try:
+        deleted = purge_expired_results()
+    except Exception:
+        logger.exception("Purging expired analysis results failed")
+        return
+    if deleted:
+        logger.info("Purged %d expired analysis results", deleted)
@@ -0,0 +1,177 @@
+"""
+Resume section segmentation.
+
+Headings are found once per resume, from two signals: the line text (a known
+heading such as "Work Experience" or "Core Competencies", on its own line or
+as an inline "Skills:" label) and, for PDFs, the font of the line in the same
+PyMuPDF parse that produced the text (bold, or larger than the body font).
+The result is a SectionIndex mapping each canonical section to the (start,
+end) offsets of its body, so a scorer reads only the section it cares about.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "career summary"),
+    "experience": ("work experience", "experience", "professional experience", "employment history",
+                   "work history", "employment", "career history", "relevant experience", "internships"),
+    "education": ("education", "academic background", "academic qualifications", "qualifications",
+                  "education and training", "academics"),
+    "skills": ("skills", "core competencies", "key skills", "technical skills", "competencies",
+               "areas of expertise", "skills and abilities", "core skills", "expertise"),
+    "projects": ("projects", "personal projects", "key projects", "academic projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications", "licenses",
+                       "certifications and training", "training"),
+    "awards": ("awards", "honors", "honours", "achievements", "awards and honors", "accomplishments"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+    "volunteering": ("volunteering", "volunteer experience", "volunteer work", "community involvement"),
+    "references": ("references",),
+    "contact": ("contact", "contact information", "contact details", "personal details"),
+}
+_ALIASES = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+# "Experience & Internships", "EDUCATION / COURSES": a styled or all-caps heading is matched by its
+# first word naming a section ("training" is too often a job title to count on its own)
+_KEYWORDS = {alias: name for alias, name in _ALIASES.items() if " " not in alias and alias != "training"}
+
+_LINE_RE = re.compile(r"[^\n]+")
+_INLINE_RE = re.compile(r"\s*([A-Za-z][A-Za-z &/]{1,40}?)\s*:")
+_PUNCT_RE = re.compile(r"[^\w&/ ]+")
+_SPACES_RE = re.compile(r"\s+")
+HEADING_MAX_WORDS = 5
+STYLE_SIZE_RATIO = 1.15  # a line this much larger than the body font reads as a heading
+BOLD_FLAG = 16  # PyMuPDF span flag
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+
+
+def _date(p: str) -> str:
+    return (
+        rf"(?:(?P<{p}month>{_MONTH})\s+)?(?P<{p}year>(?:19|20)\d{{2}})"
+        rf"|(?P<{p}num>0?[1-9]|1[0-2])/(?P<{p}nyear>(?:19|20)\d{{2}})"
+    )
+
+
+_DATE_RANGE_RE = re.compile(
+    rf"(?:{_date('s')})\s*(?:-|–|—|to|until)\s*(?:{_date('e')}|present|current|now|today)",
+    re.IGNORECASE,
+)
+_MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+
+@dataclass(frozen=True)
+class SectionIndex:
+    text: str
+    spans: dict[str, tuple[int, int]] = field(default_factory=dict)  # section -> body (start, end)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+
+    def has(self, *names: str) -> bool:
+        return all(name in self.spans for name in names)
+
+    def get(self, name: str) -> str:
+        """The body of a section, or "" when the resume has none."""
+        if name not in self.spans:
+            return ""
+        start, end = self.spans[name]
+        return self.text[start:end]
+
+
+def _normalise(line: str) -> str:
+    line = _PUNCT_RE.sub(" ", line.replace("’", "'")).lower()
+    return _SPACES_RE.sub(" ", line).strip()
+
+
+def _heading_name(line: str, styled: bool) -> str | None:
+    """The canonical section a heading line names, if it is one."""
+    title = _normalise(line)
+    words = title.split()
+    if not words or len(words) > HEADING_MAX_WORDS:
+        return None
+    if title in _ALIASES:
+        return _ALIASES[title]
+    if (styled or line.isupper()) and words[0] in _KEYWORDS:
+        return _KEYWORDS[words[0]]
+    return None
+
+
+def segment(text: str, styled_lines=frozenset()) -> SectionIndex:
+    """
+    Index the sections of ``text``. ``styled_lines`` holds the stripped lines the
+    parser saw set in a heading font (see read_pdf); DOCX and plain text rely on
+    the line patterns alone.
+    """
+    headings = []  # (name, heading start, body start)
+    for match in _LINE_RE.finditer(text):
+        line = match.group().strip()
+        if not line:
+            continue
+        name = _heading_name(line, line in styled_lines)
+        body_start = match.end()
+        if name is None:
+            inline = _INLINE_RE.match(match.group())
+            if not inline or _normalise(inline.group(1)) not in _ALIASES:
+                continue
+            name = _ALIASES[_normalise(inline.group(1))]
+            body_start = match.start() + inline.end()
+        headings.append((name, match.start(), body_start))
+
+    spans = {}
+    for i, (name, _, body_start) in enumerate(headings):
+        end = headings[i + 1][1] if i + 1 < len(headings) else len(text)
+        spans.setdefault(name, (body_start, end))  # a repeated heading keeps the first section
+    return SectionIndex(text, spans)
+
+
+def read_pdf(doc, layout=None) -> tuple[str, frozenset[str]]:
+    """
+    Text of an open PyMuPDF document plus the lines set in a heading font, from
+    one get_text("dict") pass per page. The text is laid out like get_text():
+    one line per text line. A layout.LayoutAnalyzer passed as ``layout`` is fed
+    each page's dict from the same pass.
+    """
+    lines = []  # (text, max size, all bold)
+    sizes = Counter()
+    for page in doc:
+        page_dict = page.get_text("dict")
+        if layout is not None:
+            layout.add_page(page, page_dict)
+        for block in page_dict["blocks"]:
+            for line in block.get("lines", ()):
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                lines.append((
+                    "".join(span["text"] for span in line["spans"]),
+                    max((span["size"] for span in spans), default=0.0),
+                    bool(spans) and all(span["flags"] & BOLD_FLAG or "bold" in span["font"].lower() for span in spans),
+                ))
+                for span in spans:
+                    sizes[round(span["size"], 1)] += len(span["text"])
+
+    body_size = sizes.most_common(1)[0][0] if sizes else 0.0
+    styled = frozenset(
+        text.strip() for text, size, bold in lines
+        if text.strip() and (bold or (body_size and size >= body_size * STYLE_SIZE_RATIO))
+    )
+    return "".join(text + "\n" for text, _, _ in lines), styled
+
+
+def _date_key(match, prefix: str) -> tuple[int, int]:
+    if match.group(f"{prefix}year"):
+        month = match.group(f"{prefix}month")
+        return int(match.group(f"{prefix}year")), _MONTHS.get(month[:3].lower(), 0) if month else 0
+    return int(match.group(f"{prefix}nyear")), int(match.group(f"{prefix}num"))
+
+
+def is_reverse_chronological(text: str) -> bool | None:
+    """
+    Whether the date ranges in ``text`` (an experience or education section) run
+    newest first, by start date; None when there are fewer than two to compare.
+    """
+    starts = [_date_key(match, "s") for match in _DATE_RANGE_RE.finditer(text)]
+    if len(starts) < 2:
+        return None
+    # a year without a month ("2019 - 2021") only compares by year
+    return all(a >= b if a[1] and b[1] else a[0] >= b[0] for a, b in zip(starts, starts[1:]))
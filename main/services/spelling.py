@@ -0,0 +1,214 @@
+"""
+Spelling index for the "Proofreading & Consistency" criterion.
+
+The word lists (a 40k-word English frequency list and the hand-kept base
+vocabulary and domain terms in main/data/spelling, the latter two with their
+regular inflections, plus any files in SPELLING_EXTRA_WORDLISTS) are held in one sorted, newline-separated bytes blob
+with an array of offsets for exact binary search, fronted by a Bloom filter.
+Most lookups that miss - every edit-distance-1 candidate tried while looking
+for a suggestion - stop at the filter. Three flat buffers keep a large system
+dictionary at a few MB, and they are built once per process (in the master,
+before fork, when PRELOAD_WARMUP is on) and shared copy-on-write.
+
+A word counts as a typo only when it is unknown *and* one edit away from a
+known word, so names and jargon missing from the lists are left alone.
+"""
+import re
+import threading
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "spelling"
+BUNDLED_WORDLISTS = ("en_words.txt", "domain_terms.txt")  # base forms, inflected
+FREQUENCY_WORDLIST = "en_frequency.txt"  # full forms, taken as-is
+BLOOM_BITS_PER_WORD = 10
+BLOOM_HASHES = 7  # ~1% false positives at 10 bits per word
+MIN_WORD_LENGTH = 4
+MAX_TYPOS = 20
+
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+_VOWELS = "aeiou"
+_SCANNER = re.compile(
+    r"""
+    (?P<skip>\S*[@/\\]\S*|\S+\.(?:com|org|net|io|dev|app|ai|co|edu|gov)\b\S*)  # emails, URLs, paths
+    | (?P<word>[A-Za-z]+(?:['’][A-Za-z]+)*)
+    | (?P<boundary>[.!?:;\n•▪●◦‣∙·➢►✓✔*])
+    """,
+    re.VERBOSE,
+)
+
+_index = None
+_lock = threading.Lock()
+
+
+class WordIndex:
+    """An immutable word set: Bloom filter in front of a sorted bytes blob."""
+
+    def __init__(self, words):
+        ordered = sorted({word.encode("utf-8") for word in words if word})
+        self._blob = b"\n".join(ordered) + b"\n"
+        self._offsets = array("I", [0])
+        for word in ordered:
+            self._offsets.append(self._offsets[-1] + len(word) + 1)
+        self._size = max(64, len(ordered) * BLOOM_BITS_PER_WORD)
+        self._bits = bytearray(self._size // 8 + 1)
+        for word in ordered:
+            for position in self._probes(word.decode("utf-8")):
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __contains__(self, word: str) -> bool:
+        return self._maybe(word) and self._exact(word.encode("utf-8"))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._blob) + self._offsets.itemsize * len(self._offsets) + len(self._bits)
+
+    def _probes(self, word: str):
+        # str hashes are salted per interpreter, which is fine here: the filter is
+        # built and queried in the same process (or in workers forked from it)
+        h = hash(word) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return ((h1 + i * h2) % self._size for i in range(BLOOM_HASHES))
+
+    def _maybe(self, word: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._probes(word))
+
+    def _exact(self, target: bytes) -> bool:
+        offsets, blob = self._offsets, self._blob
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            word = blob[offsets[mid]:offsets[mid + 1] - 1]
+            if word == target:
+                return True
+            if word < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+
+def _doubles_final(word: str) -> bool:
+    """plan -> planned, stop -> stopping: one vowel before a single final consonant."""
+    return (
+        len(word) >= 3 and word[-1] not in _VOWELS + "wxy" and word[-2] in _VOWELS
+        and word[-3] not in _VOWELS and sum(1 for ch in word if ch in _VOWELS) == 1
+    )
+
+
+def inflections(word: str):
+    """The word with its regular -s, -ed, -ing and -er/-est forms."""
+    yield word
+    if len(word) < 2:
+        return
+    consonant_y = word.endswith("y") and word[-2] not in _VOWELS
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        yield word + "es"
+    elif consonant_y:
+        yield word[:-1] + "ies"
+    else:
+        yield word + "s"
+
+    if word.endswith("e"):
+        yield from (word + "d", word + "r", word + "rs", word + "st")
+        if word.endswith("ie"):
+            yield word[:-2] + "ying"
+        elif word.endswith("ee"):
+            yield word + "ing"
+        else:
+            yield word[:-1] + "ing"
+    elif consonant_y:
+        yield from (word[:-1] + "ied", word[:-1] + "ier", word[:-1] + "iest", word + "ing")
+    else:
+        yield from (word + "ed", word + "ing", word + "er", word + "ers", word + "est")
+        if _doubles_final(word):
+            doubled = word + word[-1]
+            yield from (doubled + "ed", doubled + "ing", doubled + "er", doubled + "ers", doubled + "est")
+
+
+def _read_words(path: Path) -> list[str]:
+    words = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.startswith("#"):
+                words.extend(word.lower() for word in line.split())
+    return words
+
+
+def load_index(extra_wordlists=()) -> WordIndex:
+    """Build an index from the bundled lists and ``extra_wordlists`` (taken as-is)."""
+    words = set(_read_words(DATA_DIR / FREQUENCY_WORDLIST))
+    for name in BUNDLED_WORDLISTS:
+        for word in _read_words(DATA_DIR / name):
+            words.update(inflections(word))
+    for path in extra_wordlists:
+        words.update(_read_words(Path(path)))
+    return WordIndex(words)
+
+
+def get_index() -> WordIndex:
+    """The process-wide index, built on first use."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                from django.conf import settings
+                _index = load_index(getattr(settings, "SPELLING_EXTRA_WORDLISTS", ()))
+    return _index
+
+
+def _edits(word: str):
+    """Edit-distance-1 candidates, likeliest slips first."""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    yield from (a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1)  # transposition
+    yield from (a + c + b for a, b in splits for c in _ALPHABET)  # insertion (a dropped letter)
+    yield from (a + b[1:] for a, b in splits if b)  # deletion
+    yield from (a + c + b[1:] for a, b in splits if b for c in _ALPHABET if c != b[0])  # substitution
+
+
+@lru_cache(maxsize=16384)
+def suggestion(word: str) -> str | None:
+    """
+    For an unknown lowercase word, the known word one edit away; None when the
+    word is known or nothing is close (a name, an unlisted term).
+    """
+    index = get_index()
+    if word in index or (word.endswith("'s") and word[:-2] in index):
+        return None
+    return next((candidate for candidate in _edits(word) if candidate in index), None)
+
+
+def find_typos(text: str, limit: int = MAX_TYPOS) -> list[tuple[str, str]]:
+    """
+    Likely misspellings in ``text`` as (word, suggestion) pairs, first occurrence
+    order. Acronyms and mixed case ("SQL", "iPhone") are skipped, and capitalised
+    words only count at the start of a line or sentence, where a proper noun is
+    least likely.
+    """
+    typos, seen = [], set()
+    at_start = True
+    for match in _SCANNER.finditer(text or ""):
+        kind = match.lastgroup
+        if kind == "boundary":
+            at_start = True
+            continue
+        word, capitalised_ok = match.group(), at_start
+        at_start = False
+        if kind == "skip" or len(word) < MIN_WORD_LENGTH or not word[1:].islower():
+            continue
+        if word[0].isupper() and not capitalised_ok:
+            continue
+        lower = word.lower().replace("’", "'")
+        if lower in seen or ("'" in lower and not lower.endswith("'s")):
+            continue
+        seen.add(lower)
+        fix = suggestion(lower)
+        if fix:
+            typos.append((word, fix))
+            if len(typos) >= limit:
+                break
+    return typos
@@ -0,0 +1,135 @@
+"""
+Per-endpoint rate limiting on the shared cache.
+
+Each policy in settings.RATE_LIMITS is a list of (scope, limit, period) rules;
+"ip" counts per client address, "email" per posted email address and "user"
+per authenticated account (API tokens included). Requests
+are counted with a sliding-window counter (the current fixed window plus the
+previous one weighted by how much of it still overlaps), which needs only two
+cache keys per rule and is atomic across workers through cache.incr.
+"""
+import hashlib
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+from .metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+_counters: dict[tuple[str, str], int] = defaultdict(int)
+os.register_at_fork(after_in_child=_counters.clear)  # per-process counts; see metrics.py
+_warned_unconfigured_proxy = False
+
+
+def client_ip(request) -> str:
+    """REMOTE_ADDR, or the address RATE_LIMIT_PROXY_COUNT hops back in X-Forwarded-For behind a proxy."""
+    global _warned_unconfigured_proxy
+    proxies = getattr(settings, "RATE_LIMIT_PROXY_COUNT", 0)
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    if forwarded and not proxies and not _warned_unconfigured_proxy:
+        # every client would share the proxy's address, and so one set of "ip" limits
+        _warned_unconfigured_proxy = True
+        logger.error(
+            "X-Forwarded-For is present but RATE_LIMIT_PROXY_COUNT is 0: per-IP rate limits are counting "
+            "the proxy (%s), not clients. Set RATE_LIMIT_PROXY_COUNT to the number of proxies in front of the app.",
+            request.META.get("REMOTE_ADDR", ""),
+        )
+    if proxies and forwarded:
+        hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+        if hops:
+            return hops[-min(proxies, len(hops))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _identity(request, scope: str) -> str:
+    if scope == "ip":
+        return client_ip(request)
+    if scope == "email":
+        return (request.POST.get("email", "") or "").strip().lower()
+    if scope == "user":
+        user = getattr(request, "user", None)
+        return str(user.pk) if user is not None and user.is_authenticated else ""
+    raise ValueError(f"Unknown rate-limit scope: {scope}")
+
+
+def hit(endpoint: str, scope: str, identity: str, limit: int, period: int) -> float | None:
+    """Count one request; returns None if allowed, else the seconds until it would be."""
+    now = time.time()
+    window = int(now // period)
+    elapsed = now - window * period
+    ident = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:24]  # don't keep raw emails/IPs as keys
+    key = f"ratelimit:{endpoint}:{scope}:{period}:{ident}"
+
+    cache.add(f"{key}:{window}", 0, timeout=2 * period)
+    current = cache.incr(f"{key}:{window}")
+    previous = cache.get(f"{key}:{window - 1}", 0)
+    if previous * (1 - elapsed / period) + current <= limit:
+        return None
+    if current > limit or not previous:
+        return period - elapsed  # this window alone is over the limit
+    # the previous window's weight falls off linearly; wait until enough of it has
+    return max(1.0, period * (1 - (limit - current) / previous) - elapsed)
+
+
+def check(request, endpoint: str) -> float | None:
+    """Apply every rule of the endpoint's policy; returns the longest Retry-After, or None if allowed."""
+    if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+        return None
+    retry_after = None
+    for scope, limit, period in getattr(settings, "RATE_LIMITS", {}).get(endpoint, []):
+        identity = _identity(request, scope)
+        if not identity:
+            continue
+        try:
+            wait = hit(endpoint, scope, identity, limit, period)
+        except Exception:
+            logger.exception("Rate limiter unavailable; allowing %s", endpoint)  # fail open
+            return None
+        if wait is not None:
+            retry_after = max(retry_after or 0, wait)
+    return retry_after
+
+
+def throttle(endpoint: str, json: bool = False):
+    """View decorator: answer 429 with Retry-After once the endpoint's policy is exceeded."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            retry_after = check(request, endpoint)
+            if retry_after is None:
+                _counters[(endpoint, "allowed")] += 1
+                return view(request, *args, **kwargs)
+            _counters[(endpoint, "throttled")] += 1
+            message = "Too many requests. Please try again later."
+            if json:
+                response = JsonResponse({"status": "error", "message": message}, status=429)
+            else:
+                response = HttpResponse(message, status=429, content_type="text/plain")
+            response["Retry-After"] = str(math.ceil(retry_after))
+            return response
+        return wrapper
+    return decorator
+
+
+def throttle_stats() -> dict[str, dict[str, int]]:
+    """Allowed/throttled request counts per endpoint for this process."""
+    stats: dict[str, dict[str, int]] = defaultdict(lambda: {"allowed": 0, "throttled": 0})
+    for (endpoint, outcome), count in _counters.items():
+        stats[endpoint][outcome] = count
+    return dict(stats)
+
+
+def _collect():
+    for (endpoint, outcome), count in list(_counters.items()):
+        yield "ratelimit_requests_total", {"endpoint": endpoint, "outcome": outcome}, count
+
+
+register_collector(_collect)
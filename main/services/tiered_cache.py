@@ -0,0 +1,326 @@
+"""
+Two-tier Django cache backend: a small in-process LRU in front of a sqlite file
+that every worker on the host shares.
+
+Keys are grouped into namespaces by the text before their first ":"
+("otp:login:a@b.com" is in the "otp" namespace). Each namespace can set its own
+default timeout and whether it may be served from the in-process front; values
+that must never be stale in another worker (OTPs, rate-limit counters) turn the
+front off. Configure it in settings.CACHES:
+
+    "BACKEND": "main.services.tiered_cache.TieredCache",
+    "LOCATION": "/path/to/cache.sqlite3",
+    "OPTIONS": {"FRONT_SIZE": 1024, "FRONT_TTL": 5, "NAMESPACES": {"otp": {"timeout": 300, "front": False}}},
+
+Django builds one backend instance per thread, so - as with LocMemCache - the
+front, the counters and the cull bookkeeping live in module-level state keyed
+by LOCATION and are shared by every instance in the process.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .metrics import register_collector
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+STAT_FIELDS = ("front_hits", "shared_hits", "misses", "sets", "deletes", "front_evictions")
+
+_MISSING = object()
+
+
+class _State:
+    """Per-LOCATION process state shared by the per-thread backend instances."""
+
+    def __init__(self):
+        self.front: OrderedDict[str, tuple[float, object, str]] = OrderedDict()
+        self.lock = threading.Lock()  # guards everything below
+        self.stats: dict[str, dict[str, int]] = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+        self.sets_since_cull = 0
+        self.shared_evictions = 0
+
+
+_states: dict[str, _State] = {}
+_states_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # a worker reports its own counters; the inherited front stays valid
+    global _states_lock
+    _states_lock = threading.Lock()
+    for state in _states.values():
+        state.lock = threading.Lock()
+        state.stats.clear()
+        state.sets_since_cull = state.shared_evictions = 0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._path = Path(location)
+        self._front_size = int(options.get("FRONT_SIZE", 1024))
+        self._front_ttl = float(options.get("FRONT_TTL", 5))
+        self._namespaces = options.get("NAMESPACES", {})
+        self._local = threading.local()
+        with _states_lock:
+            self._state = _states.setdefault(str(location), _State())
+
+    # ----------------------------
+    # sqlite connection (one per thread, reopened after fork)
+    # ----------------------------
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            new_file = not self._path.exists()
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            if new_file:
+                os.chmod(self._path, 0o600)  # holds OTPs and the Graph token
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # ----------------------------
+    # namespaces and stats
+    # ----------------------------
+    @staticmethod
+    def namespace_of(key: str) -> str:
+        return key.split(":", 1)[0] if ":" in key else "default"
+
+    def _ns_config(self, key: str) -> dict:
+        return self._namespaces.get(self.namespace_of(key), {})
+
+    def _timeout(self, key: str, timeout) -> float | None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._ns_config(key).get("timeout", self.default_timeout)
+        return None if timeout is None else time.time() + timeout
+
+    def _count(self, key: str, field: str, n: int = 1) -> None:
+        with self._state.lock:
+            self._state.stats[self.namespace_of(key)][field] += n
+
+    def stats(self) -> dict:
+        """Counters for this process: per namespace, plus evictions from the shared file."""
+        state = self._state
+        with state.lock:
+            counters_by_ns = {ns: dict(counters) for ns, counters in state.stats.items()}
+            front_entries, shared_evictions = len(state.front), state.shared_evictions
+        namespaces = {}
+        for ns, counters in counters_by_ns.items():
+            hits = counters["front_hits"] + counters["shared_hits"]
+            lookups = hits + counters["misses"]
+            namespaces[ns] = {**counters, "hit_ratio": hits / lookups if lookups else 0.0}
+        return {
+            "namespaces": namespaces,
+            "front_entries": front_entries,
+            "shared_evictions": shared_evictions,
+        }
+
+    def shared_size(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    # ----------------------------
+    # in-process front
+    # ----------------------------
+    def _front_get(self, key: str):
+        state = self._state
+        with state.lock:
+            entry = state.front.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.time():
+                del state.front[key]
+                return _MISSING
+            state.front.move_to_end(key)
+            return entry[1]
+
+    def _front_put(self, key: str, raw_key: str, value, expires: float | None) -> None:
+        if not self._front_size or not self._ns_config(raw_key).get("front", True):
+            return
+        front_expires = time.time() + self._front_ttl
+        if expires is not None:
+            front_expires = min(front_expires, expires)
+        state = self._state
+        with state.lock:
+            state.front[key] = (front_expires, value, self.namespace_of(raw_key))
+            state.front.move_to_end(key)
+            while len(state.front) > self._front_size:
+                _, (_, _, ns) = state.front.popitem(last=False)
+                state.stats[ns]["front_evictions"] += 1
+
+    def _front_drop(self, key: str) -> None:
+        with self._state.lock:
+            self._state.front.pop(key, None)
+
+    # ----------------------------
+    # BaseCache API
+    # ----------------------------
+    def get(self, key, default=None, version=None):
+        value = self._get(key, version)
+        return default if value is _MISSING else value
+
+    def _get(self, key, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        value = self._front_get(full_key)
+        if value is not _MISSING:
+            self._count(key, "front_hits")
+            return value
+        row = self._db().execute("SELECT value, expires FROM cache WHERE key = ?", (full_key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            self._count(key, "misses")
+            return _MISSING
+        self._count(key, "shared_hits")
+        value = pickle.loads(row[0])
+        self._front_put(full_key, key, value, row[1])
+        return value
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM cache WHERE key = ? AND expires <= ?", (full_key, time.time()))
+            added = db.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (full_key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._timeout(key, timeout)),
+            ).rowcount
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if added:
+            self._count(key, "sets")
+            self._front_drop(full_key)
+        return bool(added)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        expires = self._timeout(key, timeout)
+        self._db().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (full_key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires),
+        )
+        self._count(key, "sets")
+        self._front_drop(full_key)
+        self._front_put(full_key, key, value, expires)
+        self._maybe_cull()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self._front_drop(full_key)
+        return bool(self._db().execute(
+            "UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self._timeout(key, timeout), full_key, time.time()),
+        ).rowcount)
+
+    def delete(self, key, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self._front_drop(full_key)
+        self._count(key, "deletes")
+        return bool(self._db().execute("DELETE FROM cache WHERE key = ?", (full_key,)).rowcount)
+
+    def has_key(self, key, version=None):
+        return self._get(key, version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        """Atomic across workers (the read-modify-write runs in one sqlite write transaction)."""
+        full_key = self.make_and_validate_key(key, version=version)
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT value, expires FROM cache WHERE key = ?", (full_key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            db.execute("UPDATE cache SET value = ? WHERE key = ?", (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), full_key))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self._front_drop(full_key)
+        return value
+
+    def clear(self):
+        with self._state.lock:
+            self._state.front.clear()
+        self._db().execute("DELETE FROM cache")
+
+    def close(self, **kwargs):
+        # keep the per-thread connection open across requests; it is cheap and reused
+        pass
+
+    def _maybe_cull(self) -> None:
+        state = self._state
+        with state.lock:
+            state.sets_since_cull += 1
+            if state.sets_since_cull < 100:  # checking the row count on every write isn't worth it
+                return
+            state.sets_since_cull = 0
+        db = self._db()
+        expired = db.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),)).rowcount
+        culled = 0
+        count = db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self._max_entries:
+            culled = db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires IS NULL, expires LIMIT ?)",
+                (max(1, count // self._cull_frequency) if self._cull_frequency else count,),
+            ).rowcount
+        with state.lock:
+            state.shared_evictions += expired + culled
+
+
+def cache_stats() -> dict:
+    """Eviction and hit counters of the default cache, when it is a TieredCache."""
+    return cache.stats() if hasattr(cache, "stats") else {}
+
+
+LOOKUP_RESULTS = {"front_hits": "front_hit", "shared_hits": "shared_hit", "misses": "miss"}
+
+
+def _collect():
+    stats = cache_stats()
+    for ns, counters in stats.get("namespaces", {}).items():
+        for field, result in LOOKUP_RESULTS.items():
+            yield "cache_requests_total", {"namespace": ns, "result": result}, counters[field]
+        yield "cache_evictions_total", {"tier": "front", "namespace": ns}, counters["front_evictions"]
+    if stats:
+        yield "cache_evictions_total", {"tier": "shared", "namespace": "*"}, stats["shared_evictions"]
+
+
+register_collector(_collect)
+
+
+def memoize(namespace: str, should_cache=None):
+    """
+    Cache a function's result in ``namespace`` (timeout from the namespace config),
+    keyed by a hash of its arguments. ``should_cache(result)`` can veto caching,
+    e.g. for results that only reflect an upstream failure.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            digest = hashlib.sha256(repr((args, sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+            key = f"{namespace}:{func.__module__}.{func.__qualname__}:{digest}"
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            value = func(*args, **kwargs)
+            if should_cache is None or should_cache(value):
+                cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,10 @@
+"""
+Local stand-ins for the upstream services (GitHub, LeetCode, Gemini, Microsoft Graph).
+
+``python manage.py run_stubs`` serves all of them from one port. In replay mode
+a request is answered from a recorded fixture when there is one and otherwise
+from a deterministic synthetic response; in record mode it is forwarded to the
+real service and the response saved as a fixture. Latency, error rate and rate
+limits are configurable per service, so upstream concurrency, caching and
+timeouts can be load-tested offline and repeatably.
+"""
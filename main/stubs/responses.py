@@ -0,0 +1,147 @@
+"""
+Synthetic upstream responses, used when no recorded fixture matches.
+
+Every response is derived from the request alone (a username, the prompt), so
+the same request always gets the same answer and scores are reproducible. Each
+builder returns (status, headers, JSON-serialisable body) or None if the route
+is unknown.
+"""
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+Response = tuple[int, dict, object]
+
+TOPICS = ["python", "django", "machine-learning", "react", "devops", "data-science", "api", "cli", "docker"]
+TAGS = [
+    "Array", "String", "Hash Table", "Dynamic Programming", "Math", "Sorting", "Greedy",
+    "Depth-First Search", "Binary Search", "Tree", "Graph", "Two Pointers",
+]
+
+
+def _rng(*parts: str) -> random.Random:
+    return random.Random(hashlib.sha256(":".join(parts).encode("utf-8")).hexdigest())
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _repos(username: str) -> list[dict]:
+    rng = _rng("repos", username)
+    return [
+        {
+            "name": f"project-{i}",
+            "full_name": f"{username}/project-{i}",
+            "owner": {"login": username},
+            "description": f"A {rng.choice(TOPICS)} {rng.choice(['tool', 'service', 'library', 'app'])}",
+            "stargazers_count": rng.randint(0, 40),
+            "updated_at": (_now() - timedelta(days=rng.randint(0, 400))).isoformat().replace("+00:00", "Z"),
+        }
+        for i in range(rng.randint(3, 25))
+    ]
+
+
+# ----------------------------
+# GitHub REST + GraphQL
+# ----------------------------
+def github(method: str, path: str, body: bytes) -> Response | None:
+    if method == "POST" and path == "/graphql":
+        login = (json.loads(body or b"{}").get("variables") or {}).get("login", "")
+        nodes = [{"nameWithOwner": r["full_name"], "name": r["name"], "description": r["description"]}
+                 for r in _repos(login)[:_rng("pinned", login).randint(0, 6)]]
+        return 200, {}, {"data": {"user": {"pinnedItems": {"nodes": nodes}}}}
+
+    if method != "GET":
+        return None
+    if m := re.fullmatch(r"/users/([^/]+)/events/public", path):
+        rng = _rng("events", m[1])
+        return 200, {}, [
+            {"type": rng.choice(["PushEvent", "PushEvent", "WatchEvent", "CreateEvent"]),
+             "created_at": (_now() - timedelta(days=rng.randint(0, 150))).isoformat().replace("+00:00", "Z")}
+            for _ in range(rng.randint(0, 30))
+        ]
+    if m := re.fullmatch(r"/users/([^/]+)/repos", path):
+        return 200, {}, _repos(m[1])
+    if m := re.fullmatch(r"/users/([^/]+)", path):
+        return 200, {}, {"login": m[1], "followers": _rng("followers", m[1]).randint(0, 200)}
+    if m := re.fullmatch(r"/repos/([^/]+)/([^/]+)/readme", path):
+        if _rng("readme", m[1], m[2]).random() < 0.3:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"name": "README.md", "encoding": "base64", "content": "IyBQcm9qZWN0Cg=="}
+    if m := re.fullmatch(r"/repos/([^/]+)/([^/]+)/topics", path):
+        return 200, {}, {"names": _rng("topics", m[1], m[2]).sample(TOPICS, 2)}
+    return None
+
+
+# ----------------------------
+# LeetCode GraphQL
+# ----------------------------
+def leetcode(method: str, path: str, body: bytes) -> Response | None:
+    if method != "POST" or path != "/graphql":
+        return None
+    payload = json.loads(body or b"{}")
+    username = (payload.get("variables") or {}).get("username", "")
+    query = payload.get("query", "")
+    rng = _rng("leetcode", username)
+    if "userContestRankingHistory" in query:
+        return 200, {}, {"data": {"userContestRankingHistory": [
+            {"attended": rng.random() < 0.6} for _ in range(rng.randint(0, 12))
+        ]}}
+    easy, medium, hard = rng.randint(10, 200), rng.randint(0, 150), rng.randint(0, 40)
+    return 200, {}, {"data": {"matchedUser": {
+        "submitStats": {"acSubmissionNum": [
+            {"difficulty": "All", "count": easy + medium + hard},
+            {"difficulty": "Easy", "count": easy},
+            {"difficulty": "Medium", "count": medium},
+            {"difficulty": "Hard", "count": hard},
+        ]},
+        "tagProblemCounts": {"advanced": [
+            {"tagName": tag, "problemsSolved": rng.randint(0, 12)} for tag in TAGS
+        ]},
+    }}}
+
+
+# ----------------------------
+# Gemini (generativelanguage REST)
+# ----------------------------
+def gemini(method: str, path: str, body: bytes) -> Response | None:
+    if method != "POST" or not re.fullmatch(r"/v1(beta)?/models/[^/:]+:generateContent", path):
+        return None
+    rng = _rng("gemini", hashlib.sha256(body or b"").hexdigest())
+    scores = {k: round(rng.uniform(0.3, 0.95), 2)
+              for k in ("keyword_density", "experience_match", "skills_match", "education_match")}
+    text = "\n".join(f"{k}: {v}" for k, v in scores.items())
+    text += "\nJustification: the resume covers most required skills; add measurable outcomes."
+    return 200, {}, {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+        "usageMetadata": {"promptTokenCount": len(body or b"") // 4, "candidatesTokenCount": len(text) // 4},
+    }
+
+
+# ----------------------------
+# Microsoft identity platform + Graph
+# ----------------------------
+def login(method: str, path: str, body: bytes) -> Response | None:
+    if method != "POST" or not re.fullmatch(r"/[^/]+/oauth2/v2\.0/token", path):
+        return None
+    token = hashlib.sha256(f"{path}:{_now().isoformat()}".encode("utf-8")).hexdigest()
+    return 200, {}, {"token_type": "Bearer", "expires_in": 3599, "access_token": f"stub-{token}"}
+
+
+def graph(method: str, path: str, body: bytes) -> Response | None:
+    if method != "POST":
+        return None
+    if re.fullmatch(r"/v1\.0/users/[^/]+/sendMail", path):
+        return 202, {}, None
+    if path == "/v1.0/$batch":
+        requests_ = json.loads(body or b"{}").get("requests", [])
+        return 200, {}, {"responses": [{"id": r.get("id"), "status": 202, "headers": {}, "body": None}
+                                       for r in requests_]}
+    return None
@@ -0,0 +1,271 @@
+"""
+The stub HTTP server: routing, fault injection and record/replay fixtures.
+
+Services are mounted by path prefix (``/github``, ``/leetcode``, ``/graph``,
+``/login``, and Gemini's own ``/v1beta`` paths, because the SDK only takes a host).
+Every request goes through the same steps: the service's rate limit, its
+latency (plus seeded jitter), its error rate, and finally the response from a
+fixture, the real upstream (record mode) or responses.py.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import responses
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Behaviour:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: int = 0  # requests per rate_window; 0 = unlimited
+    rate_window: float = 60.0
+
+
+@dataclass(frozen=True)
+class Service:
+    name: str
+    prefix: str
+    upstream: str
+    synthesize: object
+    # GraphQL answers depend on the query, so the body is part of the fixture key; for
+    # Gemini and Graph it holds the resume text or an OTP and would never match again
+    key_body: bool = False
+    github_rate_limit: bool = False  # 403 + X-RateLimit-Remaining: 0 instead of 429
+
+
+SERVICES = {
+    "github": Service("github", "/github", "https://api.github.com", responses.github,
+                      key_body=True, github_rate_limit=True),
+    "leetcode": Service("leetcode", "/leetcode", "https://leetcode.com", responses.leetcode, key_body=True),
+    "gemini": Service("gemini", "", "https://generativelanguage.googleapis.com", responses.gemini),
+    "graph": Service("graph", "/graph", "https://graph.microsoft.com", responses.graph),
+    "login": Service("login", "/login", "https://login.microsoftonline.com", responses.login),
+}
+
+# forwarded to the client from recorded/upstream responses
+KEPT_HEADERS = ("content-type", "retry-after", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset")
+
+
+def route(path: str) -> tuple[Service, str] | None:
+    """The service for a request path and the path as that service sees it."""
+    if path.startswith(("/v1beta/", "/v1/")):
+        return SERVICES["gemini"], path
+    for service in SERVICES.values():
+        if service.prefix and (path == service.prefix or path.startswith(service.prefix + "/")):
+            return service, path[len(service.prefix):] or "/"
+    return None
+
+
+@dataclass
+class StubConfig:
+    mode: str = "replay"  # "replay" or "record"
+    fixtures: Path = Path("var/stub_fixtures")
+    strict: bool = False  # replay: 404 instead of a synthetic response when no fixture matches
+    seed: int = 0
+    default: Behaviour = field(default_factory=Behaviour)
+    overrides: dict[str, Behaviour] = field(default_factory=dict)
+
+    def behaviour(self, service: str) -> Behaviour:
+        return self.overrides.get(service, self.default)
+
+
+def parse_override(spec: str, default: Behaviour) -> tuple[str, Behaviour]:
+    """``github:latency_ms=200,error_rate=0.1`` -> ("github", Behaviour(...)) based on ``default``."""
+    name, _, settings_ = spec.partition(":")
+    if name not in SERVICES:
+        raise ValueError(f"Unknown service {name!r}; choose from {', '.join(SERVICES)}")
+    values = {}
+    for pair in filter(None, settings_.split(",")):
+        key, _, value = pair.partition("=")
+        if key not in Behaviour.__dataclass_fields__:
+            raise ValueError(f"Unknown setting {key!r} for {name}")
+        values[key] = type(getattr(default, key))(value)
+    return name, replace(default, **values)
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per (service, method, path[, body])."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._loaded: dict[Path, dict | None] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, service: Service, method: str, path: str, query: str, body: bytes) -> Path:
+        parts = [method, path, query]
+        if service.key_body:
+            try:  # key on the JSON content, not its formatting
+                parts.append(json.dumps(json.loads(body), sort_keys=True))
+            except ValueError:
+                parts.append(body.decode("utf-8", "replace"))
+        digest = hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^\w.-]+", "_", path.strip("/"))[:60] or "root"
+        return self.directory / service.name / f"{method.lower()}-{slug}-{digest}.json"
+
+    def get(self, service: Service, method: str, path: str, query: str, body: bytes) -> dict | None:
+        fixture = self._path(service, method, path, query, body)
+        with self._lock:
+            if fixture not in self._loaded:
+                try:
+                    self._loaded[fixture] = json.loads(fixture.read_text())
+                except (OSError, ValueError):
+                    self._loaded[fixture] = None
+            return self._loaded[fixture]
+
+    def put(self, service: Service, method: str, path: str, query: str, body: bytes, recorded: dict) -> None:
+        fixture = self._path(service, method, path, query, body)
+        fixture.parent.mkdir(parents=True, exist_ok=True)
+        fixture.write_text(json.dumps(recorded, indent=2))
+        with self._lock:
+            self._loaded[fixture] = recorded
+
+
+class RateWindow:
+    """Fixed-window request counter per service, shaped like the real APIs' rate-limit headers."""
+
+    def __init__(self):
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, service: str, behaviour: Behaviour) -> tuple[int, float] | None:
+        """(remaining, reset epoch) after counting this request, or None when unlimited."""
+        if not behaviour.rate_limit:
+            return None
+        now = time.time()
+        window = int(now // behaviour.rate_window)
+        with self._lock:
+            current, count = self._windows.get(service, (window, 0))
+            if current != window:
+                count = 0
+            count += 1
+            self._windows[service] = (window, count)
+        return behaviour.rate_limit - count, (window + 1) * behaviour.rate_window
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.fixtures = FixtureStore(config.fixtures)
+        self.rates = RateWindow()
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.counts: dict[tuple[str, int], int] = {}
+
+    def random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def count(self, service: str, status: int) -> None:
+        with self.rng_lock:
+            self.counts[(service, status)] = self.counts.get((service, status), 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs behind requests' pooled sessions
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, service: str, status: int, headers: dict, body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, str(value))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(service, status)
+
+    def _send_json(self, service: str, status: int, headers: dict, payload) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self._send(service, status, {"Content-Type": "application/json", **headers}, body)
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        routed = route(url.path)
+        if routed is None:
+            return self._send_json("unknown", 404, {}, {"message": f"No stub for {url.path}"})
+        service, path = routed
+        config = self.server.config
+        behaviour = config.behaviour(service.name)
+
+        headers = {}
+        limit = self.server.rates.hit(service.name, behaviour)
+        if limit is not None:
+            remaining, reset = limit
+            headers = {
+                "X-RateLimit-Limit": behaviour.rate_limit,
+                "X-RateLimit-Remaining": max(0, remaining),
+                "X-RateLimit-Reset": int(reset),
+            }
+            if remaining < 0:
+                headers["Retry-After"] = max(1, int(reset - time.time()))
+                status = 403 if service.github_rate_limit else 429
+                return self._send_json(service.name, status, headers, {"message": "API rate limit exceeded"})
+
+        delay = behaviour.latency_ms + behaviour.jitter_ms * self.server.random()
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if behaviour.error_rate and self.server.random() < behaviour.error_rate:
+            error_headers = {**headers, "Retry-After": 1} if behaviour.error_status in (429, 503) else headers
+            return self._send_json(service.name, behaviour.error_status, error_headers,
+                                   {"error": {"code": behaviour.error_status, "message": "Injected stub failure"}})
+
+        if config.mode == "record":
+            recorded = self._forward(service, path, url.query, body)
+            if recorded is None:
+                return self._send_json(service.name, 502, headers, {"message": "Upstream unreachable"})
+            if recorded["status"] < 400 or recorded["status"] == 404:  # never replay throttling or outages
+                self.server.fixtures.put(service, self.command, path, url.query, body, recorded)
+        else:
+            recorded = self.server.fixtures.get(service, self.command, path, url.query, body)
+
+        if recorded is not None:
+            return self._send(service.name, recorded["status"], {**recorded["headers"], **headers},
+                              recorded["body"].encode("utf-8"))
+        synthetic = None if config.strict else service.synthesize(self.command, path, body)
+        if synthetic is None:
+            return self._send_json(service.name, 404, headers, {"message": f"No fixture for {self.command} {url.path}"})
+        status, extra, payload = synthetic
+        self._send_json(service.name, status, {**extra, **headers}, payload)
+
+    def _forward(self, service: Service, path: str, query: str, body: bytes) -> dict | None:
+        import requests
+
+        url = service.upstream + path + (f"?{query}" if query else "")
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in ("host", "content-length", "connection")}
+        try:
+            resp = requests.request(self.command, url, headers=headers, data=body or None, timeout=60)
+        except requests.RequestException:
+            logger.warning("Recording %s %s failed", self.command, url, exc_info=True)
+            return None
+        return {
+            "request": {"method": self.command, "path": path, "query": query},
+            "status": resp.status_code,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() in KEPT_HEADERS},
+            "body": resp.text,
+        }
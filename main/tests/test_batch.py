@@ -0,0 +1,133 @@
+import io
+import json
+import zipfile
+from unittest import mock
+
+import docx
+import fitz
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from main.ats_score_non_tech import read_resume
+from main.services.batch import BatchError, collect_items
+
+MB = 1024 * 1024
+
+
+def _zip(members: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+class CollectItemsTests(SimpleTestCase):
+    def test_files_and_zip_members_in_order(self):
+        archive = _zip({
+            "batch/b.docx": b"docx",
+            "batch/": b"",
+            "__MACOSX/batch/._b.docx": b"x",
+            "batch/.DS_Store": b"x",
+            "batch/c.pdf": b"pdf",
+        })
+        items = collect_items([
+            SimpleUploadedFile("a.pdf", b"%PDF-1.4"),
+            SimpleUploadedFile("resumes.zip", archive),
+        ], max_files=10, max_bytes=MB)
+        self.assertEqual([(i.index, i.filename) for i in items], [(0, "a.pdf"), (1, "batch/b.docx"), (2, "batch/c.pdf")])
+        self.assertTrue(all(not i.error for i in items))
+        with items[1].open() as fh:
+            self.assertEqual(fh.read(), b"docx")
+
+    def test_unsupported_and_oversized_items_are_flagged(self):
+        items = collect_items([
+            SimpleUploadedFile("notes.txt", b"hi"),
+            SimpleUploadedFile("big.pdf", b"x" * 2048),
+        ], max_files=10, max_bytes=1024)
+        self.assertEqual(items[0].error, "Unsupported file format.")
+        self.assertTrue(items[1].error.startswith("File is larger than"))
+
+    def test_too_many_files(self):
+        with self.assertRaises(BatchError):
+            collect_items([SimpleUploadedFile("r.zip", _zip({f"{i}.pdf": b"x" for i in range(3)}))],
+                          max_files=2, max_bytes=MB)
+
+    def test_bad_zip(self):
+        with self.assertRaises(BatchError):
+            collect_items([SimpleUploadedFile("r.zip", b"not a zip")], max_files=2, max_bytes=MB)
+
+
+RESUME_TEXT = (
+    "Jane Doe\njane.doe@example.com | +1 555 123 4567\nSummary\nMarketing manager who grew revenue 20%.\n"
+    "Experience\nLed campaigns and managed a budget of $2M.\nEducation\nBA Marketing\nSkills\nSEO, CRM, analytics"
+)
+
+
+def _pdf() -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), RESUME_TEXT)
+    return doc.tobytes()
+
+
+def _docx() -> bytes:
+    document = docx.Document()
+    for line in RESUME_TEXT.splitlines():
+        document.add_paragraph(line)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+# one item at a time: the in-memory SQLite test database locks a whole table per write
+@override_settings(RATE_LIMIT_ENABLED=False, BATCH_IN_FLIGHT=1)
+class AnalyzeBatchApiTests(TransactionTestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("recruiter", password="x")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+
+    def _post(self, role: str, files: list):
+        return self.client.post("/api/analyze_batch/", {"role": role, "resumes": files}, format="multipart")
+
+    def test_files_and_zip_stream_one_line_each(self):
+        response = self._post("marketing", [
+            SimpleUploadedFile("a.pdf", _pdf()),
+            SimpleUploadedFile("b.docx", _docx()),
+            SimpleUploadedFile("more.zip", _zip({"c.pdf": _pdf(), "notes.txt": b"hi"})),
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        done, results = lines[-1], sorted(lines[:-1], key=lambda line: line["index"])
+        self.assertEqual([r["filename"] for r in results], ["a.pdf", "b.docx", "c.pdf", "notes.txt"])
+        self.assertEqual([r["status"] for r in results], ["ok", "ok", "ok", "error"])
+        self.assertEqual(results[3]["error"], "Unsupported file format.")
+        self.assertEqual(results[0]["applicant_name"], "Jane Doe")
+        self.assertIsInstance(results[1]["ats_score"], (int, float))
+        self.assertEqual(results[2]["result_key"], results[0]["result_key"])  # same text and role
+        self.assertEqual((done["status"], done["total"], done["ok"], done["errors"]), ("done", 4, 3, 1))
+
+    def test_each_resume_is_read_and_scanned_once(self):
+        cache.clear()
+        with mock.patch("main.views.read_resume", wraps=read_resume) as view_read, \
+                mock.patch("main.ats_score_non_tech.read_resume") as scorer_read, \
+                mock.patch("main.ats_score_non_tech.extract_entities") as scorer_scan:
+            response = self._post("marketing", [SimpleUploadedFile("a.pdf", _pdf())])
+            b"".join(response.streaming_content)
+        self.assertEqual(view_read.call_count, 1)
+        scorer_read.assert_not_called()
+        scorer_scan.assert_not_called()
+
+    def test_unknown_role_is_rejected(self):
+        response = self._post("astronaut", [SimpleUploadedFile("a.pdf", _pdf())])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown role", response.json()["detail"])
+
+    def test_requires_a_token(self):
+        self.client.credentials()
+        self.assertEqual(self._post("marketing", [SimpleUploadedFile("a.pdf", _pdf())]).status_code, 401)
@@ -0,0 +1,57 @@
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from main.services import chart_cache as chart_cache_module
+from main.services.chart_cache import ChartCache, chart_key
+from main.services.metrics import render_prometheus
+
+
+def _key(name: str) -> tuple:
+    return chart_key([name], [1], theme="dark")
+
+
+class ChartCacheTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ChartCache(maxsize=2)
+        cache.put(_key("a"), b"a")
+        cache.put(_key("b"), b"b")
+        self.assertEqual(cache.get(_key("a")), b"a")  # "b" is now the oldest
+        cache.put(_key("c"), b"c")
+        self.assertIsNone(cache.get(_key("b")))
+        self.assertEqual(cache.get(_key("a")), b"a")
+        self.assertEqual(cache.get(_key("c")), b"c")
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_another_process_finds_the_chart_on_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ChartCache(directory=directory).put(_key("a"), b"svg")
+            other = ChartCache(directory=directory)
+            self.assertEqual(other.get(_key("a")), b"svg")  # from disk
+            self.assertEqual(other.get(_key("a")), b"svg")  # now from memory
+            self.assertIsNone(other.get(_key("b")))
+        stats = other.stats()
+        self.assertEqual((stats["hits"], stats["disk_hits"], stats["misses"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], round(2 / 3, 4))
+
+    def test_get_or_render_renders_once(self):
+        cache = ChartCache()
+        render = mock.Mock(return_value=b"svg")
+        self.assertEqual(cache.get_or_render(_key("a"), render), b"svg")
+        self.assertEqual(cache.get_or_render(_key("a"), render), b"svg")
+        render.assert_called_once_with()
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_lookups_are_exported_to_metrics(self):
+        cache = ChartCache()
+        cache.get_or_render(_key("a"), lambda: b"svg")
+        cache.get(_key("a"))
+        cache.get(_key("a"))
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory), \
+                mock.patch.object(chart_cache_module, "chart_cache", cache):
+            text = render_prometheus()
+        self.assertIn('chart_cache_requests_total{result="memory_hit"} 2', text)
+        self.assertIn('chart_cache_requests_total{result="disk_hit"} 0', text)
+        self.assertIn('chart_cache_requests_total{result="miss"} 1', text)
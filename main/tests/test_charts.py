@@ -0,0 +1,57 @@
+from django.test import SimpleTestCase
+
+from main.services.charts import render_pie_svg, render_pie_svg_base64, svg_to_png
+from main.views import register_chart_url
+
+
+class RenderPieSvgTests(SimpleTestCase):
+    def test_one_wedge_per_positive_slice(self):
+        svg = render_pie_svg(["A", "B", "C"], [50, 0, 25], theme="dark")
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertTrue(svg.endswith("</svg>"))
+        self.assertEqual(svg.count("<path"), 2)
+
+    def test_single_slice_is_a_full_ring(self):
+        svg = render_pie_svg(["Only"], [10], theme="dark")
+        # a 360-degree arc would start and end on the same point and draw nothing
+        self.assertTrue("<circle" in svg or 'fill-rule="evenodd"' in svg)
+
+    def test_labels_are_escaped(self):
+        svg = render_pie_svg(["R&D <team>"], [1], theme="dark")
+        self.assertIn("R&amp;D &lt;team&gt;", svg)
+        self.assertNotIn("<team>", svg)
+
+    def test_all_zero_sizes_draw_no_wedges(self):
+        self.assertEqual(render_pie_svg(["A", "B"], [0, 0], theme="non_tech").count("<path"), 0)
+
+    def test_same_input_same_bytes(self):
+        self.assertEqual(render_pie_svg(["A", "B"], [3, 4]), render_pie_svg(["A", "B"], [3, 4]))
+        self.assertEqual(render_pie_svg_base64(["A"], [1]), render_pie_svg_base64(["A"], [1]))
+
+    def test_png_rasterization(self):
+        png = svg_to_png(render_pie_svg(["A", "B"], [1, 2]).encode("utf-8"))
+        self.assertTrue(png.startswith(b"\x89PNG\r\n\x1a\n"))
+
+
+class ReportChartViewTests(SimpleTestCase):
+    result_key = "ab" * 32
+
+    def _url(self, score):
+        return register_chart_url(self.result_key, {"Skills": {"score": score}, "Format": {"score": 5}})
+
+    def test_versioned_url_is_immutable(self):
+        url = self._url(10)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_rescoring_changes_the_url(self):
+        old_url = self._url(10)
+        new_url = self._url(12)
+        self.assertNotEqual(old_url, new_url)
+        stale = self.client.get(old_url)  # scores changed since this URL was handed out
+        self.assertNotIn("immutable", stale["Cache-Control"])
+        self.assertIn("no-cache", stale["Cache-Control"])
+        revalidated = self.client.get(old_url, HTTP_IF_NONE_MATCH=stale["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from main.services.disk_cache import prune
+from main.services.report_pdf import cached_pdf_path
+
+
+class PruneTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def _write(self, name: str, size: int, age: int) -> Path:
+        path = self.root / name[:2] / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        mtime = 1_700_000_000 - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_under_the_cap_nothing_is_removed(self):
+        self._write("aa1", 100, age=10)
+        self.assertEqual(prune(self.root, 1000), 0)
+        self.assertTrue((self.root / "aa" / "aa1").exists())
+
+    def test_oldest_files_go_first(self):
+        oldest = self._write("aa1", 300, age=40)
+        older = self._write("bb1", 300, age=30)
+        newer = self._write("aa2", 300, age=20)
+        newest = self._write("bb2", 300, age=10)
+        self.assertEqual(prune(self.root, 1000), 600)  # 1200 bytes, down to 80% of the cap
+        self.assertEqual([p.exists() for p in (oldest, older, newer, newest)], [False, False, True, True])
+
+
+class CachedPdfPathTests(SimpleTestCase):
+    @override_settings(PDF_CACHE_DIR="/tmp/reports")
+    def test_path_changes_with_the_scores(self):
+        context = {"result_key": "ab" * 32, "overall_score_average": 71, "sections": {"GitHub Profile": {"score": 18}}}
+        rescored = {**context, "sections": {"GitHub Profile": {"score": 20}}}
+        self.assertEqual(cached_pdf_path(context), cached_pdf_path(dict(context)))
+        self.assertNotEqual(cached_pdf_path(context), cached_pdf_path(rescored))
+        self.assertEqual(cached_pdf_path(context).parent, Path("/tmp/reports/ab"))
+
+    @override_settings(PDF_CACHE_DIR="/tmp/reports")
+    def test_reports_without_a_result_key_are_not_cached(self):
+        self.assertIsNone(cached_pdf_path({"overall_score_average": 71}))
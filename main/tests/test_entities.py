@@ -0,0 +1,64 @@
+from django.test import SimpleTestCase
+
+from main.services.entities import extract_entities
+
+RESUME = """Jane Doe
+Marketing Manager
+jane.doe@example.com | +1 (555) 123-4567
+linkedin.com/in/janedoe | https://github.com/janedoe | https://janedoe.dev
+LeetCode: https://leetcode.com/u/janecodes/
+
+Certifications
+Google Analytics Certified
+"""
+
+
+class ExtractEntitiesTests(SimpleTestCase):
+    def test_contacts_and_links(self):
+        entities = extract_entities(RESUME)
+        self.assertEqual(entities.emails, ("jane.doe@example.com",))
+        self.assertEqual(entities.phones, ("+1 (555) 123-4567",))
+        self.assertEqual(entities.linkedin_urls, ("https://linkedin.com/in/janedoe",))
+        self.assertEqual(entities.github_username, "janedoe")
+        self.assertEqual(entities.leetcode_username, "janecodes")
+        self.assertEqual(entities.portfolio_urls, ("https://janedoe.dev",))
+        self.assertTrue(entities.has_contact)
+        self.assertTrue(entities.has_certification)
+        self.assertEqual(entities.applicant_name, "Jane Doe")
+
+    def test_hyperlinks_outside_the_text(self):
+        entities = extract_entities("John Smith", links=["https://github.com/jsmith", "mailto:j@x.io"])
+        self.assertEqual(entities.github_username, "jsmith")
+        self.assertEqual(entities.portfolio_urls, ())
+
+    def test_reserved_github_pages_are_not_users(self):
+        self.assertEqual(extract_entities("see https://github.com/features").github_username, "")
+
+    def test_short_digit_runs_are_not_phones(self):
+        self.assertEqual(extract_entities("Grew sales 12345 units").phones, ())
+
+    def test_link_map(self):
+        self.assertEqual(extract_entities(RESUME).link_map(), {
+            "linkedin": "https://linkedin.com/in/janedoe",
+            "github": "https://github.com/janedoe",
+            "portfolio": ["https://janedoe.dev"],
+        })
+
+
+class NameAndPhoneHeuristicsTests(SimpleTestCase):
+    def test_job_titles_and_credentials_are_not_names(self):
+        entities = extract_entities("John Smith\nMarketing Manager\nCertified Scrum Master\nLondon, UK")
+        self.assertEqual(entities.name_candidates, ("John Smith",))
+
+    def test_date_range_years_are_not_part_of_a_phone(self):
+        self.assertEqual(extract_entities("Jan 2019 - Dec 2021 1234567 8901").phones, ("1234567 8901",))
+        self.assertEqual(extract_entities("2019 - 2021 1234567 8901").phones, ("1234567 8901",))
+        self.assertEqual(extract_entities("Acme Corp, Jan 2019 - Dec 2021").phones, ())
+
+    def test_area_code_in_parentheses_keeps_its_opening_parenthesis(self):
+        self.assertEqual(extract_entities("Phone: (555) 123-4567").phones, ("(555) 123-4567",))
+        self.assertEqual(extract_entities("Jane Doe (555-123-4567)").phones, ("555-123-4567",))
+
+    def test_phones_that_start_like_a_year_are_kept(self):
+        self.assertEqual(extract_entities("Call 2025550143").phones, ("2025550143",))
+        self.assertEqual(extract_entities("Mobile: 2021 555 0143").phones, ("2021 555 0143",))
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.signals import request_started
+from django.test import SimpleTestCase, override_settings
+
+from main.apps import PREFETCH_DISPATCH_UID
+from main.services import mailer
+
+CREDENTIALS = {"MS_GRAPH_TENANT_ID": "tenant", "MS_GRAPH_CLIENT_ID": "client", "MS_GRAPH_CLIENT_SECRET": "secret"}
+
+
+class GraphTokenPrefetchTests(SimpleTestCase):
+    def tearDown(self):
+        request_started.disconnect(dispatch_uid=PREFETCH_DISPATCH_UID)
+
+    def test_off_under_manage_py_test(self):
+        self.assertFalse(settings.GRAPH_TOKEN_PREFETCH)
+
+    @override_settings(MS_GRAPH_ENABLED=True, GRAPH_TOKEN_PREFETCH=True, PRELOAD_WARMUP=False, **CREDENTIALS)
+    def test_prefetch_waits_for_the_first_request(self):
+        with mock.patch("main.services.mailer.prefetch_graph_token") as prefetch:
+            apps.get_app_config("main").ready()  # as at import: no timer thread yet
+            prefetch.assert_not_called()
+            request_started.send(sender=self.__class__)
+            request_started.send(sender=self.__class__)
+        prefetch.assert_called_once_with()
+
+    @override_settings(MS_GRAPH_ENABLED=False, PRELOAD_WARMUP=False)
+    def test_disabled(self):
+        with mock.patch("main.services.mailer.prefetch_graph_token") as prefetch:
+            apps.get_app_config("main").ready()
+            request_started.send(sender=self.__class__)
+        prefetch.assert_not_called()
+
+    @override_settings(MS_GRAPH_ENABLED=True, GRAPH_TOKEN_PREFETCH=True, PRELOAD_WARMUP=False,
+                       **{**CREDENTIALS, "MS_GRAPH_CLIENT_SECRET": ""})
+    def test_needs_every_credential(self):
+        with mock.patch("main.services.mailer.prefetch_graph_token") as prefetch:
+            apps.get_app_config("main").ready()
+            request_started.send(sender=self.__class__)
+        prefetch.assert_not_called()
+        with mock.patch.object(mailer, "_schedule_refresh") as schedule:
+            mailer.prefetch_graph_token()
+        schedule.assert_not_called()
@@ -0,0 +1,98 @@
+from unittest import mock
+
+import fitz
+from django.test import SimpleTestCase
+
+from main.services.layout import LayoutAnalyzer, _columns, _has_grid
+from main.services.sections import read_pdf
+
+WIDTH = 600.0
+
+
+def _line(p, q):
+    return {"items": [("l", fitz.Point(*p), fitz.Point(*q))]}
+
+
+class ColumnTests(SimpleTestCase):
+    def test_single_column(self):
+        self.assertEqual(_columns([(50, 550)] * 4 + [(50, 300)] * 6, WIDTH), 1)
+
+    def test_sidebar_layout(self):
+        extents = [(40, 180)] * 8 + [(240, 560)] * 12
+        self.assertEqual(_columns(extents, WIDTH), 2)
+
+    def test_a_full_width_name_line_does_not_hide_the_gutter(self):
+        extents = [(40, 560)] + [(40, 180)] * 10 + [(240, 560)] * 10
+        self.assertEqual(_columns(extents, WIDTH), 2)
+
+    def test_too_few_lines(self):
+        self.assertEqual(_columns([(40, 180), (240, 560)], WIDTH), 1)
+
+
+class GridTests(SimpleTestCase):
+    def test_ruled_table(self):
+        drawings = [_line((50, y), (550, y)) for y in (100, 130, 160)]
+        drawings += [_line((x, 100), (x, 160)) for x in (50, 300, 550)]
+        self.assertTrue(_has_grid(drawings))
+
+    def test_rectangle_cells(self):
+        drawings = [{"items": [("re", fitz.Rect(50 + 100 * i, 100, 150 + 100 * i, 130))]} for i in range(3)]
+        self.assertTrue(_has_grid(drawings))
+
+    def test_section_rules_are_not_a_table(self):
+        self.assertFalse(_has_grid([_line((50, y), (550, y)) for y in (100, 300, 500)]))
+        self.assertFalse(_has_grid([]))
+
+
+class LayoutAnalyzerTests(SimpleTestCase):
+    def _analyse(self, doc):
+        analyzer = LayoutAnalyzer()
+        read_pdf(doc, analyzer)
+        return analyzer.result()
+
+    def test_plain_pdf_is_simple(self):
+        with fitz.open() as doc:
+            page = doc.new_page(width=WIDTH, height=800)
+            for i in range(10):
+                page.insert_text((50, 100 + 20 * i), f"Line {i} of an ordinary one-column resume")
+            features = self._analyse(doc)
+        self.assertEqual(features.pages, 1)
+        self.assertTrue(features.is_simple)
+
+    def _ruled_page(self, doc, rules: int):
+        page = doc.new_page(width=WIDTH, height=800)
+        page.insert_text((50, 60), "Experience and skills at a glance")
+        shape = page.new_shape()
+        for i in range(rules):
+            y = 100 + (i % 600)
+            shape.draw_line((50, y), (550, y))
+            shape.draw_line((50 + i % 500, 100), (50 + i % 500, 160))
+        shape.finish(color=(0, 0, 0))
+        shape.commit()
+
+    def test_ruled_table_page(self):
+        with fitz.open() as doc:
+            self._ruled_page(doc, 3)
+            features = self._analyse(doc)
+        self.assertEqual(features.table_pages, 1)
+
+    def test_a_page_full_of_drawings_is_not_walked(self):
+        with fitz.open() as doc:
+            self._ruled_page(doc, 10000)
+            with mock.patch.object(fitz.Page, "get_cdrawings") as extract, \
+                    mock.patch.object(fitz.Page, "get_drawings") as extract_objects:
+                features = self._analyse(doc)
+        extract.assert_not_called()
+        extract_objects.assert_not_called()
+        self.assertEqual(features.pages, 1)
+        self.assertEqual(features.table_pages, 0)
+
+    def test_running_footer(self):
+        with fitz.open() as doc:
+            for n in (1, 2):
+                page = doc.new_page(width=WIDTH, height=800)
+                page.insert_text((50, 100), "Body text for this page of the resume")
+                page.insert_text((250, 790), f"Page {n} of 2")
+            features = self._analyse(doc)
+        self.assertTrue(features.header_footer)
+        self.assertFalse(features.is_simple)
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from main.services.metrics import RETIRED_SNAPSHOT, collect, retire
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+class RetireTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        override = override_settings(METRICS_DIR=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _write(self, pid: int, requests: float, gauge: float = 1.0) -> Path:
+        path = self.dir / f"{pid}.json"
+        path.write_text(json.dumps({
+            "pid": pid,
+            "counters": [["ratelimit_requests_total", [["endpoint", "x"]], requests]],
+            "gauges": [["process_resident_memory_bytes", [], gauge]],
+            "histograms": [["stage_duration_seconds", [["stage", "s"]], [1, 2], 0.5]],
+        }))
+        return path
+
+    def test_dead_workers_are_folded_into_retired(self):
+        first, second = self._write(_dead_pid(), 3), self._write(_dead_pid(), 4)
+        retire()
+        self.assertFalse(first.exists())
+        self.assertFalse(second.exists())
+        retired = json.loads((self.dir / RETIRED_SNAPSHOT).read_text())
+        self.assertEqual(retired["counters"], [["ratelimit_requests_total", [["endpoint", "x"]], 7]])
+        self.assertEqual(retired["histograms"], [["stage_duration_seconds", [["stage", "s"]], [2, 4], 1.0]])
+
+    def test_totals_survive_retirement(self):
+        dead = _dead_pid()
+        self._write(dead, 3)
+        self._write(1, 5)  # pid 1 always exists
+        merged = collect()
+        self.assertEqual(merged["counters"][("ratelimit_requests_total", (("endpoint", "x"),))], 8)
+        gauge_pids = {dict(labels)["pid"] for _, labels in merged["gauges"]}
+        self.assertIn("1", gauge_pids)
+        self.assertNotIn(str(dead), gauge_pids)
+        self.assertEqual({p.name for p in self.dir.glob("*.json")}, {"1.json", f"{os.getpid()}.json", RETIRED_SNAPSHOT})
+
+    def test_own_snapshot_at_exit(self):
+        own = {"counters": [["ratelimit_requests_total", [], 2]], "histograms": []}
+        retire(own=own)
+        retire(own=own)
+        retired = json.loads((self.dir / RETIRED_SNAPSHOT).read_text())
+        self.assertEqual(retired["counters"], [["ratelimit_requests_total", [], 4]])
+
+
+class MetricsViewTests(SimpleTestCase):
+    @override_settings(METRICS_TOKEN="")
+    def test_without_a_token_only_local_scrapes_are_served(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 200)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 403)
+        relayed = self.client.get("/metrics", REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.9")
+        self.assertEqual(relayed.status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 401)
+        ok = self.client.get("/metrics", REMOTE_ADDR="203.0.113.9", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(ok.status_code, 200)
@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from main.services import outbox
+
+
+class RunSenderTests(SimpleTestCase):
+    def _run(self, drain, stop: threading.Event, **kwargs) -> threading.Thread:
+        patches = [
+            mock.patch.object(outbox, "drain_once", side_effect=drain),
+            mock.patch.object(outbox, "close_old_connections"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        thread = threading.Thread(target=outbox.run_sender, args=(stop,), kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+
+    def test_kick_during_a_drain_is_not_lost(self):
+        stop, calls = threading.Event(), []
+
+        def drain():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                outbox._wakeup.set()  # a mail queued while the sender was busy
+            else:
+                stop.set()
+                outbox._wakeup.set()
+            return 0
+
+        started = time.monotonic()
+        self._run(drain, stop, idle_timeout=30).join(5)
+        self.assertEqual(len(calls), 2)
+        self.assertLess(calls[1] - started, 2)  # did not sleep through the 30 s poll
+
+    @override_settings(OUTBOX_SMTP_IDLE_SECONDS=60)
+    def test_smtp_session_outlives_a_short_idle(self):
+        stop, calls = threading.Event(), []
+
+        def drain():
+            calls.append(1)
+            if len(calls) == 3:
+                stop.set()
+            outbox._wakeup.set()
+            return 1 if len(calls) == 1 else 0
+
+        with mock.patch.object(outbox, "close_smtp") as close:
+            self._run(drain, stop, idle_timeout=30).join(5)
+        self.assertEqual(close.call_count, 1)  # only when the sender stops
+
+    @override_settings(OUTBOX_SMTP_IDLE_SECONDS=0)
+    def test_smtp_session_closes_once_idle(self):
+        stop, calls = threading.Event(), []
+
+        def drain():
+            calls.append(1)
+            if len(calls) == 2:
+                stop.set()
+            outbox._wakeup.set()
+            return 0
+
+        with mock.patch.object(outbox, "close_smtp") as close:
+            self._run(drain, stop, idle_timeout=30).join(5)
+        self.assertEqual(close.call_count, 3)  # after each idle drain, then on stop
@@ -0,0 +1,40 @@
+import os
+import tempfile
+from unittest import mock
+
+import fitz
+from django.template.loader import get_template
+from django.test import SimpleTestCase
+
+from main.services.report_pdf import render_report_pdf, report_template_for
+from main.views import _analyze_non_tech
+
+RESUME_TEXT = (
+    "Jane Doe\njane.doe@example.com | +1 555 123 4567\nSummary\nMarketing manager who grew revenue 20%.\n"
+    "Experience\nLed campaigns and managed a budget of $2M.\nEducation\nBA Marketing\nSkills\nSEO, CRM, analytics"
+)
+
+
+class ReportTemplateTests(SimpleTestCase):
+    def _non_tech_result(self) -> dict:
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), RESUME_TEXT)
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(doc.tobytes())
+        self.addCleanup(os.unlink, tmp.name)
+        return _analyze_non_tech(tmp.name, ".pdf", "report-template-test", "marketing")
+
+    def test_non_tech_result_renders_the_non_tech_template(self):
+        context = self._non_tech_result()
+        self.assertEqual(context["role"], "Marketing")
+        with mock.patch("main.services.report_pdf.get_template", wraps=get_template) as loader:
+            pdf = render_report_pdf(context, backend="xhtml2pdf")
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        loader.assert_called_with("score_of_non_tech.html")
+
+    def test_non_tech_without_a_role_or_with_github_keeps_its_template(self):
+        context = {**self._non_tech_result(), "role": "", "github_detection": "YES"}
+        self.assertEqual(report_template_for(context), "score_of_non_tech.html")
+
+    def test_technical_results_use_the_technical_template(self):
+        self.assertEqual(report_template_for({"kind": "technical", "role": "Software Engineer"}), "resume_result.html")
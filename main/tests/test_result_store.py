@@ -0,0 +1,47 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from main.models import AnalysisResult
+from main.services import result_store
+from main.services.result_store import load_result, purge_expired_results, save_result
+
+
+@override_settings(ANALYSIS_RESULT_RETENTION=7 * 24 * 60 * 60)
+class PurgeExpiredResultsTests(TestCase):
+    def _save(self, result_key: str, age_days: float) -> None:
+        save_result(result_key, "technical", {"score": 1})
+        AnalysisResult.objects.filter(result_key=result_key).update(
+            updated_at=timezone.now() - timedelta(days=age_days)
+        )
+
+    def test_only_results_past_retention_are_deleted(self):
+        self._save("a" * 64, age_days=8)
+        self._save("b" * 64, age_days=1)
+        self.assertEqual(purge_expired_results(), 1)
+        self.assertIsNone(load_result("a" * 64))
+        self.assertEqual(load_result("b" * 64), {"score": 1})
+
+    @override_settings(ANALYSIS_RESULT_RETENTION=0)
+    def test_retention_zero_keeps_everything(self):
+        self._save("a" * 64, age_days=400)
+        self.assertEqual(purge_expired_results(), 0)
+
+    def test_save_purges_at_most_once_per_interval(self):
+        self._save("a" * 64, age_days=8)
+        with mock.patch.object(result_store, "_last_purge", float("-inf")):
+            save_result("c" * 64, "technical", {})
+            self.assertFalse(AnalysisResult.objects.filter(result_key="a" * 64).exists())
+            self._save("d" * 64, age_days=8)
+            save_result("e" * 64, "technical", {})  # within PURGE_INTERVAL of the last purge
+            self.assertTrue(AnalysisResult.objects.filter(result_key="d" * 64).exists())
+
+    def test_command(self):
+        self._save("a" * 64, age_days=30)
+        out = StringIO()
+        call_command("purge_results", stdout=out)
+        self.assertIn("Purged 1", out.getvalue())
@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase
+
+from main.services.sections import is_reverse_chronological, segment
+
+RESUME = """Jane Doe
+PROFESSIONAL SUMMARY
+Marketer with eight years of experience.
+Work Experience
+Marketing Manager, Acme  Jan 2021 - Present
+Marketing Associate, Globex  Mar 2017 - Dec 2020
+EDUCATION & TRAINING
+BBA Marketing, State University
+Skills: SEO, Budgeting, CRM
+"""
+
+
+class SegmentTests(SimpleTestCase):
+    def test_sections_and_bodies(self):
+        sections = segment(RESUME)
+        self.assertTrue(sections.has("summary", "experience", "education", "skills"))
+        self.assertIn("Acme", sections.get("experience"))
+        self.assertNotIn("State University", sections.get("experience"))
+        self.assertEqual(sections.get("skills").strip(), "SEO, Budgeting, CRM")
+        self.assertEqual(sections.get("projects"), "")
+        self.assertNotIn("projects", sections)
+
+    def test_styled_lines_count_as_headings(self):
+        text = "Jane Doe\nExperience and Internships\nIntern, Acme\n"
+        self.assertNotIn("experience", segment(text))
+        self.assertIn("experience", segment(text, frozenset({"Experience and Internships"})))
+
+    def test_long_lines_are_not_headings(self):
+        self.assertNotIn("skills", segment("Skills I picked up while working on many different projects\n"))
+
+
+class ChronologyTests(SimpleTestCase):
+    def test_newest_first(self):
+        self.assertTrue(is_reverse_chronological("Jan 2021 - Present\nMar 2017 - Dec 2020"))
+
+    def test_oldest_first(self):
+        self.assertFalse(is_reverse_chronological("2015 - 2017\n2018 - 2021"))
+
+    def test_too_few_dates(self):
+        self.assertIsNone(is_reverse_chronological("2019 - 2021"))
+        self.assertIsNone(is_reverse_chronological(""))
@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from main.services.spelling import WordIndex, find_typos, inflections
+
+
+class WordIndexTests(SimpleTestCase):
+    def test_membership(self):
+        index = WordIndex(["manage", "budget", "zebra"])
+        self.assertEqual(len(index), 3)
+        for word in ("manage", "budget", "zebra"):
+            self.assertIn(word, index)
+        for word in ("managed", "budge", "", "zzz"):
+            self.assertNotIn(word, index)
+
+    def test_inflections(self):
+        self.assertTrue({"plans", "planned", "planning", "planner"} <= set(inflections("plan")))
+        self.assertTrue({"studies", "studied", "studying"} <= set(inflections("study")))
+        self.assertTrue({"manages", "managed", "managing", "manager"} <= set(inflections("manage")))
+
+
+class FindTyposTests(SimpleTestCase):
+    def test_one_edit_misspellings(self):
+        typos = dict(find_typos("Managed the recieve process and improved acurate reporting."))
+        self.assertEqual(typos.get("recieve"), "receive")
+        self.assertEqual(typos.get("acurate"), "accurate")
+
+    def test_real_resume_vocabulary_is_known(self):
+        text = (
+            "Opened a bakery with forty staff and prepped catering orders. Taught maths and built iOS apps.\n"
+            "Organised the colour programme, mentored analysts and spearheaded onboarding for stakeholders.\n"
+            "Reconciled invoices, streamlined payroll, liaised with vendors and troubleshot deployments."
+        )
+        self.assertEqual(find_typos(text), [])
+
+    def test_stack_jargon_is_known(self):
+        text = (
+            "Built streaming pipelines with flink, kafka and hbase; shipped logs with fluentd and logstash.\n"
+            "Deployed with kustomize, argocd and istio, traced with zipkin and alerted through splunk and nagios.\n"
+            "Scheduled jobs in oozie and dagster, queried trino, and built nextjs, nuxt and vuex frontends with vite.\n"
+            "Trained models with xgboost and seaborn plots, served onnx through streamlit, and built with gradle and conda."
+        )
+        self.assertEqual(find_typos(text), [])
+
+    def test_common_misspellings(self):
+        typos = dict(find_typos("Definately a seperate managment adress list."))
+        self.assertEqual(typos, {"Definately": "definitely", "seperate": "separate",
+                                 "managment": "management", "adress": "address"})
+
+    def test_names_acronyms_and_links_are_skipped(self):
+        text = "Worked with Kowalski on SQL and iPhone releases.\nSee github.com/janedoe or jane@example.com"
+        self.assertEqual(find_typos(text), [])
+
+    def test_limit(self):
+        self.assertEqual(len(find_typos("recieve acurate adress", limit=2)), 2)
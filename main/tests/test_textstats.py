@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+
+from main.services.textstats import syllable_count, text_stats
+
+
+class TextStatsTests(SimpleTestCase):
+    def test_counts(self):
+        text = "Led a team of 5 engineers. Grew revenue 20%!\n• Managed budgets\n\n  Reduced   costs"
+        stats = text_stats(text)
+        self.assertEqual(stats.tokens, len(text.split()))
+        self.assertEqual(stats.numbers, 1)
+        self.assertEqual(stats.percentages, 1)
+        self.assertEqual(stats.bullets, 1)
+        self.assertEqual(stats.lines, 3)
+        self.assertEqual(stats.sentences, 3)
+        self.assertTrue(stats.has_metrics)
+        self.assertGreaterEqual(stats.whitespace_runs, 2)
+        self.assertAlmostEqual(stats.bullet_density, 1 / 3)
+
+    def test_empty_text(self):
+        stats = text_stats("")
+        self.assertEqual(stats.words, 0)
+        self.assertEqual(stats.flesch_reading_ease, 0.0)
+        self.assertFalse(stats.has_metrics)
+        self.assertEqual(text_stats(None).tokens, 0)
+
+    def test_plain_prose_reads_easily(self):
+        self.assertGreater(text_stats("The cat sat on the mat. It was a good day.").flesch_reading_ease, 90)
+
+    def test_syllables(self):
+        for word, expected in {"cat": 1, "table": 2, "managed": 2, "makes": 1, "experience": 4, "created": 3}.items():
+            with self.subTest(word=word):
+                self.assertEqual(syllable_count(word), expected)
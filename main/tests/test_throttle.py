@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from main.services import throttle as throttle_module
+from main.services.throttle import check, client_ip, hit, throttle
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "throttle-tests"}}
+
+
+@override_settings(CACHES=LOCMEM, RATE_LIMIT_ENABLED=True, RATE_LIMIT_PROXY_COUNT=0)
+class ThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_hit_allows_up_to_the_limit(self):
+        results = [hit("ep", "ip", "1.2.3.4", 3, 60) for _ in range(4)]
+        self.assertEqual(results[:3], [None, None, None])
+        self.assertGreater(results[3], 0)
+        self.assertLessEqual(results[3], 60)
+
+    def test_identities_are_counted_separately(self):
+        for _ in range(3):
+            hit("ep", "ip", "1.1.1.1", 3, 60)
+        self.assertIsNone(hit("ep", "ip", "2.2.2.2", 3, 60))
+
+    @override_settings(RATE_LIMITS={"ep": [("email", 1, 60)]})
+    def test_email_scope(self):
+        first = self.factory.post("/", {"email": "A@x.io "})
+        second = self.factory.post("/", {"email": "a@x.io"})
+        self.assertIsNone(check(first, "ep"))
+        self.assertIsNotNone(check(second, "ep"))
+
+    @override_settings(RATE_LIMITS={"ep": [("user", 1, 60)]})
+    def test_user_scope_skips_anonymous_requests(self):
+        request = self.factory.post("/")
+        request.user = SimpleNamespace(pk=7, is_authenticated=True)
+        self.assertIsNone(check(request, "ep"))
+        self.assertIsNotNone(check(request, "ep"))
+        anonymous = self.factory.post("/")
+        anonymous.user = SimpleNamespace(pk=None, is_authenticated=False)
+        self.assertIsNone(check(anonymous, "ep"))
+        self.assertIsNone(check(anonymous, "ep"))
+
+    @override_settings(RATE_LIMITS={"ep": [("ip", 1, 60)]})
+    def test_decorator_answers_429(self):
+        view = throttle("ep", json=True)(lambda request: HttpResponse("ok"))
+        self.assertEqual(view(self.factory.post("/")).status_code, 200)
+        response = view(self.factory.post("/"))
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @override_settings(RATE_LIMITS={"ep": [("ip", 1, 60)]}, RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        request = self.factory.post("/")
+        self.assertIsNone(check(request, "ep"))
+        self.assertIsNone(check(request, "ep"))
+
+    def test_unconfigured_proxy_is_reported(self):
+        request = self.factory.get("/", HTTP_X_FORWARDED_FOR="203.0.113.9", REMOTE_ADDR="10.0.0.1")
+        with mock.patch.object(throttle_module, "_warned_unconfigured_proxy", False):
+            with self.assertLogs("main.services.throttle", level="ERROR") as logs:
+                self.assertEqual(client_ip(request), "10.0.0.1")
+                client_ip(request)  # reported once per process
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("RATE_LIMIT_PROXY_COUNT", logs.output[0])
+
+    @override_settings(RATE_LIMIT_PROXY_COUNT=1)
+    def test_client_ip_behind_a_proxy(self):
+        request = self.factory.get("/", HTTP_X_FORWARDED_FOR="203.0.113.9, 10.0.0.2", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(client_ip(request), "10.0.0.2")
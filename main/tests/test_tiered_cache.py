@@ -0,0 +1,81 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from main.services.tiered_cache import TieredCache
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.location = str(Path(self.tmp.name) / "cache.sqlite3")
+        self.cache = self._backend()
+
+    def _backend(self, **options):
+        options.setdefault("NAMESPACES", {"otp": {"timeout": 300, "front": False}, "short": {"timeout": 1}})
+        return TieredCache(self.location, {"OPTIONS": options})
+
+    def test_set_get_delete(self):
+        self.cache.set("extraction:a", {"text": "x"})
+        self.assertEqual(self.cache.get("extraction:a"), {"text": "x"})
+        self.assertTrue(self.cache.delete("extraction:a"))
+        self.assertIsNone(self.cache.get("extraction:a"))
+        self.assertEqual(self.cache.get("extraction:a", "fallback"), "fallback")
+
+    def test_front_then_shared_hits(self):
+        self.cache.set("profile_score:a", 1)
+        self.assertEqual(self.cache.get("profile_score:a"), 1)  # served from the in-process front
+        stale_front = self._backend(FRONT_TTL=0)  # same state, but front entries expire at once
+        stale_front.set("profile_score:b", 2)
+        self.assertEqual(stale_front.get("profile_score:b"), 2)
+        counters = self.cache.stats()["namespaces"]["profile_score"]
+        self.assertEqual((counters["front_hits"], counters["shared_hits"]), (1, 1))
+
+    def test_instances_share_front_and_stats(self):
+        # Django builds one backend instance per thread
+        self.cache.set("extraction:a", "text")
+        instances = []
+
+        def read():
+            backend = self._backend()
+            instances.append(backend)
+            backend.get("extraction:a")
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.stats()["namespaces"]["extraction"]["front_hits"], 4)
+        self.assertEqual(instances[0].stats(), self.cache.stats())
+
+    def test_namespace_without_front_always_reads_the_file(self):
+        self.cache.set("otp:login:a@b.c", "123456")
+        self._backend().set("otp:login:a@b.c", "654321")  # changed by another worker
+        self.assertEqual(self.cache.get("otp:login:a@b.c"), "654321")
+
+    def test_namespace_timeout(self):
+        self.cache.set("short:x", 1)
+        time.sleep(1.1)
+        self.assertIsNone(self.cache.get("short:x"))
+
+    def test_add_and_incr_are_shared(self):
+        self.assertTrue(self.cache.add("ratelimit:k", 0))
+        self.assertFalse(self._backend().add("ratelimit:k", 5))
+        self.assertEqual(self.cache.incr("ratelimit:k"), 1)
+        self.assertEqual(self._backend().incr("ratelimit:k", 2), 3)
+        with self.assertRaises(ValueError):
+            self.cache.incr("ratelimit:missing")
+
+    def test_front_size_is_bounded(self):
+        cache = self._backend(FRONT_SIZE=2)
+        for i in range(5):
+            cache.set(f"extraction:{i}", i)
+        stats = cache.stats()
+        self.assertEqual(stats["front_entries"], 2)
+        self.assertEqual(stats["namespaces"]["extraction"]["front_evictions"], 3)
+        self.assertEqual(cache.get("extraction:0"), 0)  # still in the shared file
@@ -1,14 +1,32 @@
-import re, io, base64, requests, os
-import docx2txt
-import fitz  # PyMuPDF
-from docx import Document
-import matplotlib.pyplot as plt
-from textstat import flesch_reading_ease
+import re, os
+
+from .services.entities import extract_entities
+from .services.metrics import stage_timer
+from .services.textstats import text_stats
+from .services.tiered_cache import memoize
+
+# Heavy dependencies (PyMuPDF, python-docx, requests, Gemini) are
+# imported inside the functions that need them so workers boot quickly.
 
 # Gemini API
-import google.generativeai as genai
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")  # put in .env
-genai.configure(api_key=GEMINI_API_KEY)
+_genai_configured = False
+
+
+def _genai():
+    """Import google.generativeai and configure it on first use."""
+    global _genai_configured
+    import google.generativeai as genai
+    if not _genai_configured:
+        from django.conf import settings
+        endpoint = getattr(settings, "GEMINI_API_ENDPOINT", "")
+        if endpoint:
+            # a non-default endpoint (e.g. the run_stubs server) is reached over REST
+            genai.configure(api_key=GEMINI_API_KEY, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=GEMINI_API_KEY)
+        _genai_configured = True
+    return genai
 
 
 # ----------------------------
@@ -16,8 +34,10 @@ genai.configure(api_key=GEMINI_API_KEY)
 # ----------------------------
 def extract_resume_text(file):
     if file.name.endswith(".docx"):
+        import docx2txt
         return docx2txt.process(file)
     elif file.name.endswith(".pdf"):
+        import fitz  # PyMuPDF
         text = ""
         with fitz.open(stream=file.read(), filetype="pdf") as doc:
             for page in doc:
@@ -30,6 +50,7 @@ def extract_resume_text(file):
 # Hyperlink Extraction
 # ----------------------------
 def extract_hyperlinks_docx(file_path):
+    from docx import Document
     doc = Document(file_path)
     links = []
     for rel in doc.part.rels.values():
@@ -38,6 +59,7 @@ def extract_hyperlinks_docx(file_path):
     return links
 
 def extract_hyperlinks_pdf(file):
+    import fitz  # PyMuPDF
     links = []
     with fitz.open(stream=file.read(), filetype="pdf") as doc:
         for page in doc:
@@ -46,38 +68,43 @@ def extract_hyperlinks_pdf(file):
                     links.append(link["uri"])
     return links
 
+def extract_links_combined(file_path):
+    """(hyperlinks, text) of a PDF from one PyMuPDF open: the link annotations and the page text."""
+    import fitz  # PyMuPDF
+    links, pages = [], []
+    with fitz.open(file_path) as doc:
+        for page in doc:
+            pages.append(page.get_text())
+            links.extend(link["uri"] for link in page.get_links() if link.get("uri"))
+    return links, "".join(pages)
+
 def extract_and_identify_links(text):
-    urls = re.findall(r"(https?://\S+)", text)
-    identified = {"linkedin": None, "github": None, "portfolio": []}
-    for url in urls:
-        if "linkedin" in url:
-            identified["linkedin"] = url
-        elif "github" in url:
-            identified["github"] = url
-        else:
-            identified["portfolio"].append(url)
-    return identified
+    return extract_entities(text).link_map()
 
 
 # ----------------------------
 # GitHub API Stats
 # ----------------------------
+@memoize("profile_score", should_cache=lambda stats: any(stats.values()))
 def fetch_github_stats(username):
     """Fetch GitHub stats using public API"""
+    import requests
     try:
-        url = f"https://api.github.com/users/{username}/repos"
-        r = requests.get(url, headers={"Accept": "application/vnd.github+json"})
+        from django.conf import settings
+        url = f"{settings.GITHUB_API_BASE}/users/{username}/repos"
+        with stage_timer("github", call="repos"):
+            r = requests.get(url, headers={"Accept": "application/vnd.github+json"}, timeout=20)
         if r.status_code != 200:
             return {"repos": 0, "stars": 0, "followers": 0}
 
         repos = r.json()
         stars = sum(repo.get("stargazers_count", 0) for repo in repos)
+        with stage_timer("github", call="user"):
+            followers = requests.get(f"{settings.GITHUB_API_BASE}/users/{username}", timeout=20).json().get("followers", 0)
         return {
             "repos": len(repos),
             "stars": stars,
-            "followers": requests.get(
-                f"https://api.github.com/users/{username}"
-            ).json().get("followers", 0),
+            "followers": followers,
         }
     except Exception:
         return {"repos": 0, "stars": 0, "followers": 0}
@@ -88,6 +115,8 @@ def fetch_github_stats(username):
 # ----------------------------
 def gemini_resume_analysis(text, role_title):
     """Ask Gemini to analyze the resume ATS-style"""
+    readability = text_stats(text).flesch_reading_ease
+
     prompt = f"""
     You are an ATS evaluator. Analyze this resume for the role of {role_title}.
     Provide scores (0-1) for:
@@ -102,8 +131,9 @@ def gemini_resume_analysis(text, role_title):
     """
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
+        model = _genai().GenerativeModel("gemini-pro")
+        with stage_timer("gemini", call="generate_content"):
+            response = model.generate_content(prompt)
         raw = response.text
 
         # Simple regex-based extraction
@@ -113,7 +143,7 @@ def gemini_resume_analysis(text, role_title):
             "skills_match": float(re.search(r"skills_match[:\- ]+([0-9\.]+)", raw).group(1)) if re.search(r"skills_match[:\- ]+([0-9\.]+)", raw) else 0.5,
             "education_match": float(re.search(r"education_match[:\- ]+([0-9\.]+)", raw).group(1)) if re.search(r"education_match[:\- ]+([0-9\.]+)", raw) else 0.5,
         }
-        scores["readability"] = flesch_reading_ease(text) if text else 0
+        scores["readability"] = readability
         return scores, raw
     except Exception as e:
         return {
@@ -121,10 +151,21 @@ def gemini_resume_analysis(text, role_title):
             "experience_match": 0.5,
             "skills_match": 0.5,
             "education_match": 0.5,
-            "readability": flesch_reading_ease(text) if text else 0,
+            "readability": readability,
         }, f"Error: {e}"
 
 
+# ----------------------------
+# Resume metrics
+# ----------------------------
+def derive_resume_metrics(text, role_title):
+    """The 0-1 metrics ats_resume_scoring weighs, from Gemini's read of the resume."""
+    metrics, _ = gemini_resume_analysis(text, role_title)
+    # Flesch reading ease is 0-100; the other metrics are 0-1
+    metrics["readability"] = max(0.0, min(100.0, metrics["readability"])) / 100
+    return metrics
+
+
 def ats_resume_scoring(metrics):
     weights = {
         "keyword_density": 0.25,
@@ -134,36 +175,60 @@ def ats_resume_scoring(metrics):
         "readability": 0.15
     }
     score = sum(metrics.get(k, 0) * w for k, w in weights.items())
-    return {"ats_score": round(score * 100, 2), "details": metrics}
+    items = [
+        {"name": k.replace("_", " ").capitalize(), "score": round(metrics.get(k, 0) * w * 100), "weight": round(w * 100)}
+        for k, w in weights.items()
+    ]
+    return {"ats_score": round(score * 100, 2), "details": metrics, "items": items}
+
+
+def get_grade_tag(pct):
+    if pct >= 85:
+        return "Excellent"
+    if pct >= 70:
+        return "Good"
+    if pct >= 50:
+        return "Average"
+    return "Poor"
 
 
 # ----------------------------
 # Dynamic ATS + Profiles
 # ----------------------------
-def calculate_dynamic_ats_score(text, role_title, github_username, links):
+def _section(score, sub_criteria=()):
+    return {"score": round(score), "grade": get_grade_tag(score), "sub_criteria": list(sub_criteria)}
+
+
+def calculate_dynamic_ats_score(text, role_title, github_username, links, ats_report=None):
     sections = {}
 
-    # Gemini ATS analysis
-    metrics, gemini_raw = gemini_resume_analysis(text, role_title)
-    ats_report = ats_resume_scoring(metrics)
-    sections["ATS Match"] = ats_report["ats_score"]
+    # Gemini ATS analysis, unless the caller has already scored it
+    if ats_report is None:
+        ats_report = ats_resume_scoring(derive_resume_metrics(text, role_title))
+    sections["Resume (ATS Score)"] = _section(ats_report["ats_score"], ats_report.get("items", ()))
 
     # LinkedIn
-    sections["LinkedIn"] = 90 if links.get("linkedin") else 40
+    sections["LinkedIn"] = _section(90 if links.get("linkedin") else 40)
 
     # GitHub
     if github_username:
         gh_stats = fetch_github_stats(github_username)
         gh_score = min(100, 40 + gh_stats["repos"] * 2 + gh_stats["stars"] * 0.5 + gh_stats["followers"])
-        sections["GitHub"] = gh_score
+        sections["GitHub Profile"] = _section(gh_score, [
+            {"name": "Public repositories", "score": gh_stats["repos"]},
+            {"name": "Stars", "score": gh_stats["stars"]},
+            {"name": "Followers", "score": gh_stats["followers"]},
+        ])
     else:
-        sections["GitHub"] = 30
+        sections["GitHub Profile"] = _section(30)
 
     # Portfolio
-    sections["Portfolio"] = 70 if links.get("portfolio") else 30
+    sections["Portfolio Website"] = _section(70 if links.get("portfolio") else 30)
 
-    # Final
-    overall_score = sum(sections.values()) / len(sections)
+    # Final: every section counts equally
+    for section in sections.values():
+        section["weight"] = round(100 / len(sections))
+    overall_score = sum(s["score"] for s in sections.values()) / len(sections)
     grade = "A+" if overall_score > 85 else "A" if overall_score > 70 else "B"
 
     return {
@@ -171,32 +236,35 @@ def calculate_dynamic_ats_score(text, role_title, github_username, links):
         "overall_score_average": round(overall_score, 2),
         "overall_grade": grade,
         "ats_report": ats_report,
-        "gemini_feedback": gemini_raw,
         "suggestions": suggest_improvements(sections),
     }
 
 
 def suggest_improvements(sections):
     suggestions = []
-    if sections.get("LinkedIn", 0) < 60:
+    if sections.get("LinkedIn", {}).get("score", 0) < 60:
         suggestions.append("Add a strong LinkedIn profile link.")
-    if sections.get("GitHub", 0) < 60:
+    if sections.get("GitHub Profile", {}).get("score", 0) < 60:
         suggestions.append("Include GitHub with active projects.")
-    if sections.get("Portfolio", 0) < 60:
+    if sections.get("Portfolio Website", {}).get("score", 0) < 60:
         suggestions.append("Showcase personal portfolio or website.")
     return suggestions
 
 
-# ----------------------------
-# Charts
-# ----------------------------
-def generate_pie_chart(sections):
-    labels = list(sections.keys())
-    sizes = list(sections.values())
-    fig, ax = plt.subplots()
-    ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
-    ax.axis("equal")
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
+def compute_profile_scores(user_ratings):
+    """0-10 ratings per profile category as percentages, plus their average as "Overall"."""
+    scores = {category: round(rating * 10) for category, rating in user_ratings.items()}
+    scores["Overall"] = round(sum(scores.values()) / len(scores)) if scores else 0
+    return scores
+
+
+def highlight_strengths_and_gaps(profile_scores):
+    """One line naming the strongest (70%+) and weakest (under 50%) profile categories."""
+    strengths = [c for c, s in profile_scores.items() if c != "Overall" and s >= 70]
+    gaps = [c for c, s in profile_scores.items() if c != "Overall" and s < 50]
+    parts = []
+    if strengths:
+        parts.append("Strengths: " + ", ".join(strengths) + ".")
+    if gaps:
+        parts.append("Gaps: " + ", ".join(gaps) + ".")
+    return " ".join(parts)
@@ -4,52 +4,64 @@ from __future__ import annotations
 
 import os
 import re
-import io
-import base64
 import random
 import tempfile
 import hashlib
+import ipaddress
 import json
+from datetime import datetime
+from pathlib import Path
 from typing import Dict
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.core.exceptions import TooManyFilesSent
 from django.shortcuts import render, redirect
-from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import quote_etag
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
-from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest
+from django.views.decorators.http import require_GET, require_POST
+from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest, Http404, FileResponse, StreamingHttpResponse
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.decorators import api_view, authentication_classes, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# HTTP for Microsoft Graph
-import requests
-
-# PDF export
-from xhtml2pdf import pisa
-
-# Matplotlib for pie charts
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+# requests (Microsoft Graph) and xhtml2pdf (PDF export) are imported where they are
+# used: both are slow to import and most requests never touch them.
 
 # Utils & scoring
 from .utils import (
-    extract_applicant_name,
-    extract_github_username,
-    extract_leetcode_username,
     calculate_dynamic_ats_score,
     derive_resume_metrics,
     ats_resume_scoring,
     extract_links_combined,
-    extract_text_from_docx,
     compute_profile_scores,
+    get_grade_tag,
     highlight_strengths_and_gaps,
 )
+from .calculate_ats_score import extract_text_from_docx
 
-from .ats_score_non_tech import ats_scoring_non_tech_v2
+from .ats_score_non_tech import ats_scoring_non_tech_v2, read_resume
+from .services.batch import BatchError, ItemError, collect_items, stream_results
 from .services.certifications import suggest_role_certifications
+from .services.entities import extract_entities
+from .services.chart_cache import (
+    register_report_chart, report_chart_bytes, report_chart_spec, report_chart_version,
+)
+from .services.report_pdf import ReportRenderError, get_or_render_pdf, prerender_report_pdf
+from .services.outbox import enqueue_email
+from .services.result_store import find_fresh_result, load_result, save_result
+from .services.metrics import render_prometheus, stage_timer
+from .services.profiling import PROFILE_HEADER, PROFILE_NAME_RE, list_profiles, profile_dir, profile_token
+from .services.throttle import throttle
 from .forms import PaymentDetailsForm
 
 # ========= In-memory OTP / user stores =========
@@ -62,72 +74,34 @@ def norm_email(email: str) -> str:
 def norm_mobile(mobile: str) -> str:
     return re.sub(r"\D+", "", (mobile or "").strip())
 
-# ========= Microsoft Graph helpers =========
-_graph_token_cache: dict[str, dict] = {}
-
-def _graph_get_token() -> str:
-    cache_key = "token"
-    tok = _graph_token_cache.get(cache_key)
-    if tok and tok.get("expires_at", 0) > (requests.utils.datetime.datetime.utcnow().timestamp() + 60):
-        return tok["access_token"]
-
-    tenant = settings.MS_GRAPH_TENANT_ID
-    client_id = settings.MS_GRAPH_CLIENT_ID
-    client_secret = settings.MS_GRAPH_CLIENT_SECRET
-    token_url = f"https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token"
-
-    data = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "scope": "https://graph.microsoft.com/.default",
-        "grant_type": "client_credentials",
-    }
-    resp = requests.post(token_url, data=data, timeout=20)
-    resp.raise_for_status()
-    payload = resp.json()
-    access_token = payload["access_token"]
-    expires_in = int(payload.get("expires_in", 3600))
-    _graph_token_cache[cache_key] = {
-        "access_token": access_token,
-        "expires_at": requests.utils.datetime.datetime.utcnow().timestamp() + expires_in,
-    }
-    return access_token
-
-def _graph_send_mail(to_email: str, subject: str, body_text: str) -> None:
-    access_token = _graph_get_token()
-    sender = settings.MS_GRAPH_SENDER_EMAIL
-    url = f"https://graph.microsoft.com/v1.0/users/{sender}/sendMail"
-    payload = {
-        "message": {
-            "subject": subject,
-            "body": {"contentType": "Text", "content": body_text},
-            "toRecipients": [{"emailAddress": {"address": to_email}}],
-            "from": {"emailAddress": {"address": sender}}
-        },
-        "saveToSentItems": "true"
-    }
-    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
-    r = requests.post(url, headers=headers, json=payload, timeout=20)
-    if r.status_code >= 400:
-        try:
-            err = r.json()
-        except Exception:
-            err = {"error": {"message": r.text}}
-        raise RuntimeError(f"Graph sendMail failed ({r.status_code}): {err}")
-
 # ========= Email dispatcher =========
+# Mail goes through the outbox (main/services/outbox.py): the request only
+# writes a row, and the sender delivers it over Graph or a pooled SMTP connection.
 def send_otp_email(to_email: str, otp: str, subject: str):
     body = f"Your OTP is {otp}. It will expire in {OTP_TTL_SECONDS // 60} minutes."
-    if getattr(settings, "MS_GRAPH_ENABLED", False):
-        _graph_send_mail(to_email, subject, body)
-    else:
-        send_mail(
-            subject=subject,
-            message=body,
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", settings.EMAIL_HOST_USER),
-            recipient_list=[to_email],
-            fail_silently=False,
-        )
+    enqueue_email(to_email, subject, body, expires_in=OTP_TTL_SECONDS)
+
+# ========= Analysis results =========
+# Report contexts live in AnalysisResult; the session only keeps their keys.
+SESSION_TECH_RESULT = "resume_result_tech"
+SESSION_NON_TECH_RESULT = "resume_result"
+SESSION_LAST_RESULT = "resume_result_last"
+
+def _remember_result(request, session_key: str, result_key: str) -> None:
+    request.session[session_key] = result_key
+    request.session[SESSION_LAST_RESULT] = result_key
+
+def show_report_technical(request):
+    context = load_result(request.session.get(SESSION_TECH_RESULT))
+    if context is None:
+        return redirect("upload_resume")
+    return render(request, "resume_result.html", context)
+
+def show_report_nontechnical(request):
+    context = load_result(request.session.get(SESSION_NON_TECH_RESULT))
+    if context is None:
+        return redirect("upload_resume")
+    return render(request, "score_of_non_tech.html", context)
 
 # ========= Basic pages =========
 def landing(request): return render(request, "landing.html")
@@ -135,12 +109,15 @@ def signin(request): return render(request, "login.html")
 def login_view(request): return render(request, "login.html")
 def signup(request): return render(request, "login.html")
 def about_us(request): return render(request, "about_us.html")
+def why(request): return render(request, "why.html")
+def who(request): return render(request, "who.html")
 def upload_resume(request): return render(request, "upload_resume.html")
 def profile_building(request): return render(request, "subscription_plans.html")
 def payment_submission_success(request): return render(request, "payment_submission_success.html")
 
 # ========= OTP SIGNUP / LOGIN =========
 @csrf_exempt
+@throttle("send_signup_otp", json=True)
 def send_signup_otp(request):
     if request.method != "POST":
         return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
@@ -150,8 +127,7 @@ def send_signup_otp(request):
         return JsonResponse({"status": "error", "message": "Email and mobile required"}, status=400)
 
     otp = f"{random.randint(100000, 999999)}"
-    cache_key = f"signup_otp:{email}:{mobile}"
-    from django.core.cache import cache
+    cache_key = f"otp:signup:{email}:{mobile}"
     cache.set(cache_key, otp, timeout=OTP_TTL_SECONDS)
 
     try:
@@ -167,8 +143,7 @@ def verify_signup_otp(request):
     email = norm_email(request.POST.get("email", ""))
     mobile = norm_mobile(request.POST.get("mobile", ""))
     otp = (request.POST.get("otp", "") or "").strip()
-    from django.core.cache import cache
-    cache_key = f"signup_otp:{email}:{mobile}"
+    cache_key = f"otp:signup:{email}:{mobile}"
     stored_otp = cache.get(cache_key)
     if stored_otp and stored_otp == otp:
         registered_users[mobile] = email
@@ -178,6 +153,7 @@ def verify_signup_otp(request):
         return JsonResponse({"status": "error", "message": "Invalid or expired OTP"}, status=400)
 
 @csrf_exempt
+@throttle("send_login_otp", json=True)
 def send_login_otp(request):
     if request.method != "POST":
         return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
@@ -186,8 +162,7 @@ def send_login_otp(request):
         return JsonResponse({"status": "error", "message": "Email required"}, status=400)
 
     otp = f"{random.randint(100000, 999999)}"
-    from django.core.cache import cache
-    cache_key = f"login_otp:{email}"
+    cache_key = f"otp:login:{email}"
     cache.set(cache_key, otp, timeout=OTP_TTL_SECONDS)
 
     try:
@@ -202,8 +177,7 @@ def verify_login_otp(request):
         return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
     email = norm_email(request.POST.get("email", ""))
     otp = (request.POST.get("otp", "") or "").strip()
-    from django.core.cache import cache
-    cache_key = f"login_otp:{email}"
+    cache_key = f"otp:login:{email}"
     stored_otp = cache.get(cache_key)
     if stored_otp and stored_otp == otp:
         cache.delete(cache_key)
@@ -212,47 +186,137 @@ def verify_login_otp(request):
         return JsonResponse({"status": "error", "message": "Invalid or expired OTP"}, status=400)
 
 # ========= PDF Download =========
-def download_resume_pdf(request):
-    context = request.session.get("resume_context", {})
-    template_path = "resume_result.html"
-    if context and context.get("github_detection") == "NO" and context.get("role") in ["Human Resources", "Marketing", "Sales", "Finance", "Customer Service"]:
-        template_path = "score_of_non_tech.html"
-    template = get_template(template_path)
-    html = template.render(context)
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="resume_report.pdf"'
-    pisa_status = pisa.CreatePDF(html, dest=response)
-    if pisa_status.err:
-        return HttpResponse("We had some errors <pre>" + html + "</pre>")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def _ranged_file_response(request, path: Path, filename: str, content_type: str):
+    """FileResponse with single-range (206) support so interrupted downloads can resume."""
+    size = path.stat().st_size
+    etag = quote_etag(path.stem)
+    match = _RANGE_RE.match(request.headers.get("Range", "").strip())
+    if_range = request.headers.get("If-Range")
+    if match and any(match.groups()) and (not if_range or if_range == etag):
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) if last else size - 1, size - 1)
+        else:
+            start, end = max(0, size - int(last)), size - 1
+        if start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            data = fh.read(end - start + 1)
+        response = HttpResponse(data, status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    else:
+        response = FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type=content_type)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
     return response
 
+def download_resume_pdf(request):
+    context = load_result(request.session.get(SESSION_LAST_RESULT)) or {}
+    try:
+        pdf = get_or_render_pdf(context)
+    except ReportRenderError as e:
+        return HttpResponse("We had some errors <pre>" + e.html + "</pre>")
+    if isinstance(pdf, bytes):
+        response = HttpResponse(pdf, content_type="application/pdf")
+        response["Content-Disposition"] = 'attachment; filename="resume_report.pdf"'
+        return response
+    return _ranged_file_response(request, pdf, "resume_report.pdf", "application/pdf")
+
 # ========= Pie Chart helper =========
-def generate_pie_chart_tech(sections: Dict) -> str | None:
+def _chart_series(sections: Dict) -> tuple[list, list]:
     labels, sizes = [], []
     for label, data in (sections or {}).items():
         score = data.get("score", 0)
         if isinstance(score, (int, float)) and score == score:
             labels.append(label)
             sizes.append(float(score))
+    return labels, sizes
+
+def register_chart_url(result_key: str, sections: Dict) -> str | None:
+    """Register the report's chart and return its cacheable, score-versioned URL (None when there is nothing to plot)."""
+    labels, sizes = _chart_series(sections)
     if not sizes or sum(sizes) == 0:
         return None
-    fig, ax = plt.subplots(figsize=(8, 8), facecolor="#121212")
-    wedges = ax.pie(sizes, labels=None)[0]
-    ax.legend(
-        wedges, labels, loc="lower center", bbox_to_anchor=(0.5, -0.15),
-        fontsize=18, frameon=False, labelcolor="white", ncol=2,
-        title="Categories", title_fontsize=13
-    )
-    ax.set_facecolor("#121212")
-    plt.axis("equal")
-    plt.tight_layout()
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", facecolor="#121212")
-    buf.seek(0)
-    encoded = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-    plt.close(fig)
-    return encoded
+    spec = register_report_chart(result_key, labels, sizes, theme="dark")
+    url = reverse("report_chart", kwargs={"result_key": result_key, "fmt": "svg"})
+    return f"{url}?v={report_chart_version(spec)}"
+
+# ========= Report assets =========
+CHART_CONTENT_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+CHART_MAX_AGE = 60 * 60 * 24 * 365  # only for URLs whose ?v= matches the chart's current scores
+
+@require_GET
+def report_chart(request, result_key: str, fmt: str):
+    spec = report_chart_spec(result_key)
+    if spec is None:
+        # chart spec not cached on this host (e.g. cleared); rebuild it from the stored result
+        context = load_result(result_key)
+        if context is None or not register_chart_url(result_key, context.get("score_breakdown") or {}):
+            raise Http404("Chart not found")
+        spec = report_chart_spec(result_key)
+    data = report_chart_bytes(result_key, fmt)
+    response = HttpResponse(data, content_type=CHART_CONTENT_TYPES[fmt])
+    response["ETag"] = quote_etag(hashlib.sha256(data).hexdigest())
+    if request.GET.get("v") == report_chart_version(spec):
+        patch_cache_control(response, public=True, max_age=CHART_MAX_AGE, immutable=True)
+    else:
+        # a result key is re-scored with fresh GitHub/LeetCode data, so unversioned URLs revalidate
+        patch_cache_control(response, public=True, no_cache=True)
+    return get_conditional_response(request, etag=response["ETag"], response=response)
+
+# ========= Metrics =========
+def _is_local_request(request) -> bool:
+    """A loopback peer with no X-Forwarded-For, i.e. not relayed by a proxy from outside."""
+    if request.META.get("HTTP_X_FORWARDED_FOR"):
+        return False
+    try:
+        return ipaddress.ip_address(request.META.get("REMOTE_ADDR", "")).is_loopback
+    except ValueError:
+        return False
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus text exposition merged across all workers (see main/services/metrics.py).
+    Needs the METRICS_TOKEN bearer token; without one configured, only local scrapes are served.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    if not token and not _is_local_request(request):
+        return HttpResponse("Forbidden: set METRICS_TOKEN to scrape remotely", status=403, content_type="text/plain")
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ========= Profiles (staff only) =========
+@staff_member_required
+def profile_list(request):
+    profiles = []
+    for path in sorted(list_profiles(), key=lambda p: p.stat().st_mtime, reverse=True):
+        stat = path.stat()
+        profiles.append({
+            "name": path.name,
+            "size_kb": round(stat.st_size / 1024, 1),
+            "modified": datetime.fromtimestamp(stat.st_mtime),
+        })
+    return render(request, "profiles.html", {
+        "profiles": profiles,
+        "profile_header": PROFILE_HEADER,
+        "profile_token": profile_token(),
+        "sample_rate": getattr(settings, "PROFILE_SAMPLE_RATE", 0.0),
+    })
+
+@staff_member_required
+def profile_download(request, name: str):
+    path = profile_dir() / name
+    if not PROFILE_NAME_RE.match(name) or not path.is_file():
+        raise Http404("Profile not found")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=name, content_type="application/octet-stream")
 
 # ========= Result key helper =========
 def _make_result_key(role_type: str, role_slug: str, resume_text: str, github_username: str = "", leetcode_username: str = "") -> str:
@@ -265,8 +329,54 @@ def _make_result_key(role_type: str, role_slug: str, resume_text: str, github_us
     }, sort_keys=True)
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
+def _upload_digest(uploaded_file) -> str:
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def _extract_resume(temp_path: str, ext: str, file_digest: str) -> tuple[list, str] | None:
+    """(links, text) of an uploaded resume, or None for unsupported formats; cached per file for all workers."""
+    if ext not in (".pdf", ".docx"):
+        return None
+    cache_key = f"extraction:{file_digest}"
+    extracted = cache.get(cache_key)
+    if extracted is None:
+        if ext == ".pdf":
+            with stage_timer("extract_pdf"):
+                extracted = tuple(extract_links_combined(temp_path))
+        else:
+            with stage_timer("extract_docx"):
+                extracted = ([], extract_text_from_docx(temp_path))
+        cache.set(cache_key, extracted)
+    return extracted
+
+def _read_resume(temp_path: str, ext: str, file_digest: str) -> tuple | None:
+    """read_resume() of an uploaded resume (text, heading lines, layout, links), or None for unsupported formats; cached per file for all workers."""
+    if ext not in (".pdf", ".docx"):
+        return None
+    cache_key = f"resume:{file_digest}"
+    resume = cache.get(cache_key)
+    if resume is None:
+        with stage_timer("extract_pdf" if ext == ".pdf" else "extract_docx"):
+            resume = read_resume(temp_path)
+        cache.set(cache_key, resume)
+    return resume
+
+def _make_upload_key(role_type: str, role_slug: str, file_digest: str, github_username: str = "", leetcode_username: str = "") -> str:
+    """Like _make_result_key, but from the uploaded bytes so a resubmission is recognised before extraction."""
+    payload = json.dumps({
+        "role_type": role_type,
+        "role_slug": role_slug,
+        "file_hash": file_digest,
+        "github": github_username or "",
+        "leetcode": leetcode_username or "",
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 # ========= Technical resume analysis =========
 @require_POST
+@throttle("analyze_resume")
 def analyze_resume(request):
     if request.POST.get("domain") != "technical":
         return HttpResponseBadRequest("Please choose Technical category.")
@@ -275,6 +385,17 @@ def analyze_resume(request):
 
     resume_file = request.FILES["resume"]
     ext = os.path.splitext(resume_file.name)[1].lower()
+    role_slug = request.POST.get("tech_role", "software_engineer")
+    posted_github = request.POST.get("github_username", "").strip()
+    posted_leetcode = request.POST.get("leetcode_username", "").strip()
+
+    # Same file, role and usernames as a recent analysis: reuse it without any extraction or scoring
+    file_digest = _upload_digest(resume_file)
+    upload_key = _make_upload_key("technical", role_slug, file_digest, posted_github, posted_leetcode)
+    previous = find_fresh_result(upload_key)
+    if previous:
+        _remember_result(request, SESSION_TECH_RESULT, previous[0])
+        return redirect("show_report_technical")
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
         for chunk in resume_file.chunks():
@@ -282,19 +403,15 @@ def analyze_resume(request):
         temp_path = tmp.name
 
     try:
-        if ext == ".pdf":
-            extracted_links, resume_text = extract_links_combined(temp_path)
-        elif ext == ".docx":
-            resume_text = extract_text_from_docx(temp_path)
-            extracted_links = []
-        else:
-            os.unlink(temp_path)
+        extracted = _extract_resume(temp_path, ext, file_digest)
+        if extracted is None:
             return HttpResponseBadRequest("Unsupported file format.")
+        extracted_links, resume_text = extracted
+        entities = extract_entities(resume_text, extracted_links)
 
-        applicant_name = extract_applicant_name(resume_text) or "Candidate"
-        github_username = request.POST.get("github_username", "").strip() or extract_github_username(resume_text) or ""
-        leetcode_username = request.POST.get("leetcode_username", "").strip() or extract_leetcode_username(resume_text) or ""
-        role_slug = request.POST.get("tech_role", "software_engineer")
+        applicant_name = entities.applicant_name or "Candidate"
+        github_username = posted_github or entities.github_username
+        leetcode_username = posted_leetcode or entities.leetcode_username
         TECH_ROLE_MAP = {
             "software_engineer": "Software Engineer",
             "data_scientist": "Data Scientist",
@@ -304,31 +421,24 @@ def analyze_resume(request):
         }
         role_title = TECH_ROLE_MAP.get(role_slug, "Software Engineer")
 
-        metrics = derive_resume_metrics(resume_text, role_title)
+        with stage_timer("derive_resume_metrics"):
+            metrics = derive_resume_metrics(resume_text, role_title)
         ats_resume_score_dict = ats_resume_scoring(metrics)
-        raw_100 = ats_resume_score_dict.get("score_100") or round(
-            (ats_resume_score_dict.get("subtotal", {}).get("earned", 0) /
-             ats_resume_score_dict.get("subtotal", {}).get("max", 15)) * 100
-        )
-        ats_resume_score = max(0, min(89, int(raw_100)))
+        ats_resume_score = max(0, min(89, int(ats_resume_score_dict["ats_score"])))
 
-        ats_result = calculate_dynamic_ats_score(resume_text, github_username, leetcode_username, extracted_links)
+        ats_result = calculate_dynamic_ats_score(
+            resume_text, role_title, github_username, entities.link_map(), ats_report=ats_resume_score_dict,
+        )
         sections = ats_result.get("sections", {})
-        original_ats_section = sections.get("Resume (ATS Score)", {})
-
-        sections["Resume (ATS Score)"] = {
-            "score": ats_resume_score,
-            "grade": original_ats_section.get("grade", ""),
-            "sub_criteria": original_ats_section.get("sub_criteria", ats_resume_score_dict.get("items", []))
-        }
+        sections["Resume (ATS Score)"].update(score=ats_resume_score, grade=get_grade_tag(ats_resume_score))
 
         # ===== Profile Category Ratings =====
         user_ratings = {
             "GitHub": 8 if github_username else 3,
-            "LinkedIn": 8 if "linkedin.com" in resume_text.lower() else 4,
-            "Portfolio": 7 if any("http" in link and "github" not in link and "linkedin" not in link for link in extracted_links) else 2,
+            "LinkedIn": 8 if entities.has_linkedin else 4,
+            "Portfolio": 7 if entities.portfolio_urls else 2,
             "Resume": round(ats_resume_score / 10, 1),
-            "Certifications": 6 if "certification" in resume_text.lower() or "certificate" in resume_text.lower() else 2,
+            "Certifications": 6 if entities.has_certification else 2,
         }
 
         profile_scores = compute_profile_scores(user_ratings)
@@ -343,23 +453,25 @@ def analyze_resume(request):
             if k not in desired_order:
                 score_breakdown_ordered.append((k, v))
 
-        pie_chart_image = generate_pie_chart_tech(sections)
+        result_key = _make_result_key("technical", role_slug, resume_text, github_username, leetcode_username)
+        chart_url = register_chart_url(result_key, sections)
         overall_score_average = int(ats_result.get("overall_score_average", 0))
         suggestions = (ats_result.get("suggestions") or [])[:2]
         recommended_certs = suggest_role_certifications(role_title)
 
         context = {
-            "result_key": _make_result_key("technical", role_slug, resume_text, github_username, leetcode_username),
+            "kind": "technical",
+            "result_key": result_key,
             "applicant_name": applicant_name,
-            "contact_detection": "YES" if any(s in resume_text.lower() for s in ["@", "phone", "email"]) else "NO",
-            "linkedin_detection": "YES" if "linkedin.com" in resume_text.lower() else "NO",
-            "github_detection": "YES" if ("github.com" in resume_text.lower() or github_username) else "NO",
+            "contact_detection": "YES" if entities.has_contact else "NO",
+            "linkedin_detection": "YES" if entities.has_linkedin else "NO",
+            "github_detection": "YES" if (entities.has_github or github_username) else "NO",
             "ats_score": ats_resume_score,
             "overall_score_average": overall_score_average,
             "overall_grade": ats_result.get("overall_grade", ""),
             "score_breakdown": sections,
             "score_breakdown_ordered": score_breakdown_ordered,
-            "pie_chart_image": pie_chart_image,
+            "chart_url": chart_url,
             "missing_certifications": recommended_certs,
             "suggestions": suggestions,
             "role": role_title,
@@ -368,19 +480,80 @@ def analyze_resume(request):
             "profile_strengths_gaps": strengths_gaps,
         }
 
-        request.session["resume_context_tech"] = context
-        request.session.modified = True
+        save_result(result_key, "technical", context, upload_key=upload_key)
+        prerender_report_pdf(context)
+        _remember_result(request, SESSION_TECH_RESULT, result_key)
         return redirect("show_report_technical")
 
     finally:
         os.unlink(temp_path)
 
 # ========= Non-technical resume analysis =========
+NON_TECH_ROLE_MAP = {  # upload_resume.html's nontech_role options
+    "hr": "Human Resources",
+    "marketing": "Marketing",
+    "sales": "Sales",
+    "finance": "Finance",
+    "customer_service": "Customer Service",
+}
+
+def _analyze_non_tech(temp_path: str, ext: str, file_digest: str, role_slug: str) -> dict | None:
+    """Result fields for a non-technical resume saved at ``temp_path``; None for unsupported formats."""
+    # the scorer needs the heading lines and page layout too, so read the file once the way it does
+    resume = _read_resume(temp_path, ext, file_digest)
+    if resume is None:
+        return None
+    resume_text, _, _, extracted_links = resume
+    entities = extract_entities(resume_text, extracted_links)
+
+    contact_detection = "YES" if entities.has_contact else "NO"
+    github_detection = "YES" if entities.has_github else "NO"
+    linkedin_detection = "YES" if entities.has_linkedin else "NO"
+    applicant_name = entities.applicant_name or "N/A"
+
+    with stage_timer("ats_scoring_non_tech"):
+        ats_result = ats_scoring_non_tech_v2(temp_path, resume=resume, entities=entities)
+
+    # ===== Profile Ratings =====
+    user_ratings = {
+        "GitHub": 8 if github_detection == "YES" else 3,
+        "LinkedIn": 8 if linkedin_detection == "YES" else 4,
+        "Portfolio": 7 if entities.portfolio_urls else 2,
+        "Resume": round((ats_result.get("ats_score", 0) or 0)/10,1),
+        "Certifications": 6 if entities.has_certification else 2,
+    }
+    profile_scores = compute_profile_scores(user_ratings)
+    strengths_gaps = highlight_strengths_and_gaps(profile_scores)
+
+    result_key = _make_result_key("non_technical", role_slug, resume_text)
+    chart_url = register_chart_url(result_key, ats_result.get("score_breakdown") or {})
+
+    return {
+        "kind": "non_technical",
+        "role": NON_TECH_ROLE_MAP.get(role_slug, ""),
+        "applicant_name": applicant_name,
+        "ats_score": ats_result.get("ats_score", 0),
+        "overall_score_average": ats_result.get("overall_score_average", 0),
+        "overall_grade": get_grade_tag(ats_result.get("overall_score_average", 0)),
+        "score_breakdown": ats_result.get("score_breakdown", {}),
+        "suggestions": ats_result.get("suggestions", []),
+        "result_key": result_key,
+        "chart_url": chart_url,
+        "contact_detection": contact_detection,
+        "github_detection": github_detection,
+        "linkedin_detection": linkedin_detection,
+        "profile_user_ratings": user_ratings,
+        "profile_scores": profile_scores,
+        "profile_strengths_gaps": strengths_gaps,
+    }
+
+
 @require_POST
+@throttle("analyze_resume_v2")
 def analyze_resume_v2(request):
     context = {
         "applicant_name": "N/A", "ats_score": 0, "overall_score_average": 0, "overall_grade": "N/A",
-        "score_breakdown": {}, "suggestions": [], "pie_chart_image": None, "detected_links": [], "error": None,
+        "score_breakdown": {}, "suggestions": [], "result_key": None, "chart_url": None, "detected_links": [], "error": None,
         "contact_detection": "NO", "github_detection": "NO", "linkedin_detection": "NO",
         "profile_user_ratings": {},
         "profile_scores": {},
@@ -390,6 +563,14 @@ def analyze_resume_v2(request):
     if request.method == 'POST' and request.FILES.get('resume'):
         resume_file = request.FILES['resume']
         ext = os.path.splitext(resume_file.name)[1].lower()
+        role_slug = request.POST.get("nontech_role", "")
+
+        file_digest = _upload_digest(resume_file)
+        upload_key = _make_upload_key("non_technical", role_slug, file_digest)
+        previous = find_fresh_result(upload_key)
+        if previous:
+            _remember_result(request, SESSION_NON_TECH_RESULT, previous[0])
+            return render(request, 'score_of_non_tech.html', previous[1])
 
         with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
             for chunk in resume_file.chunks():
@@ -397,55 +578,80 @@ def analyze_resume_v2(request):
             temp_path = tmp.name
 
         try:
-            if ext == ".pdf":
-                extracted_links, resume_text = extract_links_combined(temp_path)
-            elif ext == ".docx":
-                resume_text = extract_text_from_docx(temp_path)
-                extracted_links = []
-            else:
+            analysis = _analyze_non_tech(temp_path, ext, file_digest, role_slug)
+            if analysis is None:
                 context["error"] = "Unsupported file format."
                 return render(request, 'score_of_non_tech.html', context)
-
-            text_lower = resume_text.lower()
-            contact_detection = "YES" if any(x in text_lower for x in ["@", "phone", "email"]) else "NO"
-            github_detection = "YES" if ("github.com" in text_lower or any("github.com" in link for link in extracted_links)) else "NO"
-            linkedin_detection = "YES" if ("linkedin.com" in text_lower or any("linkedin.com" in link for link in extracted_links)) else "NO"
-            applicant_name = extract_applicant_name(resume_text) or "N/A"
-
-            ats_result = ats_scoring_non_tech_v2(temp_path)
-
-            # ===== Profile Ratings =====
-            user_ratings = {
-                "GitHub": 8 if github_detection == "YES" else 3,
-                "LinkedIn": 8 if linkedin_detection == "YES" else 4,
-                "Portfolio": 7 if any("http" in link and "github" not in link and "linkedin" not in link for link in extracted_links) else 2,
-                "Resume": round((ats_result.get("score", 0) or 0)/10,1),
-                "Certifications": 6 if "certification" in text_lower or "certificate" in text_lower else 2,
-            }
-            profile_scores = compute_profile_scores(user_ratings)
-            strengths_gaps = highlight_strengths_and_gaps(profile_scores)
-
-            pie_chart_image = generate_pie_chart_tech(ats_result.get("sections") or {})
-
-            context.update({
-                "applicant_name": applicant_name,
-                "ats_score": ats_result.get("score", 0),
-                "overall_score_average": ats_result.get("overall_score_average", 0),
-                "overall_grade": ats_result.get("overall_grade", ""),
-                "score_breakdown": ats_result.get("sections", {}),
-                "suggestions": ats_result.get("suggestions", []),
-                "pie_chart_image": pie_chart_image,
-                "contact_detection": contact_detection,
-                "github_detection": github_detection,
-                "linkedin_detection": linkedin_detection,
-                "profile_user_ratings": user_ratings,
-                "profile_scores": profile_scores,
-                "profile_strengths_gaps": strengths_gaps,
-            })
+            context.update(analysis)
 
         finally:
             os.unlink(temp_path)
 
-    request.session["resume_context"] = context
-    request.session.modified = True
+    if context["result_key"]:
+        save_result(context["result_key"], "non_technical", context, upload_key=upload_key)
+        prerender_report_pdf(context)
+        _remember_result(request, SESSION_NON_TECH_RESULT, context["result_key"])
     return render(request, 'score_of_non_tech.html', context)
+
+
+# ========= Batch analysis API =========
+NON_TECH_ROLE_SLUGS = tuple(NON_TECH_ROLE_MAP)
+
+BATCH_RESULT_FIELDS = (
+    "result_key", "applicant_name", "ats_score", "overall_score_average", "overall_grade",
+    "score_breakdown", "suggestions", "chart_url", "contact_detection", "github_detection",
+    "linkedin_detection", "profile_scores",
+)
+
+
+def _batch_analyzer(role_slug: str):
+    """analyze(path, ext, sha256) for stream_results: analyze_resume_v2's scoring, stored and reused the same way."""
+    def analyze(temp_path: str, ext: str, file_digest: str) -> dict:
+        upload_key = _make_upload_key("non_technical", role_slug, file_digest)
+        previous = find_fresh_result(upload_key)
+        if previous:
+            context = previous[1]
+        else:
+            context = _analyze_non_tech(temp_path, ext, file_digest, role_slug)
+            if context is None:
+                raise ItemError("Unsupported file format.")
+            save_result(context["result_key"], "non_technical", context, upload_key=upload_key)
+        return {"cached": bool(previous), **{field: context.get(field) for field in BATCH_RESULT_FIELDS}}
+    return analyze
+
+
+@api_view(["POST"])
+@authentication_classes([TokenAuthentication, SessionAuthentication])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+@throttle("analyze_batch", json=True)
+def analyze_batch(request):
+    """
+    Score many non-technical resumes for one role: multipart ``role`` (one of
+    NON_TECH_ROLE_SLUGS) plus any number of ``resumes`` (PDF/DOCX files or ZIP archives of them). Answers
+    application/x-ndjson, one line per resume as it finishes, then a summary line.
+    """
+    too_many = f"A batch may hold at most {settings.BATCH_MAX_FILES} resumes."
+    try:
+        role_slug = (request.data.get("role") or "").strip()
+        files = request.FILES.getlist("resumes")
+    except TooManyFilesSent:  # more multipart files than DATA_UPLOAD_MAX_NUMBER_FILES
+        return Response({"detail": too_many}, status=400)
+    if not role_slug or not files:
+        return Response({"detail": "Send a role and at least one file in resumes."}, status=400)
+    if role_slug not in NON_TECH_ROLE_SLUGS:
+        return Response({"detail": f"Unknown role; use one of: {', '.join(NON_TECH_ROLE_SLUGS)}."}, status=400)
+
+    max_bytes = settings.BATCH_MAX_FILE_MB * 1024 * 1024
+    try:
+        items = collect_items(files, settings.BATCH_MAX_FILES, max_bytes)
+    except BatchError as exc:
+        return Response({"detail": str(exc)}, status=400)
+
+    response = StreamingHttpResponse(
+        stream_results(items, _batch_analyzer(role_slug), max_bytes),
+        content_type="application/x-ndjson",
+    )
+    response["Cache-Control"] = "no-store"
+    response["X-Accel-Buffering"] = "no"  # nginx would otherwise hold lines back until its buffer fills
+    return response
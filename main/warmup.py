@@ -0,0 +1,95 @@
+"""
+Opt-in warmup for preforking servers (``gunicorn --preload``).
+
+With PRELOAD_WARMUP enabled, MainConfig.ready() calls warm_up() once in the
+master process. Everything loaded here - the heavy libraries, the compiled
+scoring patterns, the certification/role tables - is then inherited by every
+forked worker and shared copy-on-write instead of being rebuilt per worker on
+its first request.
+"""
+import gc
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = (
+    "fitz",
+    "docx",
+    "docx2txt",
+    "requests",
+    "xhtml2pdf.pisa",
+    "google.generativeai",
+)
+
+APP_MODULES = (
+    "main.utils",
+    "main.calculate_ats_score",
+    "main.ats_score_non_tech",
+    "main.services.certifications",
+    "main.services.textstats",
+    "main.services.spelling",
+    "main.services.charts",
+    "main.services.chart_cache",
+    "main.views",
+)
+
+_warmed = False
+
+
+def warm_up() -> dict:
+    """Import and prime everything the request path needs; safe to call more than once."""
+    global _warmed
+    if _warmed:
+        return {}
+    timings = {}
+
+    for name in HEAVY_MODULES + APP_MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as exc:  # a missing optional dependency must not stop the server
+            logger.warning("warmup: could not import %s: %s", name, exc)
+            continue
+        timings[name] = time.perf_counter() - started
+
+    for primer in (_prime_tables, _prime_spelling, _prime_charts, _prime_gemini):
+        started = time.perf_counter()
+        try:
+            primer()
+        except Exception as exc:
+            logger.warning("warmup: %s failed: %s", primer.__name__, exc)
+            continue
+        timings[primer.__name__] = time.perf_counter() - started
+
+    # Move everything allocated so far into the permanent generation so the
+    # collector never touches (and un-shares) those pages in the workers.
+    gc.collect()
+    gc.freeze()
+
+    _warmed = True
+    logger.info("warmup: done in %.0f ms", sum(timings.values()) * 1000)
+    return timings
+
+
+def _prime_tables() -> None:
+    from .services.certifications import ROLE_ALIASES, suggest_role_certifications
+    for role in ROLE_ALIASES:
+        suggest_role_certifications(role)
+
+
+def _prime_spelling() -> None:
+    # the word index is a few flat buffers; built here, every worker shares them
+    from .services.spelling import get_index
+    get_index()
+
+
+def _prime_charts() -> None:
+    from .services.charts import render_pie_svg
+    render_pie_svg(["a", "b"], [1, 1], "dark")
+
+
+def _prime_gemini() -> None:
+    from .utils import _genai
+    _genai()